@@ -1,9 +1,28 @@
 import pandas as pd
 import streamlit as st
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-from datetime import datetime
+import os
+from io import BytesIO
+
+from cleaning.aggregate import HOUSEHOLD_CROP_SPEC, aggregate
+from cleaning.boundaries import BOUNDARY_DIR, assign_points, load_layers, mismatch_summary
+from cleaning.checkpoints import CHECKPOINT_DIR, CheckpointStore, input_hash
+from cleaning.consistency import ConsistencyCheck
+from cleaning.convert import reference_year, years_since
+from cleaning.corrections import apply_corrections, load_ledger
+from cleaning.detectors import DETECTORS, compare_detectors
+from cleaning.dictionary import build_dictionary, to_html, to_markdown, trace_renames
+from cleaning.export import spool_csv, write_excel, write_feather, write_parquet
+from cleaning.outliers import GroupedIQRFences, IQRFences
+from cleaning.plots import boxplot_grid_png, boxplot_png
+from cleaning.preview import PagedView, head_preview, top_rows
+from cleaning.profiling import ColumnProfile
+from cleaning.reconcile import CROP_CODE_ALIASES, CountReconciliation
+from cleaning.repeats import ParentLink, RepeatPivot
+from cleaning.sheets import RepeatSheets
+from cleaning.sketches import iter_clipped, iter_frame_chunks, stream_fences
+from cleaning.spatial import PointIndex
+from cleaning.validation import CROP_RULES, MAIN_RULES, Validator
+from cleaning.winsorize import CappedOverlay
 
 
 # -----------------------------------------------------------
@@ -12,6 +31,208 @@ from datetime import datetime
 st.title("📊 Data Inspection & Cleaning Dashboard")
 st.markdown("---")
 
+
+# Profiles are cached on the frame contents, so sections that inspect the
+# same state of a DataFrame share one scan instead of re-running nunique/unique.
+@st.cache_data(show_spinner=False)
+def build_profile(frame):
+    return ColumnProfile(frame)
+
+
+# Previews send only the rows and columns shown to the browser
+def show_head(frame, n=5, max_cols=30):
+    st.dataframe(head_preview(frame, n=n, max_cols=max_cols))
+    if frame.shape[1] > max_cols:
+        st.caption(f"Showing the first {max_cols} of {frame.shape[1]} columns.")
+
+
+# Manual value fixes, keyed by submission (see corrections.csv)
+CORRECTIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corrections.csv")
+
+
+@st.cache_data(show_spinner=False)
+def read_corrections(path, mtime):
+    return load_ledger(path)
+
+
+# Local boundary layers (see boundaries/README.md); the STRtrees are rebuilt
+# only when a file in the directory changes
+BOUNDARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), BOUNDARY_DIR)
+
+
+def boundary_stamp(path):
+    if not os.path.isdir(path):
+        return ()
+    return tuple(sorted((f, os.path.getmtime(os.path.join(path, f))) for f in os.listdir(path)))
+
+
+@st.cache_resource(show_spinner=False)
+def read_boundaries(path, stamp):
+    return load_layers(path)
+
+
+# Crop repeat-group headers → short column names
+CROP_COLUMN_MAP = {
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Which crop do you cultivate?": "crop_type",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/From farm preparation to harvesting the crops (yield of ${crops_wetland}), it takes you one:": "crop_cycle_duration",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/You measure farm in:": "crop_area_unit",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/unit_farming_area_hectare_equivalency": "crop_area_hectare_equiv",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Your farm is how many ${unit_farming_area}s?": "crop_area_size",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Harvested ${crops_wetland} crops is measured in:": "crop_yield_unit",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Normally, how many ${unit_farming}s of havested ${crops_wetland} do you get every ${frequency_farming} for all the ${size_land_farming}  - ${unit_farming_area}s that you cultivate?": "crop_yield_quantity",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/You harvest ${crops_wetland} every ${frequency_fish}. As you know, the number of ${frequency_farming}s in a year is:": "crop_harvest_frequency",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/If measured on a balance, one ${unit_farming} of ${crops_wetland} is equal to how many kilograms?": "crop_unit_to_kg",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/quantity_farming_kg_ha_year": "crop_yield_kg_ha_year",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/This means that, per year, the ${crops_wetland} yied in kilograms per hectare (kg/ha/year) is: ${quantity_farming_kg_ha_year} kg/ha/year": "crop_yield_calc",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Market price: If you sell one ${unit_farming} of harvested ${crops_wetland}, you get how much money (RWF)?": "crop_market_price",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Do you use fertilizer for growing    ${crops_wetland}?": "crop_fertilizer_use",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Do you incur any costs from farm preparation until you get the havested ${quantity_farming} - ${unit_farming}s of ${crops_wetland} every ${frequency_farming}?": "crop_cost_incurred",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/How much are those expenses?": "crop_expense_amount",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Please write zero (0) an an answer to each cost in the question below (expenses incurred)": "crop_zero_cost_entry",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of renting land:": "crop_cost_rent_land",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of manpower: RWF per person per ${frequency_farming}": "crop_cost_manpower",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/How many persons do you use for manpower for one ${frequency_farming}?": "crop_labor_count",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/You even said you don't use fertilizer. So, I put zero cost for fertilizer...": "crop_no_fertilizer_flag",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of fertilizer: RWF": "crop_cost_fertilizer",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of buying seeds: RWF": "crop_cost_seeds",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of fumigation / pesticides: RWF": "crop_cost_pesticides",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Other costs in RWF:": "crop_cost_other",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/expenses_farming": "crop_expenses_total",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Total expenses (RWF) you incur every ${frequency_farming} for growing the ${crops_wetland} = **RWF **": "crop_expenses_total_rwf",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/${expenses_farming}": "crop_expenses_ref",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/So, the money you benefit every year from ${crops_wetland} is:": "crop_annual_profit",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/So, the money you benefit every year from ${crops_wetland} is: ${value_farming_rwf_year} RWF": "crop_annual_profit_rwf",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Value: money (Rwandan Francs) you benefit per hectare per year is:": "crop_value_per_ha",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Value: money (Rwandan Francs) you benefit per hectare per year is: ${value_farming_rwf_ha_year}  RWF": "crop_value_per_ha_rwf",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/crops_wetland_current": "crop_current_type",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Which crop(s) do you cultivate?": "crop_list",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/unit_farming_area_hectare_equivalency_calculation": "crop_area_equiv_calc",
+    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/The equivalency of one hectare in ${unit_farming_area} is:": "crop_hectare_equiv_note"
+}
+
+
+# Per-sheet column renames applied by the shared repeat-sheet cleaning
+REPEAT_SHEET_RENAMES = {'crop': CROP_COLUMN_MAP}
+
+
+# Repeat-group sheets are found from the workbook's header rows and read on
+# first use; the registry is kept across reruns of the same upload, keyed by
+# the SHA-256 of its content
+@st.cache_resource(show_spinner=False)
+def open_repeat_sheets(sha, _data):
+    return RepeatSheets(_data, renames=REPEAT_SHEET_RENAMES)
+
+
+# Tables longer than this get their main IQR fences from streamed quantile
+# sketches instead of an in-memory quantile and cell mask
+SKETCH_MIN_ROWS = 500_000
+
+
+# Rendered figures are cached as PNG bytes keyed by a hash of the plotted
+# boxplot statistics; the figures themselves are closed as soon as they are
+# rendered.
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_boxplot(stats, title):
+    return boxplot_png(stats, title)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_boxplot_grid(stats):
+    return boxplot_grid_png(stats)
+
+
+# Export widgets for {name: (DataFrame, provenance)}; used by the download
+# section and when a session resumes from the post-merge checkpoint
+def render_downloads(export_tables, outlier_report, source_name):
+    export_name = st.selectbox("Table", list(export_tables), key="export_table")
+    export_format = st.selectbox("Format", ["CSV", "Parquet", "Feather (Arrow IPC)", "Excel (all tables)"],
+                                 key="export_format")
+    export_df, export_provenance = export_tables[export_name]
+
+    # Files are built by callables that Streamlit runs only when the button
+    # is clicked, so reruns never hold a serialized copy of the data. The CSV
+    # is written in row chunks to a spooled temporary file (on disk once it
+    # passes 32 MB).
+    if export_format == "CSV":
+        csv_gzip = st.toggle("Compress with gzip", key="csv_gzip")
+
+        def csv_file():
+            with spool_csv(export_df, compress=csv_gzip) as spool:
+                return spool.read()
+
+        st.download_button(
+            label=f"📥 Download {export_name} as CSV",
+            data=csv_file,
+            file_name=f'{export_name}.csv.gz' if csv_gzip else f'{export_name}.csv',
+            mime='application/gzip' if csv_gzip else 'text/csv'
+        )
+
+    # One workbook with every table, the outlier report and a data dictionary,
+    # written row by row in xlsxwriter's constant-memory mode
+    elif export_format == "Excel (all tables)":
+        st.caption("The workbook contains every table, the outlier report and a data dictionary.")
+
+        def excel_workbook():
+            data_dictionary = pd.concat([
+                build_dictionary(table, provenance).assign(table=name)
+                for name, (table, provenance) in export_tables.items()
+            ], ignore_index=True)
+            buffer = BytesIO()
+            write_excel({
+                **{name: table for name, (table, _) in export_tables.items()},
+                'outliers': outlier_report,
+                'dictionary': data_dictionary,
+            }, buffer)
+            buffer.seek(0)
+            return buffer
+
+        st.download_button(
+            label="📥 Download all tables as Excel",
+            data=excel_workbook,
+            file_name='household_survey_cleaned.xlsx',
+            mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+
+    # Columnar formats keep the cleaned dtypes (Int flags, dates, categories)
+    else:
+        parquet = export_format == "Parquet"
+        export_codec = st.selectbox("Compression", ["zstd", "snappy", "gzip", "none"] if parquet
+                                    else ["lz4", "zstd", "uncompressed"], key=f"codec_{parquet}")
+
+        def columnar_file():
+            buffer = BytesIO()
+            writer = write_parquet if parquet else write_feather
+            writer(export_df, buffer, provenance=export_provenance,
+                   metadata={'source_file': source_name, 'table': export_name},
+                   compression=export_codec)
+            buffer.seek(0)
+            return buffer
+
+        st.download_button(
+            label=f"📥 Download {export_name} as {export_format}",
+            data=columnar_file,
+            file_name=f"{export_name}.{'parquet' if parquet else 'feather'}",
+            mime='application/vnd.apache.parquet' if parquet else 'application/vnd.apache.arrow.file'
+        )
+
+
+# Checkpoints of the cleaned tables, one directory per uploaded file hash
+# and code version (see cleaning/checkpoints.py)
+CHECKPOINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), CHECKPOINT_DIR)
+
+
+def save_checkpoint(stage, tables):
+    if not save_checkpoints:
+        return
+    try:
+        if checkpoint_store.save(stage, tables):
+            st.caption(f"💾 Checkpoint saved: `{stage}`")
+        else:
+            st.caption(f"💾 Checkpoint `{stage}` is up to date")
+    except Exception as e:
+        st.warning(f"Could not save checkpoint `{stage}`: {e}")
+
+
 # -----------------------------------------------------------
 # 📌 LOAD DATA
 # -----------------------------------------------------------
@@ -23,25 +244,39 @@ uploaded_file = st.file_uploader(
 )
 
 if uploaded_file is not None:
+    upload_sha = input_hash(uploaded_file.getvalue())
+    checkpoint_store = CheckpointStore(CHECKPOINT_PATH, input_sha=upload_sha)
+    save_checkpoints = st.toggle("💾 Save a checkpoint of the cleaned and merged tables", key="save_checkpoints",
+                                 help="Later sessions with the same file can resume from it and skip the cleaning steps.")
+    if checkpoint_store.info('post_merge') is not None and st.toggle("⏩ Resume from the saved post-merge checkpoint",
+                                                   key="resume_checkpoint"):
+        try:
+            resumed = checkpoint_store.load('post_merge')
+            outlier_report = resumed.pop('outlier_report')[0]
+            st.success("✅ Cleaned and merged tables restored from the checkpoint; the cleaning steps are skipped.")
+            st.dataframe(checkpoint_store.overview())
+            render_downloads(resumed, outlier_report, uploaded_file.name)
+        except Exception as e:
+            st.error(f"❌ Error resuming from checkpoint: {e}")
+        st.stop()
+
     try:
         # --- Main sheet (default/first sheet) ---
         df = pd.read_excel(uploaded_file, engine='openpyxl')
+        raw_main_columns = df.columns.tolist()
         uploaded_file.seek(0)  # Reset pointer for second read
         
-        # --- Crop sheet ---
-        try:
-            crop_df = pd.read_excel(uploaded_file, sheet_name="crop", engine='openpyxl')
-            st.success("✅ Crop sheet loaded successfully.")
-        except ValueError:
-            crop_df = None
+        # --- Repeat-group sheets (read lazily) ---
+        repeat_sheets = open_repeat_sheets(upload_sha, uploaded_file.getvalue())
+        if 'crop' in repeat_sheets:
+            st.success(f"✅ Repeat-group sheets found: {', '.join(repeat_sheets.names)}")
+        else:
             st.warning("⚠️ No sheet named 'crop' found. Crop-related sections will be skipped.")
         
-        uploaded_file.seek(0)  # Reset again if needed later
-        
         st.success(f"✅ Successfully loaded: **{uploaded_file.name}** ({uploaded_file.size:,} bytes)")
         
         st.markdown("### 🔍 First Look at Main DataFrame")
-        st.dataframe(df.head(10))
+        show_head(df, n=10)
         
         with st.expander("📊 DataFrame Info & Summary"):
             st.write("**Shape:**", df.shape)
@@ -69,8 +304,9 @@ st.markdown("---")
 st.markdown("## 🧹 Find Columns with *No Data at All*")
 
 # Find columns where ALL values are missing
-empty_cols = df.columns[df.isna().all()].tolist()
-empty_cols1 = df.columns[df.isna().all()].tolist()
+raw_profile = build_profile(df)
+empty_cols = raw_profile.empty_columns()
+empty_cols1 = raw_profile.empty_columns()
 
 empty_compare = pd.DataFrame({
     "Filtered DF Empty Columns": pd.Series(empty_cols),
@@ -81,7 +317,7 @@ st.markdown("### 🧩 Side-by-Side Comparison of Empty Columns")
 st.dataframe(empty_compare)
 
 st.markdown("### 🔢 Count of Empty Columns")
-empty_columns_count = df.isna().all().sum()
+empty_columns_count = len(empty_cols)
 st.write(f"**Number of columns with no data at all: `{empty_columns_count}`**")
 st.write("**Data Shape:**", df.shape)
 
@@ -92,10 +328,10 @@ st.markdown("---")
 # -----------------------------------------------------------
 st.markdown("## 🔎 Confirm Missing Values Info")
 st.markdown("### 📊 Count of Missing Values per Column")
-st.write(df.isna().sum())
+st.write(raw_profile.missing())
 
 st.markdown("### 📊 Percentage of Non-Missing Values")
-st.write(df.notna().mean() * 100)
+st.write(raw_profile.coverage())
 
 st.markdown("---")
 
@@ -110,453 +346,16 @@ st.write(f"**Remaining Columns Count:** {len(df.columns)}")
 st.write(df.columns.tolist())
 
 st.markdown("### 🔍 Missing Values After Cleaning")
-st.write(df.isna().sum())
+st.write(build_profile(df).missing())
 
 st.markdown("### 👀 Preview Cleaned DataFrame")
-st.dataframe(df.head())
+show_head(df)
 
 st.markdown("### 📐 New Shape")
 st.write(df.shape)
 
-st.markdown('''
-
-#We will have to shorten some colunmn name
-
-
-Here’s a breakdown of the columns that should be renamed for readability and efficiency (keeping meaning clear but shortening text):
-
-## System / Time / ID / GPS
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| |
-| Please take a GPS point of the location of the respondent / interview | gps_point | Main GPS coordinate |
-| _Please take a GPS point of the location of the respondent / interview_latitude | gps_latitude | |
-| _Please take a GPS point of the location of the respondent / interview_longitude | gps_longitude | |
-| _Please take a GPS point of the location of the respondent / interview_altitude | gps_altitude | |
-| _Please take a GPS point of the location of the respondent / interview_precision | gps_precision | |
-
-
----
-
-## Enumerator's Identification
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Enumerator's Identification | | |
-| ENUMERATOR'S IDENTIFICATION/The fieldwork ID (number) of the enumerator | enum_fieldwork_id | |
-| ENUMERATOR'S IDENTIFICATION/The work position of the enumerator at INES - Ruhengeri | enum_work_position | |
-| ENUMERATOR'S IDENTIFICATION/Enumerator's phone number: | enum_phone_1 | |
-| ENUMERATOR'S IDENTIFICATION/Enumerator's phone number No. 2: | enum_phone_2 | |
-| ENUMERATOR'S IDENTIFICATION/Enumerator's personal e-mail address | enum_email_personal | |
-| ENUMERATOR'S IDENTIFICATION/Enumerator's office/work e-mail address | enum_email_office | |
-
----
-
-## Respondent's Identification
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Respondent's Identification | | |
-| RESPONDENT'S IDENTIFICATION/Respondent No. (serial number in the interviews made) | resp_serial_no | |
-| RESPONDENT'S IDENTIFICATION/Gender of the respondent | resp_gender | |
-| RESPONDENT'S IDENTIFICATION/Respondent's education level: | resp_education | |
-| RESPONDENT'S IDENTIFICATION/Interview No.: | resp_interview_no | |
-
----
-
-## Consent
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Consent | | |
-| "CONSENT/Before proceeding, please ask the respondent if he/she consents to be interviewed" | consent_asked | |
-| "CONSENT/The respondent accepted, then continue!" | consent_accepted | |
-
----
-
-## Address
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Address | | |
-| Address/Select the Province where the respondent is residing | addr_province | |
-| Address/In which District are you living? | addr_district | |
-| Address/In which Sector do you reside? | addr_sector | |
-| Address/What is the name of the Cell you live in? | addr_cell | |
-| Address/In which village do you reside? | addr_village | |
-
----
-
-## Age & Experience
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Age & Experience | | |
-| Respondent's age and experience in the area/Born in (year) | resp_birth_year | |
-| Respondent's age and experience in the area/age: | resp_age | |
-| Respondent's age and experience in the area/We want to calculate how many years you have been living in this area and seeing this forest. You are here since when (year)? | resp_start_year_forest | |
-| Respondent's age and experience in the area/We want to calculate how many years you have been living in this area and seeing this wetland. You are here since when (year)? | resp_start_year_wetland | |
-| Respondent's age and experience in the area/years_in_the_area_forest | resp_years_area_forest | |
-| Respondent's age and experience in the area/years_in_the_area_wetland | resp_years_area_wetland | |
-
----
-
-## Ecosystem Identity
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Ecosystem Identity | | |
-| ECOSYSTEM IDENTITY/Please select the ecosystem type | eco_type | Forest or Wetland |
-| ECOSYSTEM IDENTITY/Please indicate the name of the forest | eco_forest_name | |
-| ECOSYSTEM IDENTITY/Please indicate the name of the wetland | eco_wetland_name | |
-| ECOSYSTEM IDENTITY/Case Study No. | eco_case_study_no | |
-| ECOSYSTEM IDENTITY/To which one among the types of forests in Rwanda does this forest belong? | eco_forest_type_rwanda | |
-| ECOSYSTEM IDENTITY/Is it a State or district forest? | eco_forest_ownership | |
-| ECOSYSTEM IDENTITY/What type of wetland is this? | eco_wetland_type | |
-| ECOSYSTEM IDENTITY/Is the case study a protected area (ecosystem)? Indicate the legal/policy status: | eco_protected_area_status | |
-
----
-
-## Ecosystem Services Benefited (Overall)
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Ecosystem Services Benefited (Overall) | | |
-| ECOSYSTEM SERVICES BENEFITED/Do you think this forest is important? | benefits_forest_important | |
-| ECOSYSTEM SERVICES BENEFITED/Do you think this wetland is important? | benefits_wetland_important | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest? | benefits_forest_list | |
-
----
-
-## Ecosystem Services Benefited (Forest - Specific Checks)
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Ecosystem Services Benefited (Forest - Specific Checks) | | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/wood provision | b_forest_wood_provision | b_ for Benefit |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/timber | b_forest_timber | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/income generation | b_forest_income_gen | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/provide refuge/habitat to animal species | b_forest_habitat_animal | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/provide refuge/habitat to plant species | b_forest_habitat_plant | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/tourism | b_forest_tourism | |
-| "ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/beauty, aesthetics" | b_forest_aesthetics | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/recreation | b_forest_recreation | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/air regulation | b_forest_air_reg | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/flood control | b_forest_flood_control | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/climate regulation | b_forest_climate_reg | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/food for livestock | b_forest_food_livestock | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/agricultural production | b_forest_agri_prod | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/fishery | b_forest_fishery | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/provide honey | b_forest_honey | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/we get mushroom | b_forest_mushroom | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/provide fruits | b_forest_fruits | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/snail | b_forest_snail | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/other food for humans | b_forest_food_other | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/charcoal provision | b_forest_charcoal | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/water regulation | b_forest_water_reg | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/soil erosion control | b_forest_soil_control | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/carbon sequestration | b_forest_carbon_seq | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/scientific research | b_forest_research | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/medicaments | b_forest_medicaments | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/hunting (!) | b_forest_hunting | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/cultural activities | b_forest_cultural | |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this forest?/OTHER | b_forest_other | |
-
----
-
-## Atmospheric Regulation Awareness
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Atmospheric Regulation Awareness | | |
-| ATMOSPHERIC REGULATION AWARENESS/Do you know something about how the forest regulates climate/water/air? | reg_aware_forest | |
-| ATMOSPHERIC REGULATION AWARENESS/Please elaborate: | reg_aware_forest_elaborate | |
-| ATMOSPHERIC REGULATION AWARENESS/Do you know something about how the wetland regulates the atmosphere? | reg_aware_wetland | |
-
----
-
-## Aesthetics / Beauty
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Aesthetics / Beauty | | |
-| AESTHETICS / BEAUTY/Is this forest beautiful in your perception? | aesthetics_forest_perception | |
-| AESTHETICS / BEAUTY/Please elaborate how beautiful the forest is in your perception | aesthetics_forest_elaborate | |
-| AESTHETICS / BEAUTY/Is this wetland beautiful in your perception? | aesthetics_wetland_perception | |
-| Please rate how beautiful the forest is | aesthetics_forest_rating | |
-
----
-
-## Sense of Place & Belongingness
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Sense of Place & Belongingness | | |
-| SENSE OF PLACE & BELONGINGNESS/How do you feel to be residing in the surroundings of this forest? | sense_place_feel_forest | |
-| SENSE OF PLACE & BELONGINGNESS/How do you feel to be residing in the surroundings of this wetland? | sense_place_feel_wetland | |
-
----
-
-## Consequences of Absence / Reduction
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Consequences of Absence / Reduction | | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was significantly depleted or even absent? | abs_conseq_forest_absent | General statement |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was significantly depleted or even absent?/I think my whole life could be affected proportionally | abs_conseq_forest_absent_life_affected | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was significantly depleted or even absent?/My income could be reduced | abs_conseq_forest_absent_income_reduced | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was significantly depleted or even absent?/I could shift and go to reside at another place | abs_conseq_forest_absent_shift_place | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was significantly depleted or even absent?/No consequence this could have to my life | abs_conseq_forest_absent_no_conseq | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was significantly depleted or even absent?/other consequence | abs_conseq_forest_absent_other | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was significantly depleted or even absent? | abs_conseq_wetland_absent | General statement |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was significantly depleted or even absent?/I think my whole life could be affected proportionally | abs_conseq_wetland_absent_life_affected | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was significantly depleted or even absent?/My income could be reduced | abs_conseq_wetland_absent_income_reduced | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was significantly depleted or even absent?/I could shift and go to reside at another place | abs_conseq_wetland_absent_shift_place | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was significantly depleted or even absent?/No consequence this could have to my life | abs_conseq_wetland_absent_no_conseq | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was significantly depleted or even absent?/other consequence | abs_conseq_wetland_absent_other | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was reduced by say 50% (half)? | abs_conseq_forest_half | General statement |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was reduced by say 50% (half)?/I think my whole life could be affected proportionally | abs_conseq_forest_half_life_affected | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was reduced by say 50% (half)?/My income could be reduced | abs_conseq_forest_half_income_reduced | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was reduced by say 50% (half)?/I could shift and go to reside at another place | abs_conseq_forest_half_shift_place | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was reduced by say 50% (half)?/No consequence this could have to my life | abs_conseq_forest_half_no_conseq | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this forest was reduced by say 50% (half)?/other consequence | abs_conseq_forest_half_other | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was reduced by say 50% (half)? | abs_conseq_wetland_half | General statement |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was reduced by say 50% (half)?/I think my whole life could be affected proportionally | abs_conseq_wetland_half_life_affected | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was reduced by say 50% (half)?/My income could be reduced | abs_conseq_wetland_half_income_reduced | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was reduced by say 50% (half)?/I could shift and go to reside at another place | abs_conseq_wetland_half_shift_place | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was reduced by say 50% (half)?/No consequence this could have to my life | abs_conseq_wetland_half_no_conseq | |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What if this wetland was reduced by say 50% (half)?/other consequence | abs_conseq_wetland_half_other | |
-
----
-
-## Human Well-being
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Human Well-being | | |
-| HUMAN WELL-BEING/What can you say about the benefits of the forest on your own wellbeing? | wellbeing_forest_general | |
-| "HUMAN WELL-BEING/What can you say about the benefits of the forest on your own wellbeing?/It improves our physical health and wellbeing since when we need medicine urgently, we can get it quickly from the forest" | wellbeing_forest_physical_health | |
-| HUMAN WELL-BEING/What can you say about the benefits of the forest on your own wellbeing?/I feel well when I see birds and some animals in the forest | wellbeing_forest_mental_birds | |
-| HUMAN WELL-BEING/What can you say about the benefits of the forest on your own wellbeing?/It improves my general wellbeing in many ways | wellbeing_forest_general_improve | |
-| HUMAN WELL-BEING/What can you say about the benefits of the forest on your own wellbeing?/other | wellbeing_forest_other | |
-| HUMAN WELL-BEING/What can you say about the benefits of the wetland on your own wellbeing? | wellbeing_wetland_general | |
-| "HUMAN WELL-BEING/What can you say about the benefits of the wetland on your own wellbeing?/It improves our physical health and wellbeing since when we need medicine urgently, we can get it quickly from some plants found around the wetland" | wellbeing_wetland_physical_health | |
-| "HUMAN WELL-BEING/What can you say about the benefits of the wetland on your own wellbeing?/I feel well when I visit the wetland, it refreshes mind by itself" | wellbeing_wetland_mental_visit | |
-| HUMAN WELL-BEING/What can you say about the benefits of the wetland on your own wellbeing?/It improves my general wellbeing in many ways | wellbeing_wetland_general_improve | |
-| HUMAN WELL-BEING/What can you say about the benefits of the wetland on your own wellbeing?/other | wellbeing_wetland_other | |
-
----
-
-## Benefits to the Society
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Benefits to the Society | | |
-| BENEFITS TO THE SOCIETY/How do your neighbours and the society as a whole in this area benefit from the forest? | society_benefit_forest_general | |
-| "BENEFITS TO THE SOCIETY/How do your neighbours and the society as a whole in this area benefit from the forest?/Since our traditional activities are conducted in the forest, the forest helps the entire society" | society_benefit_forest_trad_activities | |
-| BENEFITS TO THE SOCIETY/How do your neighbours and the society as a whole in this area benefit from the forest?/We are surrounded with clean air and we take it as a privilege as a society | society_benefit_forest_clean_air | |
-| BENEFITS TO THE SOCIETY/How do your neighbours and the society as a whole in this area benefit from the forest?/It socially ties us (brings us together as a society) | society_benefit_forest_social_tie | |
-| "BENEFITS TO THE SOCIETY/How do your neighbours and the society as a whole in this area benefit from the forest?/It makes our society to get a lot of visitors and connections since people from far away come here for research, tourism, etc..." | society_benefit_forest_visitors | |
-| BENEFITS TO THE SOCIETY/How do your neighbours and the society as a whole in this area benefit from the forest?/other | society_benefit_forest_other | |
-
----
-
-## Water for Domestic Uses
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Water for Domestic Uses | | |
-| "WATER FOR DOMESTIC USES/Where do you get water for domestic uses (washing dishes, bath, cooking, etc.)?" | water_domestic_source_list | |
-| "WATER FOR DOMESTIC USES/Where do you get water for domestic uses (washing dishes, bath, cooking, etc.)?/wetland water" | water_domestic_source_wetland | |
-| "WATER FOR DOMESTIC USES/Where do you get water for domestic uses (washing dishes, bath, cooking, etc.)?/springs water" | water_domestic_source_springs | |
-| "WATER FOR DOMESTIC USES/Where do you get water for domestic uses (washing dishes, bath, cooking, etc.)?/water well / borehole" | water_domestic_source_well | |
-| "WATER FOR DOMESTIC USES/Where do you get water for domestic uses (washing dishes, bath, cooking, etc.)?/piped water" | water_domestic_source_piped | |
-| "WATER FOR DOMESTIC USES/Where do you get water for domestic uses (washing dishes, bath, cooking, etc.)?/other" | water_domestic_source_other | |
-
----
-
-## Mats
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Mats | | |
-| MATS/Does your household personally make mats? | mats_hh_make | hh for Household |
-| MATS/But are you aware of (or do you benefit from) the practice of others who make mats? | mats_aware_others | |
-| MATS/frequency_mats_year_equivalency | mats_frequency_year | |
-
----
-
-## Value: Wood
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Value: Wood | | |
-| VALUE: WOOD/Does your household personally get wood from the forest? | v_wood_hh_get | v_ for Value |
-| VALUE: WOOD/But are you aware of (or do you benefit from) the practice of others getting wood from the forest? | v_wood_aware_others | |
-| VALUE: WOOD/frequency_wood_year_equivalency | v_wood_frequency_year | |
-
----
-
-## Value: Timber
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Value: Timber | | |
-| VALUE: TIMBER/Does your household personally get timber from the forest? | v_timber_hh_get | |
-| VALUE: TIMBER/But are you aware of (or do you benefit from) the practice of others getting timber from the forest? | v_timber_aware_others | |
-| VALUE: TIMBER/frequency_timber_year_equivalency | v_timber_frequency_year | |
-
----
-
-## Value: Charcoal
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Value: Charcoal | | |
-| VALUE: CHARCOAL/Does your household personally make charcoal from the forest? | v_charcoal_hh_make | |
-| VALUE: CHARCOAL/But are you aware of (or do you benefit from) the practice of charcoal making by others - using trees from the forest? | v_charcoal_aware_others | |
-| VALUE: CHARCOAL/frequency_charcoal_year_equivalency | v_charcoal_frequency_year | |
-
----
-
-## Value: Honey
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Value: Honey | | |
-| VALUE: HONEY/Does your household personally make honey from the forest? | v_honey_hh_make | |
-| VALUE: HONEY/But are you aware of (or do you benefit from) the practice of honey making by others - from the forest? | v_honey_aware_others | |
-| VALUE: HONEY/frequency_honey_year_equivalency | v_honey_frequency_year | |
-
----
-
-## Value: Mushrooms
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Value: Mushrooms | | |
-| VALUE: MUSHROOMS/Does your household personally get mushrooms from the forest? | v_mushroom_hh_get | |
-| VALUE: MUSHROOMS/But are you aware of (or do you benefit from) the practice of others getting mushrooms from the forest? | v_mushroom_aware_others | |
-| VALUE: MUSHROOMS/frequency_mushroom_year_equivalency | v_mushroom_frequency_year | |
-
----
-
-## Value: Fish
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Value: Fish | | |
-| VALUE: FISH/Does your household personally carry out fishery in the wetland? | v_fish_hh_do | |
-| VALUE: FISH/But are you aware of (or do you benefit from) the practice of others who practice fishing in the wetland? | v_fish_aware_others | |
-| VALUE: FISH/practice_fish_yes_count | v_fish_practice_yes_count | |
-| VALUE: FISH/practice_fish_no_count | v_fish_practice_no_count | |
-| VALUE: FISH/practice_fish_no_aware_yes_count | v_fish_practice_no_aware_yes_count | |
-| VALUE: FISH/practice_fish_no_aware_no_count | v_fish_practice_no_aware_no_count | |
-
----
-
-## Water for Construction
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Water for Construction | | |
-| "WATER FOR CONSTRUCTION/In this area, where do you get water for construction of houses?" | water_const_source_list | |
-| "WATER FOR CONSTRUCTION/In this area, where do you get water for construction of houses?/wetland water" | water_const_source_wetland | |
-| "WATER FOR CONSTRUCTION/In this area, where do you get water for construction of houses?/springs water" | water_const_source_springs | |
-| "WATER FOR CONSTRUCTION/In this area, where do you get water for construction of houses?/water well / borehole" | water_const_source_well | |
-| "WATER FOR CONSTRUCTION/In this area, where do you get water for construction of houses?/piped water" | water_const_source_piped | |
-| "WATER FOR CONSTRUCTION/In this area, where do you get water for construction of houses?/other" | water_const_source_other | |
-
----
-
-## Livestock Keeping
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Livestock Keeping | | |
-| LIVESTOCK KEEPING/Does your household practice livestock keeping? | livestock_hh_practice | |
-| LIVESTOCK KEEPING/frequency_livestock_water_year_equivalency | livestock_water_frequency_year | |
-
----
-
-## Farming Practice
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Farming Practice | | |
-| "FARMING PRACTICE/Does your household conduct crop cultivation _*around the wetland or somewhere else but using resources (water, etc…) from the wetland_*?" | farming_hh_wetland_use | |
-| FARMING PRACTICE/But are you aware of the practice of others who carry out farming near / using the wetland? | farming_aware_others_wetland | |
-| FARMING PRACTICE/practice_farming_yes_count | farming_practice_yes_count | |
-| FARMING PRACTICE/practice_farming_no_count | farming_practice_no_count | |
-| FARMING PRACTICE/practice_farming_no_aware_yes_count | farming_practice_no_aware_yes_count | |
-| FARMING PRACTICE/practice_farming_no_aware_no_count | farming_practice_no_aware_no_count | |
-| FARMING PRACTICE/practice_farming_yes_sum | farming_practice_yes_sum | |
-| FARMING PRACTICE/practice_farming_no_sum | farming_practice_no_sum | |
-| FARMING PRACTICE/practice_farming_no_aware_yes_sum | farming_practice_no_aware_yes_sum | |
-| FARMING PRACTICE/practice_farming_no_aware_no_sum | farming_practice_no_aware_no_sum | |
-
----
-
-## Value: Water for Irrigation
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Value: Water for Irrigation | | |
-| VALUE: WATER FOR IRRIGATION/Does your household personally carry out irrigation using water from the wetland? | v_irrigation_hh_do | |
-| VALUE: WATER FOR IRRIGATION/But are you aware of (or do you benefit from) the practice of others who irrigate farms using water from the wetland? | v_irrigation_aware_others | |
-
----
-
-## Non-Economic / Intangible Benefits
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Non-Economic / Intangible Benefits | | |
-| "NON-ECONOMIC / INTANGIBLE BENEFITS/Apart from the economic and the tangible benefits you mentioned / we discussed, are there other non-economic / intangible benefits you get from the forest?" | b_intangible_forest | |
-| "NON-ECONOMIC / INTANGIBLE BENEFITS/Apart from the economic and the tangible benefits you mentioned / we discussed, are there other non-economic / intangible benefits you get from the wetland?" | b_intangible_wetland | |
-
----
-
-## Willingness to Pay (WTP)
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Willingness to Pay (WTP) | | |
-| WILLINGNESS TO PAY/Are you willing to pay for the costs of managing the forest? | wtp_forest_management | |
-| "WILLINGNESS TO PAY/If you are asked to pay for the costs of managing the wetland, will you be willing to pay?" | wtp_wetland_management | |
-
----
-
-## Tradeoffs
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Tradeoffs | | |
-| "TRADEOFFS/Generally, what tradeoffs to the environment you know which are caused by the forest ecosystem services access?" | tradeoffs_forest_access | |
-| TRADEOFFS/Does the practice of crops cultivation have a negative effect on the forest? | tradeoffs_crop_neg_effect_forest | |
-| TRADEOFFS/Does any human practice on ${wetland_name} in this area affect human health? | tradeoffs_human_practice_wetland_health | |
-
----
-
-## Harm by Animals
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Harm by Animals | | |
-| HARM BY ANIMALS/Are there any incidences of wild animals harming humans in the forest? | harm_animal_forest_to_human | |
-| HARM BY ANIMALS/Are there any incidences of wild animals harming livestock in the forest? | harm_animal_forest_to_livestock | |
-
----
-
-## Final Comments
-
-| Original Column Name | Suggested New Name | Notes |
-|----------------------|--------------------|-------|
-| Final Comments | | |
-| FINAL COMMENTS/Do you have any other comments or remarks? | final_comments_resp | Respondent comments |
-| "FINAL COMMENTS/Dear Interviewer / enumerator, do you have any important observation remarks?" | final_comments_enum | Enumerator remarks |
-''')
+st.info("📖 The long Kobo headers get short names in the rename maps below. The full table of "
+        "short name ↔ original question is generated in the **Data Dictionary** section near the end.")
 
 # Rename long or complex column names
 rename_dict = {
@@ -888,98 +687,6 @@ st.write(df.rename(columns=rename_dict, inplace=True))
 st.markdown("## 🔄 Execute Column Renaming — Part 1")
 st.write(df.columns.tolist()[:10]) 
 
-st.markdown('''
-## Rename the remaining columns
-
-Here is your table **cleanly formatted in a clear tabular structure** with three columns:
-**Original Column Structure | Shortened Column Name | Description / Notes**
-
----
-
-### **Formatted Table**
-
-| **Original Column Structure**                                            | **Shortened Column Name**                      | **Description / Notes**                                                                 |
-| ------------------------------------------------------------------------ | ---------------------------------------------- | --------------------------------------------------------------------------------------- |
-| LIVESTOCK KEEPING                                                        |                                                |                                                                                         |
-| LIVESTOCK KEEPING/Which animals do you keep (domesticate)?/ ...          | livestock_kept_{animal}                        | Lists the domestic animals kept (e.g., chicken_poultry, pig, cat, duck, turkey, other). |
-| LIVESTOCK KEEPING/What is the grazing place for your livestock?          | livestock_grazing_place                        | Primary location of grazing.                                                            |
-| LIVESTOCK KEEPING/specify: / LIVESTOCK KEEPING/specify:.1                | livestock_grazing_place_specify                | Specifies the grazing location (wetland-related follow-up).                             |
-| LIVESTOCK KEEPING/Where do you get water for your livestock?             | livestock_water_source                         | Source of water for livestock.                                                          |
-| LIVESTOCK KEEPING/specify:.2                                             | livestock_water_source_specify                 | Specifies the water source.                                                             |
-| LIVESTOCK KEEPING/You procure fodder for your livestock...               | livestock_procure_fodder                       | Checks if fodder is procured (includes .1 for storage/direct feeding).                  |
-| LIVESTOCK KEEPING/You provide or store water for your livestock:         | livestock_water_provide_store                  | Water provision/storage method.                                                         |
-| LIVESTOCK KEEPING/Your livestock consume how many ${...}s - ${...}?      | livestock_water_quantity                       | Quantity of water consumed (custom units/frequency).                                    |
-| LIVESTOCK KEEPING/How many litres are contained in one ${...}?           | livestock_water_unit_to_L                      | Conversion factor for the custom unit to liters.                                        |
-| LIVESTOCK KEEPING/If obtained elsewhere... water costs RWF:              | livestock_water_alt_cost_RWF                   | Opportunity cost of water (RWF per jerrycan).                                           |
-| LIVESTOCK KEEPING/How much (RWF) cost do you incur... wetland?           | livestock_water_cost_incurred_RWF              | Direct cost incurred to get wetland water.                                              |
-| LIVESTOCK KEEPING/Value of water... per year: ${value} RWF               | livestock_water_value_year_RWF                 | Annual value/benefit of livestock water use.                                            |
-| FARMING PRACTICE (High-Level)                                            |                                                |                                                                                         |
-| FARMING PRACTICE/Does your household conduct crop cultivation...?        | farm_cultivate_wetland_resources_check         | Checks if farming uses wetland resources.                                               |
-| farming_aware_others_wetland                                             | farm_aware_others_wetland                      | Awareness of others' farming practices regarding the wetland.                           |
-| FARMING PRACTICE/“Ok, so, you know something about farming...”           | farm_aware_wetland_note                        | Confirmation of farming knowledge related to wetland.                                   |
-| farming_practice_{yes/no/no_aware}_{count/sum}                           | farm_practice_{status}_{metric}                | Counts and sums related to farming practice questions.                                  |
-| CROPS CULTIVATED (Checklists & Flags)                                    |                                                |                                                                                         |
-| CROPS CULTIVATED/Which crop(s) do you cultivate?/maize ...               | crop_{crop_name}_check                         | Checklist for crops cultivated (e.g., maize, beans).                                    |
-| CROPS CULTIVATED/Which crop(s) do you cultivate?/{crop}.1                | crop_{crop_name}_check_duplicate               | Duplicate/follow-up checklist entries.                                                  |
-| CROPS CULTIVATED/{crop}_grown                                            | crop_{crop_name}_grown                         | Flag indicating crop is grown.                                                          |
-| COUNT: CROPS CULTIVATED/{crop}_grown_count                               | crop_{crop_name}_grown_count                   | Count of how many times crop is grown.                                                  |
-| CROPS CULTIVATED (Summary & Association)                                 |                                                |                                                                                         |
-| COUNT: CROPS CULTIVATED/crops_wetland_grown_list                         | crop_wetland_grown_list                        | Generated list of all crops grown.                                                      |
-| COUNT: CROPS CULTIVATED/crops_wetland_grown_sum                          | crop_wetland_grown_sum                         | Total number of crops grown.                                                            |
-| COUNT: CROPS CULTIVATED/Are you a member of an agricultural association? | farm_member_agri_association_check             | Check for association membership.                                                       |
-| COUNT: CROPS CULTIVATED/In which farming association...?                 | farm_association_name_specify                  | Description of association.                                                             |
-| FARMING VALUE SUMMARY (RWF)                                              |                                                |                                                                                         |
-| VALUES SUMMARY/value_farming_rwf_year_total                              | crop_value_total_year_RWF                      | Total annual crop benefit (RWF).                                                        |
-| VALUES SUMMARY/income_stated_calculated_deviation                        | crop_income_stated_calc_deviation_RWF          | Deviation between stated and calculated income.                                         |
-| VALUES SUMMARY/value_farming_rwf_year_minimum                            | crop_value_min_year_RWF                        | Minimum annual crop benefit.                                                            |
-| VALUES SUMMARY/value_farming_rwf_year_maximum                            | v_farming_value_year_RWF                       | Maximum annual crop benefit.                                                            |
-| VALUES SUMMARY/value_farming_rwf_year_average                            | v_farming_value_year_average_RWF               | Average annual crop benefit.                                                            |
-| VALUES SUMMARY/value_farming_rwf_ha_year_minimum                         | crop_value_min_ha_year_RWF                     | Minimum benefit per hectare per year.                                                   |
-| VALUES SUMMARY/value_farming_rwf_ha_year_maximum                         | crop_value_max_ha_year_RWF                     | Maximum benefit per hectare per year.                                                   |
-| VALUES SUMMARY/value_farming_rwf_ha_year_total                           | crop_value_total_ha_year_RWF                   | Total benefit per hectare per year.                                                     |
-| VALUES SUMMARY/value_farming_rwf_ha_year_average                         | crop_value_avg_ha_year_RWF                     | Average benefit per hectare per year.                                                   |
-| SORGHUM LOCAL BEER / WINE                                                |                                                |                                                                                         |
-| Does your household make local beer from sorghum?                        | beer_make_from_sorghum_check                   | Primary check for beer making.                                                          |
-| Which crop do you use for making beer?                                   | beer_crop_used_list                            | Crop list (e.g., sorghum).                                                              |
-| You make beer every:                                                     | beer_make_frequency                            | Frequency of beer production.                                                           |
-| How much money do you get...?                                            | beer_income_per_freq_RWF                       | Income per frequency.                                                                   |
-| How much expenses do you incur...?                                       | beer_expense_per_freq_RWF                      | Expenses per frequency.                                                                 |
-| beer_income_year                                                         | beer_income_year_calc                          | Calculated annual income from beer.                                                     |
-| WATER FOR LOCAL BEER / WINE                                              |                                                |                                                                                         |
-| Water source for beer making                                             | beer_water_source                              | Source of water.                                                                        |
-| How many jerrycans used?                                                 | beer_water_quantity_jerrycans                  | Quantity of water used (jerrycans).                                                     |
-| Opportunity cost per jerrycan                                            | beer_water_opp_cost_jerrycan_RWF               | Opportunity cost of beer water.                                                         |
-| beer_water_value_year                                                    | beer_water_value_year_calc                     | Annual value of water used for beer.                                                    |
-| VALUE: WATER FOR IRRIGATION                                              |                                                |                                                                                         |
-| v_irrigation_hh_do                                                       | v_irrigation_hh_do                             | Flag for irrigation practice.                                                           |
-| Unit used to measure irrigation water                                    | v_irrigation_water_unit                        | Measurement unit.                                                                       |
-| How many units fetched?                                                  | v_irrigation_water_quantity                    | Water quantity fetched.                                                                 |
-| Opportunity cost (irrigation water)                                      | v_irrigation_alt_cost_jerrycan_RWF             | Opportunity cost per jerrycan.                                                          |
-| Value of irrigation water per year                                       | v_irrigation_value_year_RWF                    | Annual benefit of irrigation water.                                                     |
-| NON-ECONOMIC / INTANGIBLE BENEFITS                                       |                                                |                                                                                         |
-| b_intangible_forest/specify                                              | b_intangible_forest_list                       | Forest intangible benefits.                                                             |
-| b_intangible_wetland/specify                                             | b_intangible_wetland_list                      | Wetland intangible benefits.                                                            |
-| WILLINGNESS TO PAY (WTP)                                                 |                                                |                                                                                         |
-| Maximum WTP amount                                                       | wtp_{resource}_amount_RWF                      | Max willingness to pay for resource mgmt.                                               |
-| BIODIVERSITY: REPTILES                                                   |                                                |                                                                                         |
-| Reptiles found in wetland                                                | biodiv_reptile_{type}_check                    | Checklist of reptiles (lizards, snakes, etc.).                                          |
-| Types of snakes found                                                    | biodiv_snake_{type}_check                      | Snake type checklist.                                                                   |
-| TRADEOFFS (Environmental Impact)                                         |                                                |                                                                                         |
-| Tradeoffs caused by charcoal/wood/timber                                 | tradeoffs_forest_impact_{type}                 | Checklist of negative forest impacts.                                                   |
-| Negative effect of crop cultivation                                      | tradeoffs_crop_neg_effect_wetland_check        | Wetland impact from crops.                                                              |
-| Negative impact of beer making                                           | tradeoffs_beer_{crop}_neg_effect_wetland_check | Impact from sorghum/other beer making.                                                  |
-| General other tradeoffs                                                  | tradeoffs_wetland_general_other_list           | Other noted environmental tradeoffs.                                                    |
-| TRADEOFFS: Health & Harm                                                 |                                                |                                                                                         |
-| Human practice affects wetland health                                    | tradeoffs_human_practice_wetland_health        | General health impact check.                                                            |
-| How is health affected?                                                  | tradeoffs_wetland_health_{issue}               | Health issue checklist (waterborne disease, etc.).                                      |
-| Crocodile harm incidents                                                 | harm_crocodile_check                           | Checks for crocodile-related harm.                                                      |
-| Snake bite incidents                                                     | harm_snakes_check                              | Checks for snake bites.                                                                 |
-| Cure for snake bites                                                     | harm_snake_cure_{method}                       | Methods used (hospital, traditional).                                                   |
-| FINAL COMMENTS                                                           |                                                |                                                                                         |
-| Respondent comments                                                      | final_comments_respondent                      | Final respondent input.                                                                 |
-| Enumerator remarks                                                       | final_comments_enumerator_remarks              | Enumerator’s notes.                                                                     |
-| FINAL COMMENTS/Filled Form No.: **${interview_id}**                                                                 | final_comments_form_id                         | Interview ID.                                                                           |
-''')
 
 
 column_rename_map_part2 = {
@@ -1434,259 +1141,6 @@ except NameError:
 except Exception as e:
     st.error(f"⚠️ An unexpected error occurred during renaming: **{e}**")
 
-st.markdown('''
-
-| Original Column Name | Shortened Column Name | Section |
-|---------------------|--------------------|---------|
-| RESPONDENT'S IDENTIFICATION |  |  |
-| RESPONDENT'S IDENTIFICATION/What is the phone number of the respondent? | resp_phone_number | ID |
-| --- | --- | --- |
-| BENEFITS AWARENESS / IMPORTANCE |  |  |
-| ECOSYSTEM SERVICES BENEFITED/If it is not beneficial, why do you think the forest is not important? | forest_not_important_reason | Importance |
-| benefits_wetland_important | wetland_important_check | Importance |
-| ECOSYSTEM SERVICES BENEFITED/If it is not beneficial, why do you think the wetland is not important? | wetland_not_important_reason | Importance |
-| --- | --- | --- |
-| FOREST BENEFITS (Initial List) |  |  |
-| ECOSYSTEM SERVICES BENEFITED/You said "Other". Please mention what "other food" you get from this forest | forest_other_food_specify | Food |
-| ECOSYSTEM SERVICES BENEFITED/You said "Other". Please explain the benefits you get from this forest | forest_other_benefit_explain | General |
-| --- | --- | --- |
-| WETLAND BENEFITS (Initial List - Checklists) |  |  |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland? | wetland_benefit_initial_list | General |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/fish for food | wetland_benefit_fish_check | Food |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/snail | wetland_benefit_snail_check | Food |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/other food for humans | wetland_benefit_other_food_check | Food |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/provide refuge/habitat to animal species | wetland_benefit_habitat_animal_check | Habitat |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/provide refuge/habitat to plant species | wetland_benefit_habitat_plant_check | Habitat |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/income generation | wetland_benefit_income_check | Economic |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/tourism | wetland_benefit_tourism_check | Cultural |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/beauty, aesthetics | wetland_benefit_aesthetics_check | Cultural |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/recreation | wetland_benefit_recreation_check | Cultural |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/air pollution control | wetland_benefit_air_control_check | Regulating |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/water for livestock | wetland_benefit_water_livestock_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/water for industrial use | wetland_benefit_water_industrial_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/water for domestic use | wetland_benefit_water_domestic_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/water for making local beer | wetland_benefit_water_beer_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/agricultural production | wetland_benefit_agri_prod_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/sleeping mat | wetland_benefit_mats_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/water purification | wetland_benefit_water_purif_check | Regulating |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/hydroelectric benefits | wetland_benefit_hydro_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/soil erosion control | wetland_benefit_erosion_control_check | Regulating |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/carbon sequestration | wetland_benefit_carbon_seq_check | Regulating |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/scientific research | wetland_benefit_research_check | Cultural |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/cultural activities | wetland_benefit_cultural_check | Cultural |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/medicaments | wetland_benefit_medicaments_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/hunting (!) | wetland_benefit_hunting_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/transport | wetland_benefit_transport_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/What services / benefits do you get from this wetland?/OTHER | wetland_benefit_other_check | General |
-| ECOSYSTEM SERVICES BENEFITED/You said "Other food". Please mention what "other food" you get from this wetland | wetland_other_food_specify | Food |
-| ECOSYSTEM SERVICES BENEFITED/You said "Other". Please explain the benefits you get from this wetland | wetland_other_benefit_explain | General |
-| --- | --- | --- |
-| FOREST BENEFITS (Confirmation List - Checklists) |  |  |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest? | forest_benefit_confirmation_check | General |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/wood provision | forest_benefit_wood_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/timber | forest_benefit_timber_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/income generation | forest_benefit_income_check | Economic |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/provide refuge/habitat to animal species | forest_benefit_habitat_animal_check | Habitat |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/provide refuge/habitat to plant species | forest_benefit_habitat_plant_check | Habitat |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/tourism | forest_benefit_tourism_check | Cultural |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/beauty, aesthetics | forest_benefit_aesthetics_check | Cultural |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/recreation | forest_benefit_recreation_check | Cultural |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/air regulation | forest_benefit_air_reg_check | Regulating |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/flood control | forest_benefit_flood_control_check | Regulating |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/climate regulation | forest_benefit_climate_reg_check | Regulating |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/food for livestock | forest_benefit_food_livestock_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/agricultural production | forest_benefit_agri_prod_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/fishery | forest_benefit_fishery_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/provide honey | forest_benefit_honey_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/we get mushroom | forest_benefit_mushroom_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/provide fruits | forest_benefit_fruits_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/snail | forest_benefit_snail_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/other food for humans | forest_benefit_other_food_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/charcoal provision | forest_benefit_charcoal_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/water regulation | forest_benefit_water_reg_check | Regulating |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/soil erosion control | forest_benefit_erosion_control_check | Regulating |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/carbon sequestration | forest_benefit_carbon_seq_check | Regulating |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/scientific research | forest_benefit_research_check | Cultural |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/medicaments | forest_benefit_medicaments_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/hunting (!) | forest_benefit_hunting_check | Provisioning |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/cultural activities | forest_benefit_cultural_check | Cultural |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this forest?/OTHER | forest_benefit_other_check | General |
-
-| Original Column Name | Shortened Column Name | Section |
-|---------------------|--------------------|---------|
-| --- | --- | --- |
-| WETLAND BENEFITS (Confirmation List - Checklists) |  |  |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this wetland? | wetland_benefit_confirmation_check | General |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this wetland?/fish for food | wetland_conf_benefit_fish_check | Food |
-| ... (Other specific wetland benefits confirmed) | ... | ... |
-| ECOSYSTEM SERVICES BENEFITED/Sorry, in the following list, is there any service you get from this wetland?/OTHER | wetland_conf_benefit_other_check | General |
-| --- | --- | --- |
-| ATMOSPHERIC REGULATION / AESTHETICS / SENSE OF PLACE |  |  |
-| ATMOSPHERIC REGULATION AWARENESS/Please elaborate:.1 | air_reg_elaborate | Regulating |
-| AESTHETICS / BEAUTY/Please elaborate how beautiful the wetland is in your perception | wetland_beauty_elaborate | Cultural |
-| Please rate how beautiful the wetland is | wetland_beauty_rating | Cultural |
-| SENSE OF PLACE & BELONGINGNESS/Please explain why you don't feel well to be residing in the surroundings of this forest | sense_place_forest_not_well_explain | Cultural |
-| sense_place_feel_wetland | sense_place_wetland_feel_check | Cultural |
-| SENSE OF PLACE & BELONGINGNESS/Please explain why you don't feel well to be residing in the surroundings of this wetland | sense_place_wetland_not_well_explain | Cultural |
-| --- | --- | --- |
-| CONSEQUENCES OF ABSENSE / REDUCTION |  |  |
-| CONSEQUENCES OF ABSENSE / REDUCTION/Please elaborate how you could be affected by the depletion of the forest | cons_absense_forest_elaborate | General |
-| CONSEQUENCES OF ABSENSE / REDUCTION/Please elaborate how you could be affected by the depletion of the wetland | cons_absense_wetland_elaborate | General |
-| CONSEQUENCES OF ABSENSE / REDUCTION/Please explain | cons_explain_1 | General |
-| CONSEQUENCES OF ABSENSE / REDUCTION/Please explain.1 | cons_explain_2 | General |
-| CONSEQUENCES OF ABSENSE / REDUCTION/But then, Rugezi marshland has been partly degraded. How does the degradation affect you? | cons_degrad_affect_you_list | Degradation |
-| CONSEQUENCES OF ABSENSE / REDUCTION/But then, Rugezi marshland has been partly degraded. How does the degradation affect you?/My whole life has been affected | cons_degrad_life_affected_check | Degradation |
-| CONSEQUENCES OF ABSENSE / REDUCTION/But then, Rugezi marshland has been partly degraded. How does the degradation affect you?/It reduces my income since I depend on the wetland for livelihood | cons_degrad_income_reduced_check | Degradation |
-| CONSEQUENCES OF ABSENSE / REDUCTION/But then, Rugezi marshland has been partly degraded. How does the degradation affect you?/I think I should shift to another province or district | cons_degrad_shift_district_check | Degradation |
-| CONSEQUENCES OF ABSENSE / REDUCTION/But then, Rugezi marshland has been partly degraded. How does the degradation affect you?/I feel I should shift to a neighboring country | cons_degrad_shift_country_check | Degradation |
-| CONSEQUENCES OF ABSENSE / REDUCTION/But then, Rugezi marshland has been partly degraded. How does the degradation affect you?/It doesn't affect my life | cons_degrad_no_effect_check | Degradation |
-| CONSEQUENCES OF ABSENSE / REDUCTION/But then, Rugezi marshland has been partly degraded. How does the degradation affect you?/Other effects | cons_degrad_other_check | Degradation |
-| CONSEQUENCES OF ABSENSE / REDUCTION/specify: | cons_degrad_other_specify | Degradation |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What do you think is / are the reason(s) for the experienced decreasing water level of Rugezi wetland? | cons_water_level_decrease_reasons_list | Water Level |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What do you think is / are the reason(s) for the experienced decreasing water level of Rugezi wetland?/Water drainage by Electrogaz to lake Burera & Ruhondo | cons_water_drainage_check | Water Level |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What do you think is / are the reason(s) for the experienced decreasing water level of Rugezi wetland?/human activities (unsustainable land use practices) | cons_water_human_activities_check | Water Level |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What do you think is / are the reason(s) for the experienced decreasing water level of Rugezi wetland?/climate change | cons_water_climate_change_check | Water Level |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What do you think is / are the reason(s) for the experienced decreasing water level of Rugezi wetland?/deforestation | cons_water_deforestation_check | Water Level |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What do you think is / are the reason(s) for the experienced decreasing water level of Rugezi wetland?/increase of population size (demographic factors) | cons_water_pop_increase_check | Water Level |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What do you think is / are the reason(s) for the experienced decreasing water level of Rugezi wetland?/soil erosion on surrounding valleys | cons_water_soil_erosion_check | Water Level |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What do you think is / are the reason(s) for the experienced decreasing water level of Rugezi wetland?/geological reasons | cons_water_geological_check | Water Level |
-| CONSEQUENCES OF ABSENSE / REDUCTION/What do you think is / are the reason(s) for the experienced decreasing water level of Rugezi wetland?/other | cons_water_other_check | Water Level |
-| CONSEQUENCES OF ABSENSE / REDUCTION/specify:.1 | cons_water_other_specify | Water Level |
-
-| Original Column Name | Shortened Column Name | Section |
-|---------------------|--------------------|---------|
-| --- | --- | --- |
-| BENEFITS TO THE SOCIETY |  |  |
-| BENEFITS TO THE SOCIETY/explain: | society_benefit_forest_explain | Forest |
-| BENEFITS TO THE SOCIETY/How do your neighbours and the society as a whole in this area benefit from the wetland? | society_benefit_wetland_list | Wetland |
-| BENEFITS TO THE SOCIETY/How do your neighbours and the society as a whole in this area benefit from the wetland?/Sometimes we meet as a society in the "open spaces"... | society_wetland_meet_open_space_check | Wetland |
-| BENEFITS TO THE SOCIETY/How do your neighbours and the society as a whole in this area benefit from the wetland?/We have a lot of fish, water, etc... and we take it as a privilege... | society_wetland_privilege_check | Wetland |
-| BENEFITS TO THE SOCIETY/How do your neighbours and the society as a whole in this area benefit from the wetland?/It makes our society to get a lot of visitors and connections... | society_wetland_visitors_check | Wetland |
-| BENEFITS TO THE SOCIETY/How do your neighbours and the society as a whole in this area benefit from the wetland?/other | society_wetland_other_check | Wetland |
-| BENEFITS TO THE SOCIETY/explain:.1 | society_wetland_other_explain | Wetland |
-| BENEFITS TO THE SOCIETY/Do you benefit from the Ntaruka and Mukungwa hydroelectric power plants? | society_benefit_hydro_plants_check | Hydro |
-| BENEFITS TO THE SOCIETY/specify: | society_benefit_hydro_specify | Hydro |
-| --- | --- | --- |
-| STATED / DECLARED INCOME |  |  |
-| STATED / DECLARED INCOME/Earlier, you also mentioned "income generation" among benefits you get from the forest. Generally, how much (Rwandan Francs) in total do you get from the forest monthly? | stated_income_forest_monthly_RWF | Forest Income |
-| STATED / DECLARED INCOME/income_generated_forest_year | stated_income_forest_annual_RWF | Forest Income |
-| STATED / DECLARED INCOME/Earlier, you also mentioned "income generation" among benefits you get from the wetland. Generally, how much (Rwandan Francs) in total do you get from the wetland monthly? | stated_income_wetland_monthly_RWF | Wetland Income |
-| STATED / DECLARED INCOME/income_generated_wetland_year | stated_income_wetland_annual_RWF | Wetland Income |
-| --- | --- | --- |
-| WATER FOR DOMESTIC USES |  |  |
-| WATER FOR DOMESTIC USES/What time do you take to access water from the wetland? Time in minutes: | water_domestic_access_time_min | Time/Distance |
-| WATER FOR DOMESTIC USES/You fetch water from the wetland every: | water_domestic_frequency | Frequency |
-| WATER FOR DOMESTIC USES/water_domestic_frequency_year_equivalency | water_domestic_freq_year_equiv | Calculation |
-| WATER FOR DOMESTIC USES/unit for fetching/measuring water: | water_domestic_unit | Unit |
-| WATER FOR DOMESTIC USES/One ${water_domestic_unit} is equivalent to how many litres ? | water_domestic_unit_to_L | Conversion |
-| WATER FOR DOMESTIC USES/Please estimate how many ${water_domestic_unit}s of water you fetch / use every ${water_domestic_frequency} | water_domestic_quantity | Quantity |
-| WATER FOR DOMESTIC USES/If not fetched from the wetland, how much (RWF) does one jerrycan of water cost? | water_domestic_alt_cost_jerrycan_RWF | Cost |
-| WATER FOR DOMESTIC USES/How much costs (if any) do you incur to get the ${water_domestic_quantity} - ${water_domestic_unit}s of water that you get every ${water_domestic_frequency}? | water_domestic_incurred_cost_RWF | Cost |
-| WATER FOR DOMESTIC USES/Value of water in Rwandan Francs per year: | water_domestic_value_year_RWF | Calculated Value |
-| --- | --- | --- |
-| MATS VALUE / PRACTICE |  |  |
-| MATS/What is the use of the mats you make? | mats_use_list | Use |
-| MATS/What is the use of the mats you make?/for our own use (e.g. at home: sleeping, etc...) and not for sale | mats_use_own_check | Use Check |
-| MATS/What is the use of the mats you make?/for sale | mats_use_sale_check | Use Check |
-| MATS/Ok, so, you know something about mats making practice! | mats_aware_note | Awareness |
-| MATS/What materials are used to make mats called "ibirago"? | mats_materials_ibirago | Materials |
-| MATS/Apart from the ${mats_materials}, is there any other materials you use for making any model/type of local local mats? | mats_materials_alt_check | Materials |
-| MATS/What is the name of the other material or other grass/weed/sedge used? | mats_materials_alt_name | Materials |
-| MATS/Do you use the ${mats_materials_alternative} for making mats which are different (type) from the mats model made from ${mats_materials}? | mats_alt_materials_type_diff_check | Materials |
-| MATS/What other model of mats do you make from ${mats_materials_alternative}? | mats_alt_model_list | Model |
-| MATS/What other model of mats do you make from ${mats_materials_alternative}?/sleeping mats (ibirago) | mats_alt_model_ibirago_check | Model Check |
-| MATS/What other model of mats do you make from ${mats_materials_alternative}?/imikeka | mats_alt_model_imikeka_check | Model Check |
-| MATS/What other model of mats do you make from ${mats_materials_alternative}?/rug (imisambi) | mats_alt_model_imisambi_check | Model Check |
-| MATS/What other model of mats do you make from ${mats_materials_alternative}?/"ibidasesa" (woven grass mat for dying things outside) | mats_alt_model_ibidasesa_check | Model Check |
-| MATS/Where do the "${mats_materials}" materials come from? | mats_materials_origin_list | Origin |
-| MATS/Where do the "${mats_materials}" materials come from?/from the wetland | mats_materials_wetland_check | Origin Check |
-| MATS/Where do the "${mats_materials}" materials come from?/not from the wetland | mats_materials_not_wetland_check | Origin Check |
-| MATS/Where do the "${mats_materials_alternative}" materials come from? | mats_materials_alt_origin_list | Origin |
-| MATS/Where do the "${mats_materials_alternative}" materials come from?/from the wetland | mats_materials_alt_wetland_check | Origin Check |
-| MATS/Where do the "${mats_materials_alternative}" materials come from?/not from the wetland | mats_materials_alt_not_wetland_check | Origin Check |
-| MATS/Are there any mats (_already fabricated_ or "ready-made") FOR SALE which originate from somewhere else apart from being made here using the local materials that you have just mentioned? | mats_ready_made_for_sale_check | Market |
-| MATS/Where do the mats originate from? | mats_origin_list | Market |
-| MATS/Where do the mats originate from?/other provinces in Rwanda | mats_origin_provinces_check | Market Check |
-| MATS/Where do the mats originate from?/Uganda | mats_origin_uganda_check | Market Check |
-| MATS/Where do the mats originate from?/Burundi | mats_origin_burundi_check | Market Check |
-| MATS/Where do the mats originate from?/Tanzania | mats_origin_tanzania_check | Market Check |
-| MATS/Where do the mats originate from?/Congo (DRC) | mats_origin_congo_check | Market Check |
-| MATS/Where do the mats originate from?/other place | mats_origin_other_check | Market Check |
-| MATS/Please rate what you think is the proportion of the mats locally-made and those coming from ${mats_origin} | mats_proportion_local_imported | Market |
-| MATS/The "${mats_materials}" are taken for making mats every: | mats_materials_frequency | Frequency |
-| MATS/unit of measuring the ${mats_materials}: | mats_materials_unit | Unit |
-| MATS/One ${unit_mats_materials} is equivalent to how many kilograms by estimate? | mats_materials_unit_to_kg | Conversion |
-| MATS/How many unit_mats_materials of ${mats_materials} are used to make mats every ${frequency_mats}? | mats_materials_quantity | Quantity |
-| MATS/How many [sleeping] mats are made out of the ${quantity_mats_materials} unit_mats_materials of ${mats_materials} every ${frequency_mats}? | mats_quantity_made | Output |
-| MATS/How much cost (RWF) do you incur until you fabricate the ${quantity_mats} mats every ${frequency_mats}? | mats_fabrication_cost_RWF | Cost |
-| MATS/Where is the market for mats located? | mats_market_location | Market |
-| MATS/Do you think those making mats for selling get much money from the business? | mats_business_profitable_check | Profit |
-| MATS/please elaborate: | mats_business_profitable_elaborate | Profit |
-| MATS/How much do you estimate they make in 3 months? | mats_income_3_months_RWF | Income |
-
-
-| Original Column Name | Shortened Column Name | Section |
-|---------------------|--------------------|---------|
-| --- | --- | --- |
-| FOREST VALUE (WOOD, TIMBER, HONEY, MUSHROOMS) |  |  |
-| VALUE: WOOD/Wood is taken from the forest (per concerned household) every: | value_wood_frequency | Frequency |
-| VALUE: TIMBER/Timber is taken from the forest (per concerned household) every: | value_timber_frequency | Frequency |
-| VALUE: TIMBER/One ${unit_timber} is equivalent to how many kilograms? | value_timber_unit_to_kg | Conversion |
-| VALUE: TIMBER/How many ${unit_timber}s of timber do you get from the forest every ${frequency_timber}? | value_timber_quantity | Quantity |
-| VALUE: TIMBER/Its market price in RWF per ${unit_timber} is: | value_timber_market_price_RWF | Price |
-| VALUE: TIMBER/How much cost (RWF) do you incur in order to get the ${quantity_timber} ${unit_timber}s of timber every ${frequency_timber}? | value_timber_cost_RWF | Cost |
-| VALUE: HONEY/Ok, so, you know something about honey practice! | value_honey_aware_note | Awareness |
-| VALUE: HONEY/Honey is made from the forest (per concerned household) every: | value_honey_frequency | Frequency |
-| VALUE: HONEY/One ${unit_honey} is equivalent to how many litres? | value_honey_unit_to_L | Conversion |
-| VALUE: HONEY/How many ${unit_honey}s of honey do you get from the forest every ${frequency_honey}? | value_honey_quantity | Quantity |
-| VALUE: HONEY/Its market price in RWF per ${unit_honey} is: | value_honey_market_price_RWF | Price |
-| VALUE: HONEY/How much cost (RWF) do you incur in order to make the ${quantity_honey} - ${unit_honey}s of honey every ${frequency_honey}? | value_honey_cost_RWF | Cost |
-| VALUE: MUSHROOMS/Ok, so, you know something about mushroom provision! | value_mushroom_aware_note | Awareness |
-| VALUE: MUSHROOMS/Mushroom is obtained from the forest (per concerned household) every: | value_mushroom_frequency | Frequency |
-| VALUE: MUSHROOMS/One ${unit_mushroom} is equivalent to how many kilograms? | value_mushroom_unit_to_kg | Conversion |
-| VALUE: MUSHROOMS/How many ${unit_mushroom}s of mushrooms do you get from the forest every ${frequency_mushroom}? | value_mushroom_quantity | Quantity |
-| VALUE: MUSHROOMS/Its market price in RWF per ${unit_mushroom} is: | value_mushroom_market_price_RWF | Price |
-| VALUE: MUSHROOMS/How much cost (RWF) do you incur in order to get the ${quantity_mushroom} ${unit_mushroom}s of mushroom every ${frequency_mushroom}? | value_mushroom_cost_RWF | Cost |
-| VALUE: MUSHROOMS/value_mushroom | value_mushroom_annual_RWF | Calculated Value |
-| --- | --- | --- |
-| WETLAND VALUE (FISH) |  |  |
-| VALUE: FISH/Ok, so, you know something about fishery in the wetland! | value_fish_aware_note | Awareness |
-| VALUE: FISH/Fresh fish is obtained from the wetland (per concerned household) every: | value_fish_frequency | Frequency |
-| VALUE: FISH/you measure the fish in: | value_fish_unit | Unit |
-| VALUE: FISH/One ${unit_fish} of fish is equivalent to how many kilograms (kg)? | value_fish_unit_to_kg | Conversion |
-| VALUE: FISH/How many ${unit_fish}s of fish do you get every ${frequency_fish} from the wetland? | value_fish_quantity | Quantity |
-| VALUE: FISH/You get the ${quantity_fish} fish ${unit_fish} every ${frequency_fish}. As you know, the number of ${frequency_fish}s in a year is: | value_fish_freq_year_note | Note |
-| VALUE: FISH/So, every year, the number of kilograms of fish you get from the wetland is: | value_fish_annual_kg_note | Note |
-| VALUE: FISH/Its market price in RWF per ${unit_fish} is: | value_fish_market_price_RWF | Price |
-| VALUE: FISH/Do you incur any cost (RWF) in order to get the ${quantity_fish} - ${unit_fish} of fish every ${frequency_fish}? | value_fish_cost_check | Cost Check |
-| VALUE: FISH/So, the money (Rwandan Francs) so obtained from fishing per ${frequency_fish}: | value_fish_income_per_freq_RWF | Income |
-| --- | --- | --- |
-| FISHING PRACTICE & FISH NAMES |  |  |
-| FISHING PRACTICE & FISH NAMES/Do you know some types (genera or specific names) of fish found in the wetland? | fish_know_types_check | Knowledge |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery? | fish_types_list | Types |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/tilapia | fish_type_tilapia_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/Burera haplo (Haplochromis erythromaculatus) | fish_type_burera_haplo_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/Alluaud's haplo (Astatoreochromis alluaudi) - used to control snails/ molluscs | fish_type_alluaud_haplo_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/perch (Lates niloticus) | fish_type_perch_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/Marbled lungfish (Protopterus aethiopicus) | fish_type_lungfish_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/Elephant-snout fish (Mormyrus kannume) | fish_type_elephant_snout_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/Common carp (Cyprinus carpio) | fish_type_common_carp_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/Rwandese carp (Varicorhinus ruandae / [Labeo]barbus ruandae and Varicorhinus platystoma species) | fish_type_rwandese_carp_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/Longtail spinyeel (Mastacembelus frenatus) | fish_type_longtail_spinyeel_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/barb (Barbus genus) | fish_type_barb_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/Mudfish / common catfish / sharptooth catfish (Clarias gariepinus) | fish_type_mudfish_catfish_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/Smoothhead catfish (Clarias liocephalus) | fish_type_smoothhead_catfish_check | Type Check |
-| FISHING PRACTICE & FISH NAMES/What types of fish are normally obtained from the wetland fishery?/other fish | fish_type_other_check | Type Check |
-| --- | --- | --- |
-| LIVESTOCK KEEPING (Selection Checklist) |  |  |
-| LIVESTOCK KEEPING/Which animals do you keep (domesticate)? | livestock_kept_list | Animals Kept |
-| LIVESTOCK KEEPING/Which animals do you keep (domesticate)?/cattle | livestock_kept_cattle_check | Animals Kept |
-| LIVESTOCK KEEPING/Which animals do you keep (domesticate)?/goat | livestock_kept_goat_check | Animals Kept |
-| LIVESTOCK KEEPING/Which animals do you keep (domesticate)?/sheep | livestock_kept_sheep_check | Animals Kept |
-| LIVESTOCK KEEPING/Which animals do you keep (domesticate)?/rabbit | livestock_kept_rabbit_check | Animals Kept |
-| LIVESTOCK KEEPING/Which animals do you keep (domesticate)?/dog | livestock_kept_dog_check | Animals Kept |
-
-''')
 
 st.markdown("## 🔄 Renaming Column  — Part 3")
 
@@ -1962,6 +1416,15 @@ try:
     df = df.rename(columns=rename_map)
     st.success("✅ Columns renamed successfully!")
 
+    # Original question behind every cleaned column, replayed from the
+    # rename passes; kept as metadata in checkpoints and exports
+    main_provenance = trace_renames(
+        raw_main_columns, rename_dict, column_rename_map_part2, rename_map,
+        # the age section drops these, then renames the start year
+        ['resp_years_area_wetland', 'resp_start_year_forest', 'resp_birth_year'],
+        {'resp_start_year_wetland': 'resp_years_area_wetland'},
+    )
+
 except NameError:
     st.error("❌ Error: The DataFrame **df** or the dictionary **rename_map** was not found.")
 
@@ -1993,7 +1456,7 @@ try:
     st.success("✅ Start/end columns successfully converted & split into date + time.")
 
     st.markdown("### 🔍 Preview (First 10 Rows)")
-    st.dataframe(df[['start_date', 'start_time', 'end_date', 'end_time']].head())
+    st.dataframe(head_preview(df, n=5, columns=['start_date', 'start_time', 'end_date', 'end_time']))
 
 except Exception as e:
     st.error(f"Error during datetime conversion: {e}")
@@ -2012,7 +1475,7 @@ try:
     st.success("✅ Time columns formatted successfully (HH:MM:SS).")
 
     st.markdown("### 🔍 Preview")
-    st.dataframe(df[['start_date', 'start_time', 'end_date', 'end_time']].head(10))
+    st.dataframe(head_preview(df, n=10, columns=['start_date', 'start_time', 'end_date', 'end_time']))
 
     valid = df['start'].notna().sum()
     st.info(f"Rows with valid start/end times: **{valid} / {len(df)}**")
@@ -2035,7 +1498,7 @@ try:
     df = df[new_order + other_cols]
 
     st.success("✅ Columns reordered successfully.")
-    st.dataframe(df.head())
+    show_head(df)
 
 except Exception as e:
     st.error(f"Error reordering columns: {e}")
@@ -2066,7 +1529,7 @@ try:
     df = df[first_cols + others]
 
     st.success("✅ Submission columns created & formatted.")
-    st.dataframe(df.head(10))
+    show_head(df, n=10)
 
 except Exception as e:
     st.error(f"Error processing submission time: {e}")
@@ -2099,7 +1562,7 @@ st.markdown("## 📅 Convert `today` Column to Date")
 try:
     df["today"] = pd.to_datetime(df["today"], errors='coerce').dt.date
     st.success("`today` successfully converted to date.")
-    st.dataframe(df.head())
+    show_head(df)
 
 except Exception as e:
     st.error(f"Error converting `today`: {e}")
@@ -2115,7 +1578,7 @@ try:
     cols = ['_index'] + [col for col in df.columns if col != '_index']
     df = df[cols]
     st.success("`_index` moved to the first position.")
-    st.dataframe(df.head())
+    show_head(df)
 
 except Exception as e:
     st.error(f"Error moving `_index`: {e}")
@@ -2158,10 +1621,10 @@ st.markdown("---")
 # -----------------------------------------------------------
 st.markdown("## 🔢 Check that it worked")
 
-few_unique_cols = [col for col in df.columns if df[col].nunique() <= 2]
+main_profile = build_profile(df)
 
-for col in few_unique_cols:
-    st.write(f"{col}: {df[col].unique().tolist()}")
+for col, values in main_profile.few_unique(df, max_distinct=2).items():
+    st.write(f"{col}: {values}")
 
 
 st.markdown("---")
@@ -2171,13 +1634,7 @@ st.markdown("---")
 # -----------------------------------------------------------
 st.markdown("## 📘 Data Summary Table")
 
-summary = pd.DataFrame({
-    'Column': df.columns,
-    'Data Type': df.dtypes.astype(str),
-    'Non-Null Count': df.notnull().sum(),
-    'Null Count': df.isnull().sum(),
-    'Unique Values': df.nunique()
-})
+summary = main_profile.summary()
 
 st.dataframe(summary.head(10))
 
@@ -2189,11 +1646,11 @@ st.markdown("---")
 st.markdown("## 🎂 Convert Age-Related Columns")
 
 try:
-    st.write(df[['resp_birth_year','resp_age',
-                 'resp_start_year_forest',
-                 'resp_start_year_wetland',
-                 'resp_years_area_forest',
-                 'resp_years_area_wetland']].apply(lambda x: x.unique()))
+    st.dataframe(main_profile.values(['resp_birth_year', 'resp_age',
+                                      'resp_start_year_forest',
+                                      'resp_start_year_wetland',
+                                      'resp_years_area_forest',
+                                      'resp_years_area_wetland']))
 
 except Exception:
     st.warning("Some age columns were not found.")
@@ -2206,11 +1663,11 @@ st.markdown("---")
 st.markdown("## 🧮 Convert `resp_birth_year` → `resp_age`")
 
 try:
-    from datetime import datetime
-    current_year = datetime.now().year
+    # Ages and residence durations are measured at each row's interview date
+    interview_year = reference_year(df, date_cols=('today', 'start_date'))
 
-    df['resp_age'] = current_year - df['resp_birth_year']
-    st.success("`resp_age` calculated successfully.")
+    df['resp_age'] = years_since(df['resp_birth_year'], interview_year)
+    st.success("`resp_age` calculated successfully (as of each interview year).")
 
 except Exception as e:
     st.error(f"Error converting resp_birth_year: {e}")
@@ -2218,13 +1675,15 @@ except Exception as e:
 st.markdown("---")
 
 # -----------------------------------------------------------
-# 🔧 Replace 1946 in resp_start_year_wetland With 79
+# 🔧 Apply Ledger Corrections to resp_start_year_wetland
 # -----------------------------------------------------------
 st.markdown("## 🔧 Fix Value in `resp_start_year_wetland`")
 
 try:
-    df['resp_start_year_wetland'] = df['resp_start_year_wetland'].replace(1946, 79)
-    st.success("Replaced 1946 with 79 in resp_start_year_wetland.")
+    corrections = read_corrections(CORRECTIONS_PATH, os.path.getmtime(CORRECTIONS_PATH))
+    audit = apply_corrections(df, corrections, columns=['resp_start_year_wetland'])
+    st.success(f"Applied {(audit['status'] == 'applied').sum()} of {len(audit)} ledger corrections to resp_start_year_wetland.")
+    st.dataframe(audit)
 
 except Exception as e:
     st.error(f"Error fixing resp_start_year_wetland: {e}")
@@ -2256,58 +1715,40 @@ except Exception as e:
     st.error(f"Error renaming column: {e}")
 
 st.markdown("### 🔍 Final Preview")
-st.dataframe(df.head())
+show_head(df)
 
 st.markdown("### 📏 Final Shape")
 st.write(df.shape)
 
 # -----------------------------------------------------------
-# 🎯 Convert `resp_years_area_wetland` Into Years of Experience (as of 2025)
+# 🎯 Convert Residence Columns Into Years of Experience (as of the interview)
 # -----------------------------------------------------------
-st.markdown("## 🎯 Convert `resp_years_area_wetland` Into Years of Experience (as of 2025)")
+st.markdown("## 🎯 Convert `resp_years_area_wetland` / `resp_years_area_forest` Into Years of Experience (as of the interview)")
 
 try:
-    # Convert to numeric
-    df["resp_years_area_wetland"] = pd.to_numeric(df["resp_years_area_wetland"], errors='coerce')
-
-    # Conversion function
-    def convert_wetland(val):
-        if pd.isna(val):
-            return np.nan
-        
-        # Case 1: value looks like a YEAR (e.g., 1950–2025)
-        if val > 1900:
-            return 2025 - val
-
-        # Case 2: already years of experience (0–120)
-        if 0 <= val <= 120:
-            return val
+    interview_year = reference_year(df, date_cols=('today', 'start_date'))
 
-        # Case 3: invalid
-        return np.nan
+    # Calendar years (> 1900) become years until the interview, durations
+    # (0–120) are kept, anything else or negative becomes NaN
+    for col in ['resp_years_area_wetland', 'resp_years_area_forest']:
+        df[col] = years_since(df[col], interview_year)
 
-    # Apply conversion
-    df["resp_years_area_wetland"] = df["resp_years_area_wetland"].apply(convert_wetland)
-
-    # Remove negative values
-    df.loc[df["resp_years_area_wetland"] < 0, "resp_years_area_wetland"] = np.nan
-
-    st.success("Converted `resp_years_area_wetland` successfully.")
+    st.success("Converted `resp_years_area_wetland` and `resp_years_area_forest` successfully.")
 
     st.markdown("### 🔍 Preview (first 20 rows)")
     st.dataframe(df["resp_years_area_wetland"].head(20))
 
+    main_profile = build_profile(df)
+
     st.markdown("### 🔢 Unique Values")
-    st.write(df["resp_years_area_wetland"].unique())
+    st.dataframe(main_profile.values(["resp_years_area_wetland"]))
 
     st.markdown("### 🔎 Compare with Related Columns")
-    st.write(
-        df[[
-            'resp_age',
-            'resp_years_area_wetland',
-            'resp_years_area_forest',
-        ]].apply(lambda x: x.unique())
-    )
+    st.dataframe(main_profile.values([
+        'resp_age',
+        'resp_years_area_wetland',
+        'resp_years_area_forest',
+    ]))
 
 except Exception as e:
     st.error(f"Error converting wetland years: {e}")
@@ -2325,8 +1766,12 @@ try:
     st.markdown("### 📌 List of Numerical Columns")
     st.write(numeric_cols.tolist())
 
+    # Profile of the table as it is now, after the corrections and year
+    # conversions above
+    main_profile = build_profile(df)
+
     st.markdown("### 📈 Summary Statistics (`df.describe()`)")
-    st.dataframe(df[numeric_cols].describe())
+    st.dataframe(main_profile.describe(numeric_cols))
 
     st.info("Use the summary to detect skewed columns, extreme values, and distribution anomalies.")
 
@@ -2334,216 +1779,232 @@ except Exception as e:
     st.error(f"Error describing numerical columns: {e}")
 
 
-st.markdown('''
-
-# ✅ **FINAL OUTLIER DIAGNOSIS (Based on the Data)**
-
-
-
-### ✔ OUTLIERS CONFIRMED
-
-
-
-## **B. GPS Precision (`gps_precision`)**
-
-| Min | Q1  | Median | Q3   | Max      |
-| --- | --- | ------ | ---- | -------- |
-| 2.3 | 4.5 | 4.8    | 4.94 | **3400** |
-
-The value **3400** is a *massive* outlier.
-
-### ✔ OUTLIER CONFIRMED
-
-* 3400 is far beyond acceptable GPS accuracy (usually ≤10)
-* This is a **data entry error**
-
----
-
-## **C. Respondent Serial Number (`resp_serial_no`)**
-
-| Min | Q1 | Median | Q3  | Max      |
-| --- | -- | ------ | --- | -------- |
-| 1   | 36 | 77     | 136 | **1133** |
-
-* Likely expected range = 1–200
-* **1133** is a strong outlier → error or duplicated coding
-
-### ✔ OUTLIER CONFIRMED
-
----
-
-# 🚨 **2. Moderate Outliers (Statistically Outside IQR but Plausible)**
-
-## **A. Altitude (`gps_altitude`)**
-
-| Min | Q1   | Median | Q3     | Max      |
-| --- | ---- | ------ | ------ | -------- |
-| 0   | 1377 | 1695   | 2286.4 | **2777** |
-
-Outliers:
-
-* Rwanda altitude range: **950–4500 m**
-* 2777 m is plausible
-* **0** is NOT plausible → GPS failed
-
-### ✔ OUTLIER: **0**
-
-### ❗ Max = OK (not an outlier)
-
----
-
-## **B. Age (`resp_age`)**
-
-| Min    | Q1 | Median | Q3 | Max    |
-| ------ | -- | ------ | -- | ------ |
-| **20** | 38 | 44     | 53 | **95** |
-
-* Age 95 is high but **not impossible**
-* No values below 18 (since min = 20)
-
-### ❗ NO STATISTICAL OUTLIERS
-
-But check logically if 95 is acceptable.
-
----
-
-## **C. Years Living Near Wetland/Forest**
-
-```
-resp_years_area_wetland
-resp_years_area_forest
-```
+# -----------------------------------------------------------
+# ✅ Validation Rules (ranges, category sets, skip logic, cross-column)
+# -----------------------------------------------------------
+st.markdown("## ✅ Validation Rules")
 
-Max values:
+try:
+    main_validation = Validator(df, MAIN_RULES)
 
-* Wetland: max = **85**
-* Forest: max = **89**
+    st.dataframe(main_validation.summary())
+    st.info(
+        f"**{int(main_validation.failing_rows.sum())}** of {len(df)} submissions break at least one rule. "
+        "Rules are defined in `cleaning/validation.py` (`MAIN_RULES`)."
+    )
+    if main_validation.skipped:
+        st.warning(f"Skipped (column not in data): {', '.join(main_validation.skipped)}")
 
-These are reasonable (older respondents).
+    st.markdown("### 🚩 Violations")
+    st.dataframe(main_validation.violations(df, id_cols=('_index', '_uuid')))
 
-### ❗ NO OUTLIERS
+except Exception as e:
+    st.error(f"Error validating main table: {e}")
 
-Unless respondent age < these numbers.
+st.markdown("---")
 
----
+# -----------------------------------------------------------
+# 📊 Outlier Detection using IQR
+# -----------------------------------------------------------
+st.markdown("## 📊 Detect Outliers in Numeric Columns (IQR Method)")
 
-# 🚨 **3. Binary Variables: No Outliers**
+# Columns to exclude
+exclude_cols = ['enum_phone_1', 'enum_phone_2', 'resp_phone_number', 'resp_serial_no']
 
-These are all **0/1** fields:
+# Select numeric columns except excluded ones
+numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns.difference(exclude_cols)
 
-```
-b_forest_wood_provision
-b_forest_timber
-b_forest_income_gen
-b_forest_habitat_animal
-b_forest_habitat_plant
-b_forest_tourism
-b_forest_aesthetics
-```
+st.info(f"Found **{len(numeric_cols)} numeric columns** for outlier analysis.")
 
-Distribution is normal for binary.
+# IQR fences, counts and masks for all numeric columns in one pass; above
+# SKETCH_MIN_ROWS the fences come from KLL sketches streamed over row chunks
+# (two passes, no cell mask), see cleaning/sketches.py
+sketched_fences = len(df) > SKETCH_MIN_ROWS
+if sketched_fences:
+    main_fences = stream_fences(lambda: iter_frame_chunks(df), numeric_cols, k=1.5)
+    st.caption(f"{len(df):,} rows: fences are read from quantile sketches "
+               f"(rank error ≤ {main_fences.bounds['max_rank_error'].max():.2%}).")
+else:
+    main_fences = IQRFences(df, numeric_cols, k=1.5)
+outlier_counts = main_fences.counts.to_dict()
 
-### ✔ NO OUTLIERS
+# Sort top 10 columns with most outliers
+top10_cols = main_fences.top(10)
 
----
+st.markdown("### 🔟 Top 10 Columns With the Most Outliers")
+st.write(top10_cols)
 
-# 🟩 **4. Variables With No Outliers**
+# -----------------------------------------------------------
+# 📦 Boxplot Visualization (Streamlit-friendly)
+# -----------------------------------------------------------
+st.markdown("### 📦 Boxplot of Top 10 Outlier Columns")
 
-```
-_index
-eco_case_study_no
-gps_latitude
-gps_longitude
-```
+# Only rendered when the section is switched on
+if st.toggle("Show boxplot", key="show_main_boxplot"):
+    # Drawn from the quartiles/whiskers already computed for detection
+    if sketched_fences:
+        box_stats = main_fences.box_stats(top10_cols)
+    else:
+        box_stats = main_fences.box_stats(df, top10_cols, max_fliers=50)
+    st.image(cached_boxplot(box_stats, "Top 10 Columns with Most Outliers"))
 
-All values within expected realistic ranges.
+# -----------------------------------------------------------
+# ✂️ Winsorized View (capped overlay, no copy of df)
+# -----------------------------------------------------------
+st.markdown("### ✂️ Winsorized View at the IQR Fences")
 
----
+if sketched_fences:
+    # Every outlying cell is capped, so the streamed counts are the capped cells
+    st.write(f"**{int(main_fences.counts.sum())} cells** would be capped across {len(main_fences.columns)} "
+             "numeric columns.")
+    st.dataframe(main_fences.bounds.loc[main_fences.counts > 0, ['lower', 'upper', 'outliers']])
+    st.markdown("#### First rows, capped")
+    capped_head = next(iter_clipped(iter_frame_chunks(df, chunk_rows=20), main_fences))
+    st.dataframe(capped_head[top10_cols])
+else:
+    main_winsor = CappedOverlay(df, main_fences)
+    st.write(f"**{main_winsor.n_capped} cells** would be capped across {len(main_winsor.columns)} numeric columns.")
+    st.dataframe(main_winsor.summary().query("n_capped > 0"))
 
-# 🟥 **SUMMARY: VARIABLES WITH OUTLIERS**
+st.markdown("---")
 
-## ❌ **Severe Outliers**
+# -----------------------------------------------------------
+# 🛰️ Investigate gps_precision Outliers
+# -----------------------------------------------------------
+st.markdown("## 🛰️ Investigating `gps_precision` Outliers")
 
+gps_preview_cols = [c for c in ['_index', '_uuid', 'addr_district', 'addr_sector', 'gps_latitude',
+                                 'gps_longitude', 'gps_altitude', 'gps_precision'] if c in df.columns]
 
-* `gps_precision` → **3400**
+# Top 10 by gps_precision without sorting the whole frame
+st.dataframe(top_rows(df, 'gps_precision', n=10, columns=gps_preview_cols))
 
+st.info("Detected unrealistic values like **3400.0** and **3099.999**, likely typographical errors.")
 
-## ❌ **Moderate Outlier**
+# -----------------------------------------------------------
+# 🔧 Correct Typo Errors in gps_precision
+# -----------------------------------------------------------
+st.markdown("### 🔧 Fix Typo Values in `gps_precision`")
 
-* `gps_altitude` → **0**
+try:
+    corrections = read_corrections(CORRECTIONS_PATH, os.path.getmtime(CORRECTIONS_PATH))
+    audit = apply_corrections(df, corrections, columns=['gps_precision'])
+    st.success(f"Applied {(audit['status'] == 'applied').sum()} of {len(audit)} ledger corrections to gps_precision.")
+    st.dataframe(audit)
 
-''')
+except Exception as e:
+    st.error(f"Error fixing gps_precision: {e}")
 
+st.dataframe(top_rows(df, 'gps_precision', n=10, columns=gps_preview_cols))
 
+st.markdown("---")
 
 # -----------------------------------------------------------
-# 📊 Outlier Detection using IQR
+# 🗺️ Spatial Checks on GPS Points (KD-tree index)
 # -----------------------------------------------------------
-st.markdown("## 📊 Detect Outliers in Numeric Columns (IQR Method)")
+st.markdown("## 🗺️ Spatial Checks on GPS Points")
 
-# Columns to exclude
-exclude_cols = ['enum_phone_1', 'enum_phone_2', 'resp_phone_number', 'resp_serial_no']
+try:
+    gps_index = PointIndex(df, lat='gps_latitude', lon='gps_longitude')
+    st.write(f"Indexed **{len(gps_index)}** GPS points.")
 
-# Select numeric columns except excluded ones
-numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns.difference(exclude_cols)
+    st.markdown("### 🚫 Missing or Outside Rwanda")
+    st.dataframe(gps_index.invalid_points(columns=gps_preview_cols))
 
-st.info(f"Found **{len(numeric_cols)} numeric columns** for outlier analysis.")
+    st.markdown("### 📍 Same Location Recorded for Different Submissions (< 1 m)")
+    location_clusters = gps_index.duplicate_clusters(radius_m=1.0, distinct_by='_uuid')
+    st.write(f"**{len(location_clusters)}** submissions share a location with another submission "
+             f"({location_clusters.nunique()} distinct spots).")
+    shared_spots = df.loc[location_clusters.index, gps_preview_cols].assign(location_cluster=location_clusters)
+    st.dataframe(shared_spots.sort_values('location_cluster').head(200))
 
-# Function to count IQR outliers
-def count_outliers(series):
-    Q1 = series.quantile(0.25)
-    Q3 = series.quantile(0.75)
-    IQR = Q3 - Q1
-    outliers = series[(series < Q1 - 1.5 * IQR) | (series > Q3 + 1.5 * IQR)]
-    return len(outliers)
+    st.markdown("### 🧭 Points Far From Their Declared Sector")
+    sector_outliers = gps_index.group_outliers('addr_sector', k=10, max_distance_m=5_000)
+    st.dataframe(sector_outliers.join(df[gps_preview_cols].drop(columns=['addr_sector'], errors='ignore')))
+    st.info("Flagged when none of the 10 nearest interviews share the declared sector "
+            "and the point is more than 5 km from that sector's median location.")
 
-# Count outliers per column
-outlier_counts = {col: count_outliers(df[col]) for col in numeric_cols}
-
-# Sort top 10 columns with most outliers
-top10_cols = sorted(outlier_counts, key=outlier_counts.get, reverse=True)[:10]
+except Exception as e:
+    st.error(f"Error running spatial checks: {e}")
 
-st.markdown("### 🔟 Top 10 Columns With the Most Outliers")
-st.write(top10_cols)
+st.markdown("---")
 
 # -----------------------------------------------------------
-# 📦 Boxplot Visualization (Streamlit-friendly)
+# 🧩 Check Points Against Local Boundary Files
 # -----------------------------------------------------------
-st.markdown("### 📦 Boxplot of Top 10 Outlier Columns")
+st.markdown("## 🧩 Check Points Against Wetland, Forest and Admin Boundaries")
 
-fig, ax = plt.subplots(figsize=(12, 8))
-sns.boxplot(data=df[top10_cols], orient='h', ax=ax)
-ax.set_title("Top 10 Columns with Most Outliers")
-ax.set_xlabel("Value")
-ax.set_ylabel("Variables")
-st.pyplot(fig)
+try:
+    boundary_layers = read_boundaries(BOUNDARY_PATH, boundary_stamp(BOUNDARY_PATH))
+    if not boundary_layers:
+        st.info(f"No boundary files found in `{BOUNDARY_DIR}/` — see `{BOUNDARY_DIR}/README.md`.")
+    else:
+        st.write(", ".join(f"**{name}**: {len(layer)} polygons" for name, layer in boundary_layers.items()))
+        point_polygons = assign_points(df, boundary_layers)
+
+        st.markdown("### 📊 Declared vs GPS-derived Location")
+        st.dataframe(mismatch_summary(point_polygons))
+
+        for layer in boundary_layers:
+            match_col = f'{layer}_match'
+            if match_col not in point_polygons:
+                continue
+            mismatched = point_polygons[point_polygons[match_col] == False]  # noqa: E712
+            if len(mismatched):
+                st.markdown(f"#### ❌ `{layer}` mismatches ({len(mismatched)})")
+                st.dataframe(df.loc[mismatched.index, ['_index', '_uuid']].join(
+                    mismatched[[f'{layer}_declared', f'{layer}_polygon']]).head(200))
+
+        distance_cols = [c for c in point_polygons.columns if c.endswith('_distance_m')]
+        outside = point_polygons[distance_cols].gt(0).any(axis=1)
+        st.markdown(f"### 🧭 Points Outside a Layer's Polygons ({int(outside.sum())})")
+        st.dataframe(df.loc[outside, gps_preview_cols].join(point_polygons.loc[outside, distance_cols]).head(200))
+
+except Exception as e:
+    st.error(f"Error checking boundaries: {e}")
 
 st.markdown("---")
 
 # -----------------------------------------------------------
-# 🛰️ Investigate gps_precision Outliers
+# 🔎 Browse the Cleaned Main DataFrame (paginated)
 # -----------------------------------------------------------
-st.markdown("## 🛰️ Investigating `gps_precision` Outliers")
+st.markdown("## 🔎 Browse the Cleaned Main DataFrame")
 
-df_sorted = df.sort_values(by='gps_precision', ascending=False)
-st.dataframe(df_sorted.head(10))
+try:
+    browse_cols = st.multiselect("Columns", df.columns.tolist(), default=df.columns[:10].tolist(), key="browse_cols")
+    browse_order = st.selectbox("Order by", ["(file order)"] + df.columns.tolist(), key="browse_order")
+    browse_desc = st.toggle("Descending", key="browse_desc")
+
+    browser = PagedView(
+        df, page_size=25, columns=browse_cols or df.columns[:10],
+        order_by=None if browse_order == "(file order)" else browse_order,
+        ascending=not browse_desc,
+    )
+    page_no = st.number_input(f"Page (1–{browser.n_pages})", min_value=1, max_value=browser.n_pages, value=1,
+                              key="browse_page")
+    st.dataframe(browser.page(page_no))
+except Exception as e:
+    st.error(f"Error browsing the main table: {e}")
 
-st.info("Detected unrealistic values like **3400.0** and **3099.999**, likely typographical errors.")
+st.markdown("---")
 
 # -----------------------------------------------------------
-# 🔧 Correct Typo Errors in gps_precision
+# 📚 Repeat-Group Sheets in the Workbook
 # -----------------------------------------------------------
-st.markdown("### 🔧 Fix Typo Values in `gps_precision`")
+st.markdown("## 📚 Repeat-Group Sheets in the Workbook")
 
-df['gps_precision'] = df['gps_precision'].replace({
-    3400.0: 34,
-    3099.999: 31
-})
-
-df_sorted2 = df.sort_values(by='gps_precision', ascending=False)
-
-st.success("Typo values corrected successfully.")
-st.dataframe(df_sorted2.head(10))
+try:
+    st.dataframe(repeat_sheets.overview())
+    inspect_sheet = st.selectbox("Inspect a repeat-group sheet", ["(none)"] + repeat_sheets.names,
+                                 key="inspect_sheet")
+    if inspect_sheet != "(none)":
+        show_head(repeat_sheets.clean(inspect_sheet))
+        st.markdown("### 🔗 Rows Linked to Households")
+        st.dataframe(repeat_sheets.link(inspect_sheet, df).summary().rename('rows'))
+    st.info("Sheets are read only when a section needs them; the shared cleaning drops empty columns "
+            "and splits the submission timestamp into Rwanda-time date and time.")
+except Exception as e:
+    st.error(f"Error listing repeat-group sheets: {e}")
 
 st.markdown("---")
 
@@ -2552,165 +2013,52 @@ st.markdown("---")
 # -----------------------------------------------------------
 st.markdown("## 🌾 Load Crop Sheet From Excel")
 
+# Renaming (CROP_COLUMN_MAP), dropping empty columns and splitting the
+# submission timestamp are the shared repeat-sheet cleaning (RepeatSheets.clean)
 try:
-    crop_df = pd.read_excel(r"(S-1-03-11 Household Question).xlsx", sheet_name="crop")
+    raw_crop_columns = repeat_sheets.load('crop').columns.tolist()
+    crop_df = repeat_sheets.clean('crop').copy()
+    crop_provenance = trace_renames(raw_crop_columns, CROP_COLUMN_MAP)
     st.success("Crop sheet loaded successfully.")
-    st.dataframe(crop_df.head())
-
-    st.markdown("### 🧾 Crop Sheet Columns")
+    show_head(crop_df)
 except Exception as e:
     st.error(f"Error loading crop sheet: {e}")
 
-st.markdown('''
-
-We’ll create clean, conventional names while keeping a reference dictionary to preserve the original column names for traceability
-
-| New Column Name           | Original Column Full Name                                                                                                                                                     |
-|--------------------------|----------------------------------------------------------------------------------------------------------------------------------------------------------------------------------|
-| crop_type                | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Which crop do you cultivate?                                                                                         |
-| crop_cycle_duration      | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/From farm preparation to harvesting the crops (yield of ${crops_wetland}), it takes you one:                         |
-| crop_area_unit           | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/You measure farm in:                                                                                                 |
-| crop_area_hectare_equiv  | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/unit_farming_area_hectare_equivalency                                                                                |
-| crop_area_size           | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Your farm is how many ${unit_farming_area}s?                                                                         |
-| crop_yield_unit          | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Harvested ${crops_wetland} crops is measured in:                                                                     |
-| crop_yield_quantity      | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Normally, how many ${unit_farming}s of havested ${crops_wetland} do you get every ${frequency_farming} for all the ${size_land_farming} - ${unit_farming_area}s that you cultivate? |
-| crop_harvest_frequency   | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/You harvest ${crops_wetland} every ${frequency_fish}. As you know, the number of ${frequency_farming}s in a year is: |
-| crop_unit_to_kg          | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/If measured on a balance, one ${unit_farming} of ${crops_wetland} is equal to how many kilograms?                    |
-| crop_yield_kg_ha_year    | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/quantity_farming_kg_ha_year                                                                                          |
-| crop_yield_calc          | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/This means that, per year, the ${crops_wetland} yied in kilograms per hectare (kg/ha/year) is: ${quantity_farming_kg_ha_year} kg/ha/year |
-| crop_market_price        | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Market price: If you sell one ${unit_farming} of harvested ${crops_wetland}, you get how much money (RWF)?           |
-| crop_fertilizer_use      | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Do you use fertilizer for growing ${crops_wetland}?                                                                  |
-| crop_cost_incurred       | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Do you incur any costs from farm preparation until you get the havested ${quantity_farming} - ${unit_farming}s of ${crops_wetland} every ${frequency_farming}? |
-| crop_expense_amount      | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/How much are those expenses?                                                                                         |
-| crop_zero_cost_entry     | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Please write zero (0) an an answer to each cost in the question below (expenses incurred)                            |
-| crop_cost_rent_land      | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of renting land:                                                                                                |
-| crop_cost_manpower       | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of manpower: RWF per person per ${frequency_farming}                                                            |
-| crop_labor_count         | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/How many persons do you use for manpower for one ${frequency_farming}?                                               |
-| crop_no_fertilizer_flag  | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/You even said you don't use fertilizer. So, I put zero cost for fertilizer...                                        |
-| crop_cost_fertilizer     | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of fertilizer: RWF                                                                                              |
-| crop_cost_seeds          | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of buying seeds: RWF                                                                                           |
-| crop_cost_pesticides     | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of fumigation / pesticides: RWF                                                                                |
-| crop_cost_other          | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Other costs in RWF:                                                                                                  |
-| crop_expenses_total      | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/expenses_farming                                                                                                     |
-| crop_expenses_total_rwf  | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Total expenses (RWF) you incur every ${frequency_farming} for growing the ${crops_wetland} = **RWF **               |
-| crop_expenses_ref        | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/${expenses_farming}                                                                                                  |
-| crop_annual_profit       | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/So, the money you benefit every year from ${crops_wetland} is:                                                       |
-| crop_annual_profit_rwf   | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/So, the money you benefit every year from ${crops_wetland} is: ${value_farming_rwf_year} RWF                        |
-| crop_value_per_ha        | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Value: money (Rwandan Francs) you benefit per hectare per year is:                                                   |
-| crop_value_per_ha_rwf    | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Value: money (Rwandan Francs) you benefit per hectare per year is: ${value_farming_rwf_ha_year} RWF                 |
-| crop_current_type        | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/crops_wetland_current                                                                                               |
-| crop_list                | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Which crop(s) do you cultivate?                                                                                      |
-| crop_area_equiv_calc     | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/unit_farming_area_hectare_equivalency_calculation                                                                   |
-| crop_hectare_equiv_note  | crop grown by your household/VALUE OF CROPS YOU CULTIVATE/The equivalency of one hectare in ${unit_farming_area} is:                                                          |
-''')
-
-column_map = {
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Which crop do you cultivate?": "crop_type",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/From farm preparation to harvesting the crops (yield of ${crops_wetland}), it takes you one:": "crop_cycle_duration",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/You measure farm in:": "crop_area_unit",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/unit_farming_area_hectare_equivalency": "crop_area_hectare_equiv",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Your farm is how many ${unit_farming_area}s?": "crop_area_size",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Harvested ${crops_wetland} crops is measured in:": "crop_yield_unit",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Normally, how many ${unit_farming}s of havested ${crops_wetland} do you get every ${frequency_farming} for all the ${size_land_farming}  - ${unit_farming_area}s that you cultivate?": "crop_yield_quantity",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/You harvest ${crops_wetland} every ${frequency_fish}. As you know, the number of ${frequency_farming}s in a year is:": "crop_harvest_frequency",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/If measured on a balance, one ${unit_farming} of ${crops_wetland} is equal to how many kilograms?": "crop_unit_to_kg",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/quantity_farming_kg_ha_year": "crop_yield_kg_ha_year",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/This means that, per year, the ${crops_wetland} yied in kilograms per hectare (kg/ha/year) is: ${quantity_farming_kg_ha_year} kg/ha/year": "crop_yield_calc",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Market price: If you sell one ${unit_farming} of harvested ${crops_wetland}, you get how much money (RWF)?": "crop_market_price",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Do you use fertilizer for growing    ${crops_wetland}?": "crop_fertilizer_use",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Do you incur any costs from farm preparation until you get the havested ${quantity_farming} - ${unit_farming}s of ${crops_wetland} every ${frequency_farming}?": "crop_cost_incurred",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/How much are those expenses?": "crop_expense_amount",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Please write zero (0) an an answer to each cost in the question below (expenses incurred)": "crop_zero_cost_entry",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of renting land:": "crop_cost_rent_land",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of manpower: RWF per person per ${frequency_farming}": "crop_cost_manpower",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/How many persons do you use for manpower for one ${frequency_farming}?": "crop_labor_count",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/You even said you don't use fertilizer. So, I put zero cost for fertilizer...": "crop_no_fertilizer_flag",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of fertilizer: RWF": "crop_cost_fertilizer",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of buying seeds: RWF": "crop_cost_seeds",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Cost of fumigation / pesticides: RWF": "crop_cost_pesticides",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Other costs in RWF:": "crop_cost_other",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/expenses_farming": "crop_expenses_total",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Total expenses (RWF) you incur every ${frequency_farming} for growing the ${crops_wetland} = **RWF **": "crop_expenses_total_rwf",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/${expenses_farming}": "crop_expenses_ref",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/So, the money you benefit every year from ${crops_wetland} is:": "crop_annual_profit",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/So, the money you benefit every year from ${crops_wetland} is: ${value_farming_rwf_year} RWF": "crop_annual_profit_rwf",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Value: money (Rwandan Francs) you benefit per hectare per year is:": "crop_value_per_ha",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Value: money (Rwandan Francs) you benefit per hectare per year is: ${value_farming_rwf_ha_year}  RWF": "crop_value_per_ha_rwf",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/crops_wetland_current": "crop_current_type",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/Which crop(s) do you cultivate?": "crop_list",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/unit_farming_area_hectare_equivalency_calculation": "crop_area_equiv_calc",
-    "crop grown by your household/VALUE OF CROPS YOU CULTIVATE/The equivalency of one hectare in ${unit_farming_area} is:": "crop_hectare_equiv_note"
-}
-# Apply rename
-crop_df.rename(columns=column_map, inplace=True)
-st.dataframe(crop_df.head())
 st.write(crop_df.shape)
 st.markdown("---")
 
 st.title("📊 Data Cleaning & Outlier Investigation Dashboard")
 
 
-st.markdown("## **2️⃣ Find Columns With No Data**")
+st.markdown("## **2️⃣ Columns Dropped Because They Had No Data**")
 
-empty_cols = crop_df.columns[crop_df.isna().all()].tolist()
-empty_cols1 = crop_df.columns[crop_df.isna().all()].tolist()
-
-empty_compare = pd.DataFrame({
-    "Filtered DF Empty Columns": pd.Series(empty_cols),
-    "Main DF Empty Columns": pd.Series(empty_cols1)
-})
-
-st.markdown("### 🟣 **Columns With All Missing Values (Comparison)**")
-st.dataframe(empty_compare)
-
-empty_columns_count = crop_df.isna().all().sum()
+renamed_crop_columns = [CROP_COLUMN_MAP.get(c, c) for c in raw_crop_columns]
+empty_cols = [c for c in renamed_crop_columns if c not in crop_df.columns and c != '_submission__submission_time']
 
 st.markdown("### 🔢 **Number of Empty Columns**")
-st.write(empty_columns_count)
+st.write(len(empty_cols))
+st.write(empty_cols)
+
+crop_profile = build_profile(crop_df)
 
 st.markdown("### 📌 NA Count per Column")
-st.write(crop_df.isna().sum())
+st.write(crop_profile.missing())
 
 st.markdown("### 📌 Non-Missing Percentage (%)")
-st.write(crop_df.notna().mean() * 100)
-
-st.markdown("---")
-
-############################################################
-# 📌 DROP EMPTY COLUMNS
-############################################################
-st.markdown("## **3️⃣ Drop Columns With No Data**")
-
-crop_df = crop_df.dropna(axis=1, how='all')
+st.write(crop_profile.coverage())
 
 st.markdown("### 📌 Remaining Columns")
 st.write(len(crop_df.columns))
 st.write(crop_df.columns.tolist())
 
-st.markdown("### 📄 **Preview After Dropping Empty Columns**")
-st.dataframe(crop_df.head())
-
-st.write(crop_df.shape)
-
 st.markdown("---")
 
 ############################################################
-# 📌 CREATE SUBMISSION DATE & TIME
+# 📌 SUBMISSION DATE & TIME
 ############################################################
-st.markdown("## 🔟 Create Submission Date & Time (UTC+2)")
-
-crop_df['_submission__submission_time'] = pd.to_datetime(
-    crop_df['_submission__submission_time'], errors='coerce', utc=True
-)
-
-crop_df['_submission__submission_time'] = crop_df['_submission__submission_time'].dt.tz_convert('Africa/Kigali')
+st.markdown("## 🔟 Submission Date & Time (UTC+2)")
 
-crop_df['submission_date'] = crop_df['_submission__submission_time'].dt.date
-crop_df['submission_time'] = crop_df['_submission__submission_time'].dt.strftime('%H:%M:%S')
-
-st.dataframe(crop_df[['submission_date', 'submission_time']].head())
-
-crop_df.drop(columns=['_submission__submission_time'], inplace=True)
+st.dataframe(head_preview(crop_df, n=5, columns=['submission_date', 'submission_time']))
 
 st.markdown("---")
 
@@ -2727,24 +2075,23 @@ crop_df['crop_cycle_duration_clean'] = crop_df['crop_cycle_duration'].str.lower(
     'year': 'Year'
 })
 
-st.dataframe(crop_df.head())
+show_head(crop_df)
 
 st.markdown("## **Replace `are` → `acre` in crop area units**")
 crop_df['crop_area_unit'] = crop_df['crop_area_unit'].replace('are', 'acre')
 
-st.write(crop_df['crop_area_unit'].unique())
-st.dataframe(crop_df.head())
+crop_profile = build_profile(crop_df)
+st.dataframe(crop_profile.values(['crop_area_unit']))
+show_head(crop_df)
 
 # -----------------------------------------------------------
 # 🔹 1. Identify Columns with Few Unique Values
 # -----------------------------------------------------------
 st.markdown("## 🔹 Identify Columns with Very Few Unique Values (0/1 or all same)")
 
-few_unique_cols = [col for col in crop_df.columns if crop_df[col].nunique() <= 2]
-
 st.write("Columns with ≤2 unique values and their unique values:")
-for col in few_unique_cols:
-    st.write(f"**{col}:** {crop_df[col].unique().tolist()}")
+for col, values in crop_profile.few_unique(crop_df, max_distinct=2).items():
+    st.write(f"**{col}:** {values}")
 
 st.markdown("---")
 
@@ -2754,93 +2101,120 @@ st.markdown("---")
 st.markdown("## 🔹 Numeric Columns Summary")
 
 numeric_cols = crop_df.select_dtypes(include=['float64', 'int64']).columns
-st.dataframe(crop_df[numeric_cols].describe())
+st.dataframe(crop_profile.describe(numeric_cols))
 
-st.markdown("""
+st.markdown("### ✅ Validation Rules")
 
+try:
+    crop_validation = Validator(crop_df, CROP_RULES)
 
-### Obvious outliers:
+    st.dataframe(crop_validation.summary())
+    st.write(f"Crop rows breaking at least one rule: **{int(crop_validation.failing_rows.sum())}** of {len(crop_df)}")
+    st.dataframe(crop_validation.violations(crop_df, id_cols=('_index', '_parent_index')))
 
-1. **`crop_area_hectare_equiv`**
+except Exception as e:
+    st.error(f"Error validating crop table: {e}")
 
-   * Mean: 10,345
-   * Max: 107,639 → ~10x higher than the 75th percentile (10,000) → extreme high outlier
 
-2. **`crop_yield_quantity`**
+st.markdown("---")
 
-   * Mean: 1,381, 75%: 3,125, Max: 7,500 → right-skewed, extreme high values
+# -----------------------------------------------------------
+# 🔹 3. Compute Outliers Using IQR
+# -----------------------------------------------------------
+st.markdown("## 🔹 Compute Outliers Per Column (IQR)")
 
-3. **`crop_harvest_frequency`**
+crop_fences = IQRFences(crop_df, numeric_cols, k=1.5)
+outlier_counts = crop_fences.counts.to_dict()
 
-   * Max: 52, 75%: 4 → very extreme value, likely a data entry error
+top_cols = crop_fences.top(10)
+st.write("Top 10 columns with most outliers:", top_cols)
 
-4. **`crop_unit_to_kg`**
+# -----------------------------------------------------------
+# 🔹 3b. Outliers Within Crop Type, Ecosystem and District
+# -----------------------------------------------------------
+st.markdown("## 🔹 Outliers Within Crop Type, Ecosystem and District (Grouped IQR)")
 
-   * Max: 4,000, 75%: 2.5 → extreme, probably wrong units
+try:
+    # Ecosystem and district come from the household (parent) row
+    parent_context = df.set_index('_index')[['eco_type', 'addr_district']]
+    crop_context = crop_df[numeric_cols].assign(
+        crop_type=crop_df['crop_type'],
+        eco_type=crop_df['_parent_index'].map(parent_context['eco_type']),
+        addr_district=crop_df['_parent_index'].map(parent_context['addr_district']),
+    )
 
-5. **`crop_yield_kg_ha_year`**
+    grouped_fences = GroupedIQRFences(
+        crop_context, by=['crop_type', 'eco_type', 'addr_district'],
+        columns=numeric_cols, k=1.5, min_group_size=5
+    )
 
-   * Max: 550,000 vs 75%: 18,248 → huge outlier
+    st.markdown("### ⚖️ Global vs Within-Group Outlier Counts")
+    st.dataframe(grouped_fences.compare().sort_values('global_outliers', ascending=False))
 
-6. **`crop_market_price`**
+    for col in ['crop_yield_kg_ha_year', 'crop_market_price', 'crop_annual_profit']:
+        if col in grouped_fences.columns:
+            st.markdown(f"### 🌱 Per-Group Fences: `{col}`")
+            st.dataframe(grouped_fences.for_column(col))
 
-   * Max: 350,000, 75%: 550 → extreme
+    st.info("Groups with fewer than 5 values fall back to the global fences.")
 
-7. **`crop_cost_rent_land`, `crop_cost_manpower`, `crop_cost_fertilizer`, `crop_cost_seeds`, `crop_cost_pesticides`, `crop_cost_other`, `crop_expenses_total`, `crop_annual_profit`**
+except Exception as e:
+    st.error(f"Error computing grouped outliers: {e}")
 
-   * Negative min values (e.g., `-7,033,400`) → clear outliers
-   * Max values way beyond 75% → extreme high values
+# -----------------------------------------------------------
+# 🔹 3c. Robust Outlier Detectors for Skewed Money Columns
+# -----------------------------------------------------------
+st.markdown("## 🔹 Compare Robust Outlier Detectors")
 
-8. **`crop_labor_count`**
+money_cols = [c for c in [
+    'crop_yield_kg_ha_year', 'crop_market_price', 'crop_cost_rent_land',
+    'crop_cost_manpower', 'crop_cost_fertilizer', 'crop_cost_seeds',
+    'crop_cost_pesticides', 'crop_cost_other', 'crop_expenses_total',
+    'crop_annual_profit', 'crop_value_per_ha'
+] if c in crop_df.columns]
 
-   * Max: 10,000 vs 75%: 8.5 → unrealistic
+try:
+    st.markdown("### ⚖️ Flags per Method")
+    st.dataframe(compare_detectors(crop_df, money_cols))
 
-9. **`crop_value_per_ha`**
+    method = st.selectbox("Detector to inspect", list(DETECTORS), index=list(DETECTORS).index('mad'))
+    detector = DETECTORS[method]()
+    flagged = detector.row_flags(crop_df, money_cols)
 
-   * Max: 397,535,439 vs 75%: 232,212,052 → huge outlier
+    st.markdown(f"### 🚩 Rows Flagged by `{method}` ({int(flagged.sum())})")
+    st.dataframe(crop_df.loc[flagged, ['_index', '_parent_index', 'crop_type', *money_cols]])
 
----
+except Exception as e:
+    st.error(f"Error comparing outlier detectors: {e}")
 
-### Summary:
+# -----------------------------------------------------------
+# 🔹 3d. Arithmetic Consistency of Derived Crop Fields
+# -----------------------------------------------------------
+st.markdown("## 🔹 Arithmetic Consistency of Derived Crop Fields")
 
-* Many numeric columns are **heavily skewed** with both extremely large max values and occasional negative values.
-* Columns like `crop_harvest_frequency`, `crop_unit_to_kg`, `crop_labor_count`, `crop_yield_kg_ha_year`, and `crop_annual_profit` should be **checked for data entry errors**.
- 
-""")
+try:
+    consistency = ConsistencyCheck(crop_df, rtol=0.01)
 
+    st.markdown("### 🧮 Recomputed Identities")
+    st.dataframe(consistency.summary())
 
-st.markdown("---")
+    st.markdown("### 🚩 Inconsistent Entries (relative deviation > 1%)")
+    st.dataframe(consistency.violations(crop_df, id_cols=['_index', '_parent_index', 'crop_type']))
 
-# -----------------------------------------------------------
-# 🔹 3. Compute Outliers Using IQR
-# -----------------------------------------------------------
-st.markdown("## 🔹 Compute Outliers Per Column (IQR)")
+    st.info("A recorded value that disagrees with its own inputs points to a data-entry error "
+            "in one of the inputs, even when neither value is a statistical outlier.")
 
-iqr_dict = {}
-outlier_counts = {}
-for col in numeric_cols:
-    Q1 = crop_df[col].quantile(0.25)
-    Q3 = crop_df[col].quantile(0.75)
-    IQR = Q3 - Q1
-    outliers = ((crop_df[col] > Q3 + 1.5*IQR) | (crop_df[col] < Q1 - 1.5*IQR))
-    outlier_counts[col] = outliers.sum()
-    iqr_dict[col] = outliers.sum()
-
-top_cols = sorted(iqr_dict, key=iqr_dict.get, reverse=True)[:10]
-st.write("Top 10 columns with most outliers:", top_cols)
+except Exception as e:
+    st.error(f"Error checking crop arithmetic: {e}")
 
 # -----------------------------------------------------------
 # 🔹 4. Visualize Outliers Before Winsorization
 # -----------------------------------------------------------
 st.markdown("## 🔹 Boxplots of Top 10 Columns with Most Outliers")
 
-fig, axes = plt.subplots(2, 5, figsize=(18, 8))
-axes = axes.flatten()
-for i, col in enumerate(top_cols):
-    sns.boxplot(y=crop_df[col], ax=axes[i])
-    axes[i].set_title(f"{col}\nOutliers: {outlier_counts[col]}")
-plt.tight_layout()
-st.pyplot(fig)
+if st.toggle("Show boxplots", key="show_crop_boxplots"):
+    box_stats = crop_fences.box_stats(crop_df, top_cols, max_fliers=50)
+    st.image(cached_boxplot_grid(box_stats))
 
 st.markdown("---")
 
@@ -2849,23 +2223,22 @@ st.markdown("---")
 # -----------------------------------------------------------
 st.markdown("## 🔹 Handle Outliers Using Winsorization (Capping at IQR)")
 
-df_before = crop_df.copy()
-df_after = crop_df.copy()
-
-for col in numeric_cols:
-    Q1 = df_after[col].quantile(0.25)
-    Q3 = df_after[col].quantile(0.75)
-    IQR = Q3 - Q1
-    lower_bound = Q1 - 1.5 * IQR
-    upper_bound = Q3 + 1.5 * IQR
-    df_after[col] = df_after[col].clip(lower=lower_bound, upper=upper_bound)
+# Overlay over crop_df: only the capped cells are stored, reusing the
+# fences computed for detection instead of recomputing quantiles
+crop_winsor = CappedOverlay(crop_df, crop_fences)
 
 st.success("✅ Outliers capped at IQR boundaries (Winsorized).")
-st.write("Shape after Winsorization:", df_after.shape)
+st.write("Shape after Winsorization:", crop_winsor.shape)
+
+st.markdown("### 📏 Fences and Capped Cells per Column")
+st.dataframe(crop_winsor.summary())
+
+st.markdown("### 🔁 Before vs After (capped cells only)")
+st.dataframe(crop_winsor.changes(id_col='_index'))
 
 st.markdown("""
-* Original data (`df_before`) remains intact  
-* Winsorized data (`df_after`) has outliers capped  
+* Original data (`crop_df`) remains intact — the overlay only references it  
+* Winsorized values are stored for the capped cells only (`crop_winsor`)  
 * Number of rows/columns remains the same
 """)
 
@@ -2877,7 +2250,7 @@ st.markdown("---")
 st.markdown("## 🔹 Merge Crop Data with Main DataFrame")
 
 cols_to_keep = [
-    'submission_time', 'crop_type', 'crop_cycle_duration', 'crop_area_unit',
+    'crop_type', 'crop_cycle_duration', 'crop_area_unit',
     'crop_area_hectare_equiv', 'crop_area_size', 'crop_yield_unit',
     'crop_yield_quantity', 'crop_harvest_frequency', 'crop_unit_to_kg',
     'crop_yield_kg_ha_year', 'crop_market_price', 'crop_fertilizer_use',
@@ -2887,19 +2260,77 @@ cols_to_keep = [
     'crop_annual_profit', 'crop_value_per_ha', 'crop_cycle_duration_clean'
 ]
 
-crop_df_subset = crop_df[cols_to_keep]
+# Crop rows are linked to their household through the Kobo parent keys
+# (_parent_index → _index, _submission__uuid → _uuid) rather than the
+# HH:MM:SS submission time, which collides for households submitted in the
+# same second.
+try:
+    crop_link = ParentLink(df, crop_df, parent_key='_index', child_key='_parent_index',
+                           parent_uuid='_uuid', child_uuid='_submission__uuid')
+    st.markdown("### 🔗 Crop Rows Linked to Households")
+    st.dataframe(crop_link.summary().rename('rows'))
+    if len(crop_link.orphans):
+        st.warning(f"{len(crop_link.orphans)} crop rows have no matching household and are left out of the merge.")
+        st.dataframe(crop_df.loc[crop_link.orphans, ['_index', '_parent_index', '_submission__uuid', 'crop_type']])
+
+    # One block of columns per crop (e.g. `maize_crop_yield_kg_ha_year`)
+    # instead of averaging different crops of a household together
+    crop_pivot = RepeatPivot(crop_df, crop_link.codes, by='crop_type', values=cols_to_keep[1:])
+    st.markdown("### 🌾 Per-Crop Columns")
+    st.write(f"**{len(crop_pivot.categories)}** crops × {len(cols_to_keep) - 1} variables → "
+             f"**{crop_pivot.wide.shape[1]}** non-empty columns for {len(crop_pivot.wide)} households.")
+    if len(crop_pivot.unlabelled):
+        st.write(f"{len(crop_pivot.unlabelled)} crop rows without a crop type are left out.")
+    for labels in crop_pivot.slug_collisions:
+        st.warning(f"Crop labels {', '.join(map(repr, labels))} share a column prefix; they are kept apart as "
+                   f"{', '.join(crop_pivot.prefixes[label] for label in labels)}.")
+    if len(crop_pivot.duplicates):
+        st.warning(f"{len(crop_pivot.duplicates)} crop rows repeat a crop already listed by the same household; "
+                   "only the first entry is kept in the per-crop columns.")
+        st.dataframe(crop_df.loc[crop_pivot.duplicates, ['_index', '_parent_index', *cols_to_keep]])
+    st.dataframe(crop_pivot.long.head(20))
+
+    # Household totals: sums of money, counts of crops and area-weighted
+    # means, so a small plot does not weigh as much as a large farm
+    household_crops = aggregate(
+        crop_df.assign(crop_area_ha=crop_df['crop_area_size'] / crop_df['crop_area_hectare_equiv']),
+        crop_link.codes, HOUSEHOLD_CROP_SPEC, n_groups=crop_link.n_parents,
+    )
+    st.markdown("### 🏠 Household Crop Totals (area-weighted)")
+    st.dataframe(pd.DataFrame(
+        {name: ' '.join(rule) for name, rule in HOUSEHOLD_CROP_SPEC.items()}, index=['rule']).T)
+    st.dataframe(household_crops.describe().T)
 
-numeric_cols = crop_df_subset.select_dtypes(include=['float64', 'int64']).columns.tolist()
-non_numeric_cols = [c for c in cols_to_keep if c not in numeric_cols and c != 'submission_time']
+    merged_df = crop_link.attach(df, pd.concat([household_crops, crop_pivot.wide], axis=1))
+    st.success("✅ Crop data merged with main DataFrame")
+    st.write("Merged DataFrame shape:", merged_df.shape)
 
-crop_df_unique = crop_df_subset.groupby('submission_time').agg(
-    {**{col: 'mean' for col in numeric_cols},
-     **{col: 'first' for col in non_numeric_cols}}
-).reset_index()
+except Exception as e:
+    st.error(f"Error merging crop data: {e}")
+    merged_df = df.copy()
+    crop_pivot = None
+
+st.markdown("---")
 
-merged_df = pd.merge(df, crop_df_unique, on='submission_time', how='left')
-st.success("✅ Crop data merged with main DataFrame")
-st.write("Merged DataFrame shape:", merged_df.shape)
+# -----------------------------------------------------------
+# 🔢 Reconcile Declared Crop Counts With Crop Rows
+# -----------------------------------------------------------
+st.markdown("## 🔢 Reconcile Declared Crop Counts With Crop Rows")
+
+try:
+    crop_counts = CountReconciliation(
+        df, crop_link, declared_count='crop_wetland_grown_sum',
+        child=crop_df, declared_list='crop_wetland_grown_list', by='crop_type',
+        aliases=CROP_CODE_ALIASES,
+    )
+    st.dataframe(crop_counts.summary())
+    st.markdown("### ⚠️ Households Whose Crop Rows Do Not Match Their Declaration")
+    st.dataframe(df.loc[crop_counts.mismatches.index, ['_index', '_uuid', 'crop_wetland_grown_list']]
+                 .join(crop_counts.mismatches))
+    st.info("`declared` is `crop_wetland_grown_sum`; `actual` is the number of crop-sheet rows linked "
+            "to the household. Crop names are compared as Kobo choice codes.")
+except Exception as e:
+    st.error(f"Error reconciling crop counts: {e}")
 
 st.markdown("---")
 
@@ -2916,18 +2347,61 @@ else:
     
 st.markdown("---")
 
-st.subheader("Download Merged Crop Dataset")
-st.write("**Final merged dataframe shape:**", merged_df.shape)
+# Per-crop and household columns of the merged table point back to their
+# crop-sheet question
+merged_provenance = dict(main_provenance)
+if crop_pivot is not None:
+    merged_provenance.update({
+        name: f"{crop_provenance.get(col, col)} [crop: {crop}]" for name, (crop, col) in crop_pivot.sources.items()
+    })
+    merged_provenance.update({
+        name: f"{rule[0]}({', '.join(rule[1:])}) over the household's crop rows"
+        for name, rule in HOUSEHOLD_CROP_SPEC.items()
+    })
+
+export_tables = {
+    'merged_crop_dataset': (merged_df, merged_provenance),
+    'main_cleaned': (df, main_provenance),
+    'crop_cleaned': (crop_df, crop_provenance),
+}
+outlier_report = pd.concat(
+    {'main': main_fences.bounds, 'crop': crop_fences.bounds}, names=['table', 'column']
+).reset_index()
+save_checkpoint('post_merge', {**export_tables, 'outlier_report': outlier_report})
 
-@st.cache_data
-def convert_df_to_csv(df):
-    return df.to_csv(index=False).encode('utf-8')
+# -----------------------------------------------------------
+# 📖 Data Dictionary (generated from the rename maps)
+# -----------------------------------------------------------
+st.markdown("## 📖 Data Dictionary")
 
-csv_download = convert_df_to_csv(merged_df)
+if st.toggle("Show the data dictionary", key="show_dictionary"):
+    try:
+        dictionary_name = st.selectbox("Table", list(export_tables), key="dictionary_table")
+        dictionary_df, dictionary_provenance = export_tables[dictionary_name]
+        data_dictionary = build_dictionary(dictionary_df, dictionary_provenance, build_profile(dictionary_df))
+
+        dictionary_filter = st.text_input("Filter by column, question or section", key="dictionary_filter")
+        shown = data_dictionary
+        if dictionary_filter:
+            text = data_dictionary[['column', 'original_question', 'section']].astype(str).agg(' '.join, axis=1)
+            shown = data_dictionary[text.str.contains(dictionary_filter, case=False, regex=False)]
+        st.write(f"**{len(shown)}** of {len(data_dictionary)} columns")
+        st.dataframe(shown, hide_index=True)
+
+        for label, data, ext, mime in (
+            ("CSV", data_dictionary.to_csv(index=False), 'csv', 'text/csv'),
+            ("Markdown", to_markdown(data_dictionary), 'md', 'text/markdown'),
+            ("HTML", to_html(data_dictionary, f"Data dictionary — {dictionary_name}"), 'html', 'text/html'),
+        ):
+            st.download_button(f"📥 Dictionary as {label}", data=data,
+                               file_name=f"data_dictionary_{dictionary_name}.{ext}", mime=mime,
+                               key=f"dictionary_{ext}")
+    except Exception as e:
+        st.error(f"Error building the data dictionary: {e}")
 
-st.download_button(
-    label="📥 Download merged_df as CSV",
-    data=csv_download,
-    file_name='merged_crop_dataset.csv',
-    mime='text/csv'
-)
+st.markdown("---")
+
+st.subheader("Download Merged Crop Dataset")
+st.write("**Final merged dataframe shape:**", merged_df.shape)
+
+render_downloads(export_tables, outlier_report, uploaded_file.name)
@@ -0,0 +1 @@
+"""Reusable cleaning and diagnostics helpers for the household survey dashboard."""
@@ -0,0 +1,87 @@
+"""Household-level aggregation of repeat-group rows.
+
+Each output column is declared as ``name: (func, column[, weight])`` and
+computed from integer group codes (the parent positions of ``ParentLink``)
+with ``np.bincount`` for sums, counts and (weighted) means and
+``ufunc.reduceat`` over a single stable sort for minima and maxima. All
+columns share the same codes, so the whole table is one grouped pass
+without building a pandas ``GroupBy`` per aggregation.
+
+Functions: ``sum``, ``count``, ``mean``, ``wmean`` (weighted by a third
+element, rows with a missing or non-positive weight are skipped), ``min``
+and ``max``. Groups with no values get NaN (``count`` gives 0).
+"""
+
+import numpy as np
+import pandas as pd
+
+# Crop plots of one household, weighted by cultivated area in hectares.
+# Market prices are per crop and per harvest unit (kg, sac, basket), so they
+# are only kept in the per-crop pivot columns.
+HOUSEHOLD_CROP_SPEC = {
+    'hh_crop_count': ('count', 'crop_type'),
+    'hh_crop_area_ha': ('sum', 'crop_area_ha'),
+    'hh_crop_expenses_total': ('sum', 'crop_expenses_total'),
+    'hh_crop_annual_profit': ('sum', 'crop_annual_profit'),
+    'hh_crop_yield_kg_ha_year': ('wmean', 'crop_yield_kg_ha_year', 'crop_area_ha'),
+    'hh_crop_value_per_ha': ('wmean', 'crop_value_per_ha', 'crop_area_ha'),
+    'hh_crop_labor_count_max': ('max', 'crop_labor_count'),
+}
+
+
+def _as_float(series):
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+
+def aggregate(frame, codes, spec, n_groups=None):
+    """One row per group present in ``codes`` (rows with code -1 are ignored).
+
+    The result is indexed by group code, e.g. the parent position expected
+    by ``ParentLink.attach``.
+    """
+    codes = np.asarray(codes, dtype=np.intp)
+    valid = codes >= 0
+    if n_groups is None:
+        n_groups = int(codes.max()) + 1 if valid.any() else 0
+    rows = np.bincount(codes[valid], minlength=n_groups)
+    present = np.flatnonzero(rows)
+
+    order = np.argsort(np.where(valid, codes, n_groups), kind='stable')[:int(valid.sum())]
+    sorted_codes = codes[order]
+
+    out = {}
+    for name, (func, column, *weight) in spec.items():
+        if func == 'count':
+            has = valid & frame[column].notna().to_numpy()
+            out[name] = np.bincount(codes[has], minlength=n_groups)[present]
+            continue
+
+        x = _as_float(frame[column])
+        has = valid & ~np.isnan(x)
+        n = np.bincount(codes[has], minlength=n_groups)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if func in ('sum', 'mean'):
+                total = np.bincount(codes[has], weights=x[has], minlength=n_groups)
+                result = np.where(n > 0, total if func == 'sum' else total / n, np.nan)
+
+            elif func == 'wmean':
+                w = _as_float(frame[weight[0]])
+                has &= ~np.isnan(w) & (w > 0)
+                wsum = np.bincount(codes[has], weights=w[has], minlength=n_groups)
+                wx = np.bincount(codes[has], weights=w[has] * x[has], minlength=n_groups)
+                result = np.where(wsum > 0, wx / wsum, np.nan)
+
+            elif func in ('min', 'max'):
+                ufunc = np.fmin if func == 'min' else np.fmax
+                starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+                result = np.full(n_groups, np.nan)
+                if len(order):
+                    result[sorted_codes[starts]] = ufunc.reduceat(x[order], starts)
+
+            else:
+                raise ValueError(f"Unknown aggregation '{func}' for '{name}'")
+
+        out[name] = result[present]
+
+    return pd.DataFrame(out, index=present)
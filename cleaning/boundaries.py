@@ -0,0 +1,167 @@
+"""Point-in-polygon assignment against local boundary files.
+
+Boundary layers (wetlands, forests, administrative units) are read from
+GeoJSON or shapefiles on disk, in WGS84 longitude/latitude; nothing is
+fetched over the network. All polygons of a layer go into a shapely
+``STRtree`` and every GPS point is tested in one bulk ``intersects`` query,
+which only runs exact tests against polygons whose bounding boxes contain
+the point.
+"""
+
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import shape
+
+BOUNDARY_DIR = "boundaries"
+
+# Layer name -> file stem inside BOUNDARY_DIR, the attribute holding the
+# polygon's name, and the survey column it should agree with
+BOUNDARY_LAYERS = {
+    'wetland': {'file': 'wetlands', 'name_field': 'name', 'compare_to': 'eco_wetland_name'},
+    'forest': {'file': 'forests', 'name_field': 'name', 'compare_to': 'eco_forest_name'},
+    'district': {'file': 'districts', 'name_field': 'district', 'compare_to': 'addr_district'},
+    'sector': {'file': 'sectors', 'name_field': 'sector', 'compare_to': 'addr_sector'},
+}
+
+BOUNDARY_EXTENSIONS = ('.geojson', '.json', '.shp')
+
+# Words dropped before comparing declared and polygon names
+_NAME_NOISE = re.compile(r"\b(wetland|wetlands|marshland|marsh|swamp|forest|national park|park|reserve|district|sector)\b")
+
+METRES_PER_DEGREE = 111_320.0
+
+
+def normalise_name(values):
+    """Case-fold, drop generic words ('wetland', 'forest', ...) and punctuation."""
+    s = pd.Series(values, dtype=object).astype('string').str.casefold()
+    s = s.str.replace(_NAME_NOISE, ' ', regex=True).str.replace(r"[^0-9a-z]+", '', regex=True)
+    return s.replace('', pd.NA).reset_index(drop=True)
+
+
+def find_layer_file(directory, stem):
+    for ext in BOUNDARY_EXTENSIONS:
+        path = os.path.join(directory, stem + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _read_features(path):
+    if path.lower().endswith('.shp'):
+        try:
+            import shapefile
+        except ImportError as e:
+            raise ImportError("Reading shapefiles needs the 'pyshp' package.") from e
+        with shapefile.Reader(path) as reader:
+            return [
+                {'geometry': rec.shape.__geo_interface__, 'properties': rec.record.as_dict()}
+                for rec in reader.iterShapeRecords()
+            ]
+    with open(path, encoding='utf-8') as fh:
+        data = json.load(fh)
+    return data['features'] if data.get('type') == 'FeatureCollection' else [data]
+
+
+class BoundaryLayer:
+    """Named polygons from one boundary file, indexed with an STRtree."""
+
+    def __init__(self, path, name_field='name'):
+        self.path = path
+        features = [f for f in _read_features(path) if f.get('geometry')]
+        self.geometries = np.array([shape(f['geometry']) for f in features], dtype=object)
+        self.names = pd.Series(
+            [(f.get('properties') or {}).get(name_field) for f in features], dtype=object
+        )
+        self.tree = shapely.STRtree(self.geometries)
+
+    def __len__(self):
+        return len(self.geometries)
+
+    def assign(self, lat, lon):
+        """Polygon name per point (NaN outside every polygon).
+
+        Points on a shared border match both polygons; where polygons
+        overlap, the smallest one touching the point wins.
+        Points outside all polygons get their distance to the nearest one.
+        """
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        valid = np.isfinite(lat) & np.isfinite(lon)
+        points = shapely.points(np.where(valid, lon, 0.0), np.where(valid, lat, 0.0))
+
+        point_idx, poly_idx = self.tree.query(points[valid], predicate='intersects')
+        point_idx = np.flatnonzero(valid)[point_idx]
+
+        # Smallest containing polygon first, then keep one hit per point
+        order = np.lexsort((shapely.area(self.geometries[poly_idx]), point_idx))
+        point_idx, poly_idx = point_idx[order], poly_idx[order]
+        first = np.r_[True, point_idx[1:] != point_idx[:-1]]
+        point_idx, poly_idx = point_idx[first], poly_idx[first]
+
+        polygon = np.full(len(lat), -1, dtype=np.intp)
+        polygon[point_idx] = poly_idx
+        names = np.where(polygon >= 0, self.names.to_numpy()[polygon], None)
+
+        distance = np.where(polygon >= 0, 0.0, np.nan)
+        outside = valid & (polygon < 0)
+        if outside.any():
+            _, dist = self.tree.query_nearest(points[outside], return_distance=True, all_matches=False)
+            distance[outside] = dist * METRES_PER_DEGREE
+
+        return pd.DataFrame({'polygon': names, 'distance_m': distance})
+
+
+def load_layers(directory=BOUNDARY_DIR, layers=BOUNDARY_LAYERS):
+    """Every configured layer that has a file in ``directory``."""
+    loaded = {}
+    for layer, spec in layers.items():
+        path = find_layer_file(directory, spec['file'])
+        if path is not None:
+            loaded[layer] = BoundaryLayer(path, spec['name_field'])
+    return loaded
+
+
+def assign_points(df, loaded, layers=BOUNDARY_LAYERS, lat='gps_latitude', lon='gps_longitude'):
+    """Assign every row to each loaded layer and compare with the survey answer.
+
+    Returns one row per submission with, for each layer, the polygon name,
+    the distance (m, approximate) to the nearest polygon when outside all of
+    them, and ``<layer>_match``: True/False when both the declared and the
+    assigned names are known, NA otherwise.
+    """
+    lats = pd.to_numeric(df[lat], errors='coerce').to_numpy(dtype=float)
+    lons = pd.to_numeric(df[lon], errors='coerce').to_numpy(dtype=float)
+    out = pd.DataFrame(index=df.index)
+    for layer, boundary in loaded.items():
+        result = boundary.assign(lats, lons)
+        out[f'{layer}_polygon'] = result['polygon'].to_numpy()
+        out[f'{layer}_distance_m'] = result['distance_m'].to_numpy()
+
+        declared_col = layers[layer].get('compare_to')
+        if declared_col in df.columns:
+            declared = normalise_name(df[declared_col].to_numpy())
+            assigned = normalise_name(out[f'{layer}_polygon'].to_numpy())
+            match = (declared == assigned).set_axis(df.index)
+            out[f'{layer}_declared'] = df[declared_col]
+            out[f'{layer}_match'] = match
+    return out
+
+
+def mismatch_summary(assigned):
+    """Points checked, matching and mismatching per layer."""
+    rows = {}
+    for col in assigned.columns:
+        if col.endswith('_match'):
+            match = assigned[col]
+            rows[col[:-len('_match')]] = {
+                'inside_a_polygon': int(assigned[col.replace('_match', '_polygon')].notna().sum()),
+                'checked': int(match.notna().sum()),
+                'match': int((match == True).sum()),  # noqa: E712
+                'mismatch': int((match == False).sum()),  # noqa: E712
+            }
+    return pd.DataFrame.from_dict(rows, orient='index')
@@ -0,0 +1,188 @@
+"""Checkpoints of the cleaning pipeline's intermediate tables.
+
+After the final merge the tables are written as Parquet (via
+``export.write_parquet``, so dtypes and column provenance are kept) next to
+a JSON file recording the stage, the SHA-256 of the input workbook and a
+fingerprint of the cleaning code. Each (input, code version) pair gets its
+own directory, so different workbooks never overwrite each other, and a
+checkpoint is only used when both still match.
+
+Files are written to a temporary name and moved into place with
+``os.replace``. A stage's JSON is removed before its tables are rewritten
+and written again last, so a checkpoint interrupted halfway is never
+resumed. A stage whose tables hash to the saved fingerprint is not
+rewritten.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from cleaning.export import write_parquet
+
+# Pipeline order; later stages supersede earlier ones. Only stages the app
+# can resume from are saved.
+STAGES = ('post_merge',)
+
+CHECKPOINT_DIR = "checkpoints"
+
+
+def input_hash(data):
+    """SHA-256 of the input workbook (bytes or path)."""
+    digest = hashlib.sha256()
+    if isinstance(data, (bytes, bytearray)):
+        digest.update(data)
+    else:
+        with open(data, 'rb') as fh:
+            for block in iter(lambda: fh.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def code_version(root=None):
+    """Fingerprint of ``app.py`` and the ``cleaning`` package sources."""
+    root = root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = [os.path.join(root, 'app.py')] + sorted(glob.glob(os.path.join(root, 'cleaning', '*.py')))
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.exists(path):
+            digest.update(os.path.relpath(path, root).encode())
+            with open(path, 'rb') as fh:
+                digest.update(fh.read())
+    return digest.hexdigest()[:16]
+
+
+def table_fingerprint(tables):
+    """Hash of the columns, dtypes and values of ``{name: DataFrame}``."""
+    digest = hashlib.sha256()
+    for name in sorted(tables):
+        table = tables[name]
+        df = table[0] if isinstance(table, tuple) else table
+        digest.update(name.encode())
+        digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _replace_into(path, write):
+    """Call ``write(tmp_path)`` and atomically move the result to ``path``."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _provenance(path):
+    return {
+        f.name: f.metadata[b'original'].decode()
+        for f in pq.read_schema(path) if f.metadata and b'original' in f.metadata
+    }
+
+
+class CheckpointStore:
+    """Checkpoints for one input file and code version.
+
+    They live in ``<directory>/<input sha>_<code version>``.
+    ``save(stage, tables)`` writes ``{name: DataFrame}`` (optionally
+    ``{name: (DataFrame, provenance)}``) and returns False when the stage
+    already holds the same tables; ``load(stage)`` returns the same mapping
+    with provenance read back from the Parquet metadata, or None if the
+    checkpoint is missing, incomplete or stale.
+    """
+
+    def __init__(self, directory=CHECKPOINT_DIR, input_sha=None, version=None):
+        self.input_sha = input_sha
+        self.version = version or code_version()
+        self.directory = os.path.join(directory, f"{(input_sha or 'unknown')[:16]}_{self.version}")
+
+    def _path(self, stage, table=None):
+        name = stage if table is None else f"{stage}__{table}"
+        return os.path.join(self.directory, name + ('.json' if table is None else '.parquet'))
+
+    def save(self, stage, tables, metadata=None):
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}'")
+        fingerprint = table_fingerprint(tables)
+        current = self.info(stage)
+        if current is not None and current.get('fingerprint') == fingerprint:
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Invalidate the stage before touching its tables
+        if os.path.exists(self._path(stage)):
+            os.remove(self._path(stage))
+        shapes = {}
+        for name, table in tables.items():
+            df, provenance = table if isinstance(table, tuple) else (table, None)
+            _replace_into(self._path(stage, name), lambda tmp: write_parquet(
+                df, tmp, provenance=provenance, metadata={'stage': stage, 'table': name}))
+            shapes[name] = list(df.shape)
+
+        # The JSON is written last: a checkpoint without it is incomplete
+        meta = {
+            'stage': stage,
+            'input_sha256': self.input_sha,
+            'code_version': self.version,
+            'created': datetime.now(timezone.utc).isoformat(),
+            'fingerprint': fingerprint,
+            'tables': shapes,
+            **(metadata or {}),
+        }
+
+        def write_json(tmp):
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                json.dump(meta, fh, indent=2)
+
+        _replace_into(self._path(stage), write_json)
+        return True
+
+    def info(self, stage):
+        """Metadata of a valid checkpoint, or None."""
+        try:
+            with open(self._path(stage), encoding='utf-8') as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if meta.get('input_sha256') != self.input_sha or meta.get('code_version') != self.version:
+            return None
+        if not all(os.path.exists(self._path(stage, name)) for name in meta.get('tables', {})):
+            return None
+        return meta
+
+    def load(self, stage):
+        meta = self.info(stage)
+        if meta is None:
+            return None
+        return {
+            name: (pd.read_parquet(self._path(stage, name)), _provenance(self._path(stage, name)))
+            for name in meta['tables']
+        }
+
+    def latest(self, stages=STAGES):
+        """Last stage (in pipeline order) with a valid checkpoint, or None."""
+        for stage in reversed(stages):
+            if self.info(stage) is not None:
+                return stage
+        return None
+
+    def overview(self):
+        rows = []
+        for stage in STAGES:
+            meta = self.info(stage)
+            rows.append({
+                'stage': stage,
+                'valid': meta is not None,
+                'created': meta['created'] if meta else None,
+                'tables': ', '.join(meta['tables']) if meta else None,
+            })
+        return pd.DataFrame(rows).set_index('stage')
@@ -0,0 +1,95 @@
+"""Arithmetic consistency checks for derived survey fields.
+
+The crop sheet stores fields the form calculated from other answers. When an
+enumerator mistypes an input (wrong unit, extra zero), the recorded value and
+the value recomputed from the inputs disagree. Each identity is a
+``DataFrame.eval`` expression evaluated for all rows at once.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Recorded field -> expression recomputing it from the inputs (Kobo form logic)
+CROP_IDENTITIES = {
+    'crop_yield_kg_ha_year': (
+        'crop_yield_quantity * crop_harvest_frequency * crop_unit_to_kg'
+        ' / (crop_area_size / crop_area_hectare_equiv)'
+    ),
+    'crop_expenses_total': (
+        'crop_cost_rent_land + crop_cost_manpower * crop_labor_count'
+        ' + crop_cost_fertilizer + crop_cost_seeds + crop_cost_pesticides + crop_cost_other'
+    ),
+    'crop_annual_profit': (
+        '(crop_yield_quantity * crop_market_price - crop_expenses_total) * crop_harvest_frequency'
+    ),
+    'crop_value_per_ha': (
+        'crop_annual_profit / (crop_area_size / crop_area_hectare_equiv)'
+    ),
+}
+
+
+class ConsistencyCheck:
+    """Recomputes every identity and compares it with the recorded field.
+
+    ``deviations`` has one column per identity with the relative deviation
+    ``|recorded - expected| / |expected|`` (NaN where an input is missing);
+    cells above ``rtol`` are inconsistent.
+    """
+
+    def __init__(self, df, identities=CROP_IDENTITIES, rtol=0.01):
+        self.identities = {
+            field: expr for field, expr in identities.items() if field in df.columns
+        }
+        self.rtol = rtol
+
+        recorded, expected = {}, {}
+        for field, expr in self.identities.items():
+            try:
+                expected[field] = pd.to_numeric(df.eval(expr), errors='coerce').astype(float)
+            except Exception:  # an input column is missing from this frame
+                continue
+            recorded[field] = pd.to_numeric(df[field], errors='coerce').astype(float)
+
+        self.recorded = pd.DataFrame(recorded, index=df.index)
+        self.expected = pd.DataFrame(expected, index=df.index)
+
+        rec = self.recorded.to_numpy()
+        exp = self.expected.to_numpy()
+        diff = np.abs(rec - exp)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rel = np.where(np.isfinite(exp) & (exp != 0), diff / np.abs(exp),
+                           np.where(diff == 0, 0.0, np.inf))
+        rel[np.isnan(rec) | np.isnan(exp)] = np.nan
+        self.deviations = pd.DataFrame(rel, index=df.index, columns=self.expected.columns)
+
+    @property
+    def mask(self):
+        return self.deviations > self.rtol
+
+    def summary(self):
+        """Rows checked, inconsistent rows and worst deviation per identity."""
+        return pd.DataFrame({
+            'formula': pd.Series(self.identities)[self.deviations.columns],
+            'checked': self.deviations.notna().sum(),
+            'inconsistent': self.mask.sum(),
+            'max_rel_deviation': self.deviations.max(),
+        })
+
+    def violations(self, df=None, id_cols=('_index',)):
+        """Long table of inconsistent cells, worst first.
+
+        Pass the checked ``df`` to carry its ``id_cols`` along.
+        """
+        mask = self.mask
+        out = pd.concat({
+            'rel_deviation': self.deviations.where(mask).stack(),
+            'recorded': self.recorded.where(mask).stack(),
+            'expected': self.expected.where(mask).stack(),
+        }, axis=1)
+        out.index.names = ['row', 'field']
+        out = out.dropna(subset=['rel_deviation']).reset_index()
+        if df is not None:
+            for col in id_cols:
+                if col in df.columns:
+                    out[col] = df.loc[out['row'], col].to_numpy()
+        return out.sort_values('rel_deviation', ascending=False, ignore_index=True)
@@ -0,0 +1,50 @@
+"""Vectorized conversions for the respondent age / residence columns.
+
+Respondents answered "since when" questions either with a calendar year
+(e.g. 1985) or with a number of years (e.g. 37). Both forms are turned into
+years as of the interview, using each row's own interview date rather than a
+hard-coded year.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Values above this are read as calendar years, values in [0, MAX_YEARS] as durations
+YEAR_FLOOR = 1900
+MAX_YEARS = 120
+
+
+def reference_year(df, date_cols=('today', 'start_date'), default=None):
+    """Interview year per row, from the first available of ``date_cols``.
+
+    Rows without any usable date fall back to ``default`` (the current year
+    if not given).
+    """
+    year = pd.Series(np.nan, index=df.index, dtype=float)
+    for col in date_cols:
+        if col in df.columns:
+            year = year.fillna(pd.to_datetime(df[col], errors='coerce').dt.year)
+    if default is None:
+        default = datetime.now().year
+    return year.fillna(default)
+
+
+def years_since(values, ref_year, year_floor=YEAR_FLOOR, max_years=MAX_YEARS):
+    """Convert a year-or-duration column into years as of ``ref_year``.
+
+    * values above ``year_floor`` are calendar years → ``ref_year - value``
+    * values in ``[0, max_years]`` are already durations and are kept
+    * anything else, and any negative result, becomes NaN
+    """
+    vals = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    ref = np.broadcast_to(np.asarray(ref_year, dtype=float), vals.shape)
+
+    out = np.select(
+        [vals > year_floor, (vals >= 0) & (vals <= max_years)],
+        [ref - vals, vals],
+        default=np.nan,
+    )
+    out[out < 0] = np.nan
+    return pd.Series(out, index=values.index, name=values.name)
@@ -0,0 +1,162 @@
+"""Keyed corrections ledger.
+
+Manual data fixes live in a CSV ledger instead of hard-coded ``replace`` calls,
+so a fix only touches the submission it was meant for. Each ledger row names
+the submission (``_index`` and/or ``_uuid``), the column, the value expected
+there (``old``), the replacement (``new``) and a ``reason``.
+
+Rows are located with a single hash lookup on the key, and each column is
+written with one bulk positional update, however many fixes it has. Every
+ledger row comes back in the audit trail with its outcome.
+"""
+
+import numpy as np
+import pandas as pd
+
+LEDGER_COLUMNS = ['_index', '_uuid', 'column', 'old', 'new', 'reason']
+
+# Keys tried in order; the first one that resolves to exactly one row wins
+# and the others must agree with it
+KEY_COLUMNS = ('_index', '_uuid')
+
+# Row positions of ledger entries that do not resolve to a single row
+NOT_FOUND, AMBIGUOUS = -1, -2
+
+
+def load_ledger(path):
+    """Read a corrections ledger CSV (all values kept as text until applied)."""
+    ledger = pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[''])
+    missing = [c for c in ['column', 'old', 'new'] if c not in ledger.columns]
+    if missing:
+        raise ValueError(f"Corrections ledger is missing columns: {missing}")
+    if not any(k in ledger.columns for k in KEY_COLUMNS):
+        raise ValueError(f"Corrections ledger needs at least one key column: {list(KEY_COLUMNS)}")
+    return ledger.reindex(columns=LEDGER_COLUMNS)
+
+
+def _coerce_like(values, target):
+    if pd.api.types.is_numeric_dtype(target) and not pd.api.types.is_bool_dtype(target):
+        return pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    if pd.api.types.is_datetime64_any_dtype(target):
+        return pd.to_datetime(values, errors='coerce').to_numpy()
+    return values.to_numpy(dtype=object)
+
+
+def _fit_target(target, values):
+    """``target`` cast so that ``values`` can be written into it.
+
+    Integer columns stay integer when every correction is a whole number and
+    become float otherwise; other dtypes fall back to object when needed.
+    """
+    if pd.api.types.is_integer_dtype(target) and values.dtype.kind == 'f':
+        if np.isfinite(values).all() and (values == np.round(values)).all():
+            return target
+        return target.astype('Float64' if pd.api.types.is_extension_array_dtype(target) else float)
+    if target.dtype != object and values.dtype == object:
+        return target.astype(object)
+    return target
+
+
+def _key_positions(df, key, wanted):
+    """Row position per wanted key value; NOT_FOUND or AMBIGUOUS otherwise."""
+    keys = df[key]
+    if pd.api.types.is_numeric_dtype(keys):
+        wanted = pd.to_numeric(wanted, errors='coerce').astype(float)
+        keys = keys.astype(float)
+    duplicated = keys.duplicated(keep=False).to_numpy()
+    unique = pd.Index(keys.to_numpy()[~duplicated])
+    found = unique.get_indexer(wanted.to_numpy())
+    pos = np.where(found >= 0, np.flatnonzero(~duplicated)[found], NOT_FOUND)
+    pos[wanted.isin(keys[duplicated]).to_numpy()] = AMBIGUOUS
+    return pos, wanted.to_numpy(), keys.to_numpy()
+
+
+def _locate(df, ledger):
+    """Row position of every ledger entry in ``df`` and why it has none.
+
+    The first key that resolves to exactly one row gives the position; every
+    other key given for the entry must hold the same submission's value
+    there, otherwise the entry is rejected as a ``key mismatch``.
+    """
+    n = len(ledger)
+    pos = np.full(n, NOT_FOUND, dtype=np.intp)
+    ambiguous = np.zeros(n, dtype=bool)
+    lookups = []
+    for key in KEY_COLUMNS:
+        if key not in df.columns or key not in ledger.columns:
+            continue
+        given = ledger[key].notna().to_numpy()
+        if not given.any():
+            continue
+        key_pos, wanted, keys = _key_positions(df, key, ledger[key])
+        key_pos[~given] = NOT_FOUND
+        ambiguous |= key_pos == AMBIGUOUS
+        pos = np.where(pos >= 0, pos, np.maximum(key_pos, NOT_FOUND))
+        lookups.append((given, wanted, keys))
+
+    mismatch = np.zeros(n, dtype=bool)
+    located = pos >= 0
+    for given, wanted, keys in lookups:
+        check = located & given
+        mismatch[check] = pd.Series(keys[pos[check]]).astype(str).to_numpy() != \
+            pd.Series(wanted[check]).astype(str).to_numpy()
+
+    problem = np.select([mismatch, located, ambiguous], ['key mismatch', '', 'ambiguous key'], 'row not found')
+    pos[mismatch] = NOT_FOUND
+    return pos, problem
+
+
+def apply_corrections(df, ledger, columns=None):
+    """Apply ``ledger`` to ``df`` in place and return the audit trail.
+
+    Only entries whose current value still equals ``old`` are written; the
+    audit trail (one row per ledger entry) records ``found`` (the value that
+    was there) and ``status``: ``applied``, ``stale`` (value differs from
+    ``old``), ``row not found``, ``ambiguous key`` (the key matches several
+    rows), ``key mismatch`` (``_index`` and ``_uuid`` name different
+    submissions) or ``column not found``. ``columns``
+    restricts the ledger to a subset of columns, so fixes can be applied at
+    the stage where the column exists.
+    """
+    if columns is not None:
+        ledger = ledger[ledger['column'].isin(columns)]
+    audit = ledger.reset_index(drop=True).copy()
+    audit['found'] = None
+    audit['status'] = 'row not found'
+    if audit.empty:
+        return audit
+
+    pos, problem = _locate(df, audit)
+    audit['status'] = np.where(pos >= 0, audit['status'], problem)
+
+    for col, entries in audit.groupby('column', sort=False):
+        idx = entries.index.to_numpy()
+        if col not in df.columns:
+            audit.loc[idx, 'status'] = 'column not found'
+            continue
+
+        rows = pos[idx]
+        located = rows >= 0
+        idx, rows = idx[located], rows[located]
+        if not len(rows):
+            continue
+
+        target = df[col]
+        current = target.to_numpy()[rows]
+        old = _coerce_like(audit.loc[idx, 'old'], target)
+        new = _coerce_like(audit.loc[idx, 'new'], target)
+
+        if old.dtype.kind == 'f':
+            matches = np.isclose(current.astype(float), old, rtol=1e-9, atol=0, equal_nan=True)
+        else:
+            matches = pd.Series(current).astype(str).to_numpy() == pd.Series(old).astype(str).to_numpy()
+
+        audit.loc[idx, 'found'] = pd.Series(current, index=idx, dtype=object)
+        audit.loc[idx, 'status'] = np.where(matches, 'applied', 'stale')
+
+        if matches.any():
+            updated = _fit_target(target, new[matches]).copy()
+            updated.iloc[rows[matches]] = new[matches]
+            df[col] = updated
+
+    return audit
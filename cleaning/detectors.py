@@ -0,0 +1,251 @@
+"""Pluggable outlier detectors.
+
+Every detector exposes ``detect(df, columns)`` returning a boolean mask:
+a frame of flagged cells for univariate detectors, or a Series of flagged
+rows for multivariate ones. ``row_flags`` reduces either form to rows.
+
+Tukey's 1.5·IQR rule assumes a roughly symmetric distribution; the crop money
+columns are heavily right-skewed and can be negative, so robust alternatives
+are provided alongside it. Look detectors up by name in ``DETECTORS``.
+"""
+
+import abc
+
+import numpy as np
+import pandas as pd
+
+from cleaning.outliers import IQRFences
+
+
+def _numeric_columns(df, columns):
+    if columns is None:
+        columns = df.select_dtypes(include='number').columns
+    return pd.Index(columns)
+
+
+def signed_log(values):
+    """``sign(x) * log1p(|x|)``: compresses both tails and keeps negatives."""
+    return np.sign(values) * np.log1p(np.abs(values))
+
+
+class OutlierDetector(abc.ABC):
+    """Base class; subclasses implement ``detect``."""
+
+    name = None
+    multivariate = False
+
+    @abc.abstractmethod
+    def detect(self, df, columns=None):
+        """Boolean outlier mask (cells, or rows if ``multivariate``)."""
+
+    def row_flags(self, df, columns=None):
+        mask = self.detect(df, columns)
+        return mask if self.multivariate else mask.any(axis=1)
+
+
+class IQRDetector(OutlierDetector):
+    """Tukey fences at ``Q1 - k·IQR`` / ``Q3 + k·IQR``."""
+
+    name = 'iqr'
+
+    def __init__(self, k=1.5):
+        self.k = k
+
+    def detect(self, df, columns=None):
+        return IQRFences(df, _numeric_columns(df, columns), k=self.k).mask
+
+
+class LogIQRDetector(OutlierDetector):
+    """Tukey fences on the signed-log scale, for right-skewed money columns."""
+
+    name = 'log_iqr'
+
+    def __init__(self, k=1.5):
+        self.k = k
+
+    def detect(self, df, columns=None):
+        columns = _numeric_columns(df, columns)
+        logged = signed_log(df[columns].astype(float))
+        return IQRFences(logged, columns, k=self.k).mask
+
+
+class ModifiedZScoreDetector(OutlierDetector):
+    """Iglewicz–Hoaglin modified z-score ``0.6745·(x - median) / MAD``.
+
+    Columns whose MAD is zero (more than half the values identical) use the
+    mean absolute deviation scaled by 1.2533 instead.
+    """
+
+    name = 'mad'
+
+    def __init__(self, threshold=3.5):
+        self.threshold = threshold
+
+    def detect(self, df, columns=None):
+        columns = _numeric_columns(df, columns)
+        values = df[columns].to_numpy(dtype=float, na_value=np.nan)
+
+        median = np.nanmedian(values, axis=0)
+        deviation = np.abs(values - median)
+        mad = np.nanmedian(deviation, axis=0)
+        meanad = np.nanmean(deviation, axis=0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = np.where(
+                mad > 0,
+                0.6745 * deviation / mad,
+                deviation / (1.253314 * meanad),
+            )
+            mask = score > self.threshold
+        return pd.DataFrame(mask, index=df.index, columns=columns)
+
+
+class PercentileDetector(OutlierDetector):
+    """Flags values outside the ``[lower, upper]`` quantile band."""
+
+    name = 'percentile'
+
+    def __init__(self, lower=0.01, upper=0.99):
+        self.lower = lower
+        self.upper = upper
+
+    def detect(self, df, columns=None):
+        columns = _numeric_columns(df, columns)
+        values = df[columns]
+        band = values.quantile([self.lower, self.upper])
+        arr = values.to_numpy(dtype=float, na_value=np.nan)
+        with np.errstate(invalid='ignore'):
+            mask = (arr < band.iloc[0].to_numpy()) | (arr > band.iloc[1].to_numpy())
+        return pd.DataFrame(mask, index=df.index, columns=columns)
+
+
+# -----------------------------------------------------------
+# 🌲 Isolation forest (multivariate)
+# -----------------------------------------------------------
+def _average_path_length(n):
+    """Expected path length of an unsuccessful BST search over ``n`` points."""
+    n = np.asarray(n, dtype=float)
+    out = np.zeros_like(n)
+    big = n > 2
+    out[big] = 2 * (np.log(n[big] - 1) + np.euler_gamma) - 2 * (n[big] - 1) / n[big]
+    out[n == 2] = 1.0
+    return out
+
+
+def _build_tree(sample, rng, max_depth):
+    feature, threshold, left, right, size = [], [], [], [], []
+
+    def new_node():
+        feature.append(-1)
+        threshold.append(np.nan)
+        left.append(-1)
+        right.append(-1)
+        size.append(0)
+        return len(feature) - 1
+
+    stack = [(new_node(), np.arange(len(sample)), 0)]
+    while stack:
+        node, idx, depth = stack.pop()
+        size[node] = len(idx)
+        if depth >= max_depth or len(idx) <= 1:
+            continue
+        sub = sample[idx]
+        lo, hi = sub.min(axis=0), sub.max(axis=0)
+        splittable = np.flatnonzero(hi > lo)
+        if not len(splittable):
+            continue
+        f = rng.choice(splittable)
+        t = rng.uniform(lo[f], hi[f])
+        go_left = sub[:, f] < t
+
+        feature[node], threshold[node] = f, t
+        left[node], right[node] = new_node(), new_node()
+        stack.append((left[node], idx[go_left], depth + 1))
+        stack.append((right[node], idx[~go_left], depth + 1))
+
+    return (np.array(feature), np.array(threshold), np.array(left),
+            np.array(right), np.array(size))
+
+
+def _path_lengths(X, tree, max_depth):
+    feature, threshold, left, right, size = tree
+    rows = np.arange(len(X))
+    node = np.zeros(len(X), dtype=np.intp)
+    depth = np.zeros(len(X), dtype=float)
+    for _ in range(max_depth + 1):
+        f = feature[node]
+        active = f >= 0
+        if not active.any():
+            break
+        go_left = X[rows, f] < threshold[node]
+        node = np.where(active, np.where(go_left, left[node], right[node]), node)
+        depth += active
+    return depth + _average_path_length(size[node])
+
+
+class IsolationForestDetector(OutlierDetector):
+    """Isolation forest (Liu, Ting & Zhou, 2008) over several columns at once.
+
+    Trees are grown on small random subsamples; every row is then routed
+    through all trees level by level as array operations. The rows with the
+    highest anomaly score (the ``contamination`` share) are flagged. Missing
+    values are filled with the column median; ``log_scale`` applies
+    ``signed_log`` first so splits are not spent on one extreme value.
+    """
+
+    name = 'isolation_forest'
+    multivariate = True
+
+    def __init__(self, n_trees=100, sample_size=256, contamination=0.01,
+                 log_scale=True, random_state=0):
+        self.n_trees = n_trees
+        self.sample_size = sample_size
+        self.contamination = contamination
+        self.log_scale = log_scale
+        self.random_state = random_state
+
+    def scores(self, df, columns=None):
+        columns = _numeric_columns(df, columns)
+        values = df[columns].astype(float)
+        if self.log_scale:
+            values = signed_log(values)
+        X = values.fillna(values.median()).fillna(0).to_numpy()
+
+        rng = np.random.default_rng(self.random_state)
+        psi = min(self.sample_size, len(X))
+        max_depth = int(np.ceil(np.log2(max(psi, 2))))
+
+        total = np.zeros(len(X))
+        for _ in range(self.n_trees):
+            sample = X[rng.choice(len(X), size=psi, replace=False)]
+            total += _path_lengths(X, _build_tree(sample, rng, max_depth), max_depth)
+
+        mean_path = total / self.n_trees
+        return pd.Series(2.0 ** (-mean_path / _average_path_length(psi)),
+                         index=df.index, name='anomaly_score')
+
+    def detect(self, df, columns=None):
+        score = self.scores(df, columns)
+        cutoff = score.quantile(1 - self.contamination)
+        return (score >= cutoff) & (score > 0.5)
+
+
+DETECTORS = {
+    cls.name: cls
+    for cls in (IQRDetector, LogIQRDetector, ModifiedZScoreDetector,
+                PercentileDetector, IsolationForestDetector)
+}
+
+
+def compare_detectors(df, columns=None, detectors=None):
+    """Flagged cells and rows per detector, for a side-by-side table."""
+    if detectors is None:
+        detectors = [cls() for cls in DETECTORS.values()]
+    rows = {}
+    for detector in detectors:
+        mask = detector.detect(df, columns)
+        rows[detector.name] = {
+            'flagged_cells': np.nan if detector.multivariate else int(mask.to_numpy().sum()),
+            'flagged_rows': int((mask if detector.multivariate else mask.any(axis=1)).sum()),
+        }
+    return pd.DataFrame.from_dict(rows, orient='index')
@@ -0,0 +1,105 @@
+"""Column provenance and the generated data dictionary.
+
+The dashboard renames columns in several passes (``rename_dict``,
+``column_rename_map_part2``, ``rename_map``, ...). Replaying those passes
+over the raw export headers gives, for every final name, the original Kobo
+question and the form section it sits in (the group before the first bare
+``/``; `` / `` inside a label is part of the text).
+Joined with a column profile (dtype, nulls, distinct values) this is the
+data dictionary, exported as CSV, Markdown or HTML.
+"""
+
+import html
+import re
+
+import pandas as pd
+
+DICTIONARY_COLUMNS = ['column', 'original_question', 'section', 'dtype', 'null_pct', 'distinct']
+
+
+def trace_renames(columns, *steps):
+    """Final column name → original header after replaying ``steps`` in order.
+
+    A dict step renames columns; any other collection drops the names it
+    holds (columns the pipeline deletes), so a later rename onto a dropped
+    name keeps the right origin. Two headers ending up with the same name
+    raise ``ValueError``.
+    """
+    current = {original: original for original in columns}
+    for step in steps:
+        if isinstance(step, dict):
+            renamed = {}
+            for name, original in current.items():
+                new = step.get(name, name)
+                if new in renamed:
+                    raise ValueError(
+                        f"Renames map both '{renamed[new]}' and '{original}' to '{new}'"
+                    )
+                renamed[new] = original
+            current = renamed
+        else:
+            dropped = set(step)
+            current = {name: original for name, original in current.items() if name not in dropped}
+    return current
+
+
+# Kobo joins group and question with a bare "/"; " / " inside a label is text
+_GROUP_SEPARATOR = re.compile(r'(?<! )/(?! )')
+
+
+def section_of(original):
+    """Form section of a Kobo header.
+
+    '' for system columns like ``_uuid`` and for questions outside any group.
+    """
+    original = str(original)
+    if original.startswith('_'):
+        return ''
+    parts = _GROUP_SEPARATOR.split(original, maxsplit=1)
+    return parts[0] if len(parts) > 1 else ''
+
+
+def build_dictionary(df, provenance=None, profile=None):
+    """One row per column of ``df``.
+
+    Columns derived during cleaning (no entry in ``provenance``) have an
+    empty original question.
+    ``profile`` (a ``ColumnProfile`` of ``df``) supplies null and distinct
+    counts without rescanning the frame; otherwise they are computed here.
+    """
+    provenance = provenance or {}
+    original = [provenance.get(c, '') for c in df.columns]
+    if profile is not None:
+        stats = profile.table.reindex(df.columns)
+        nulls, distinct = stats['nulls'].to_numpy(), stats['distinct'].to_numpy()
+    else:
+        nulls, distinct = df.isna().sum().to_numpy(), df.nunique().to_numpy()
+    return pd.DataFrame({
+        'column': df.columns,
+        'original_question': original,
+        'section': [section_of(o) for o in original],
+        'dtype': df.dtypes.astype(str).to_numpy(),
+        'null_pct': (pd.Series(nulls, dtype=float) / max(len(df), 1) * 100).round(1).to_numpy(),
+        'distinct': distinct,
+    }, columns=DICTIONARY_COLUMNS)
+
+
+def to_markdown(dictionary):
+    """GitHub-flavoured Markdown table (pipes in questions are escaped)."""
+    def cell(value):
+        return '' if pd.isna(value) else str(value).replace('|', '\\|').replace('\n', ' ')
+
+    lines = ['| ' + ' | '.join(dictionary.columns) + ' |',
+             '|' + '---|' * len(dictionary.columns)]
+    lines += ['| ' + ' | '.join(cell(v) for v in row) + ' |' for row in dictionary.itertuples(index=False)]
+    return '\n'.join(lines) + '\n'
+
+
+def to_html(dictionary, title="Data dictionary"):
+    """Standalone HTML page with the dictionary table."""
+    return (
+        f"<!DOCTYPE html>\n<html><head><meta charset='utf-8'><title>{html.escape(title)}</title></head>\n"
+        f"<body>\n<h1>{html.escape(title)}</h1>\n"
+        + dictionary.to_html(index=False, na_rep='', border=0)
+        + "\n</body></html>\n"
+    )
@@ -0,0 +1,177 @@
+"""Exports of the cleaned tables.
+
+CSV is produced in row chunks: each chunk is formatted, encoded and
+(optionally) gzip-compressed before the next one is touched, so peak memory
+is one chunk of text rather than the full ``to_csv`` string plus its encoded
+copy. Output goes to a generator, a path, an open binary file, or a spooled
+temporary file that moves to disk once it outgrows ``max_memory``.
+
+Parquet and Feather (Arrow IPC) keep the cleaned dtypes — nullable 0/1
+flags, dates, categories — and carry each column's provenance (original
+question, form section) as Arrow field metadata, so it survives into R
+(``arrow::read_parquet``) and Python (``pyarrow.parquet.read_schema``).
+
+Excel workbooks are written with xlsxwriter in ``constant_memory`` mode:
+rows are flushed to a temporary file as soon as the next row starts, so
+only one row per sheet is held by the writer and pandas converts one chunk
+of rows at a time.
+"""
+
+import json
+import tempfile
+import zlib
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from cleaning.dictionary import section_of
+
+CSV_CHUNK_ROWS = 20_000
+
+
+def iter_csv_chunks(df, chunk_rows=CSV_CHUNK_ROWS, compress=False, encoding='utf-8'):
+    """Yield the CSV of ``df`` as bytes, ``chunk_rows`` rows at a time.
+
+    With ``compress=True`` the pieces form one gzip stream.
+    """
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    for start in range(0, max(len(df), 1), chunk_rows):
+        text = df.iloc[start:start + chunk_rows].to_csv(index=False, header=start == 0)
+        data = text.encode(encoding)
+        if gz is not None:
+            data = gz.compress(data)
+        if data:
+            yield data
+    if gz is not None:
+        yield gz.flush()
+
+
+def write_csv(df, target, chunk_rows=CSV_CHUNK_ROWS, compress=None):
+    """Stream ``df`` as CSV to a path or binary file object.
+
+    For paths, ``compress`` defaults to whether the name ends in ``.gz``.
+    """
+    if isinstance(target, str):
+        if compress is None:
+            compress = target.endswith('.gz')
+        with open(target, 'wb') as fh:
+            return write_csv(df, fh, chunk_rows, compress)
+    written = 0
+    for data in iter_csv_chunks(df, chunk_rows, bool(compress)):
+        target.write(data)
+        written += len(data)
+    return written
+
+
+def spool_csv(df, chunk_rows=CSV_CHUNK_ROWS, compress=False, max_memory=32 * 1024 ** 2):
+    """CSV of ``df`` in a rewound ``SpooledTemporaryFile``."""
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    write_csv(df, spool, chunk_rows, compress)
+    spool.seek(0)
+    return spool
+
+
+# -----------------------------------------------------------
+# 🧱 Columnar formats
+# -----------------------------------------------------------
+def _arrow_safe(df):
+    """Object columns Arrow cannot type (mixed str/number) become strings."""
+    fixes = {}
+    for col in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            fixes[col] = df[col].astype('string')
+    return df.assign(**fixes) if fixes else df
+
+
+def to_arrow(df, provenance=None, metadata=None):
+    """Arrow table of ``df`` with per-column provenance metadata.
+
+    ``provenance`` maps column names to their original question; each field
+    gets ``original`` and ``section`` metadata. ``metadata`` (e.g. source
+    file name) is stored on the schema next to an export timestamp.
+    """
+    table = pa.Table.from_pandas(_arrow_safe(df), preserve_index=False)
+    provenance = provenance or {}
+    fields = []
+    for field in table.schema:
+        original = provenance.get(field.name)
+        if original is not None:
+            field = field.with_metadata({'original': str(original), 'section': section_of(original)})
+        fields.append(field)
+
+    schema_meta = dict(table.schema.metadata or {})
+    schema_meta[b'exported_at'] = datetime.now(timezone.utc).isoformat().encode()
+    for key, value in (metadata or {}).items():
+        schema_meta[str(key).encode()] = json.dumps(value).encode()
+    return table.cast(pa.schema(fields, metadata=schema_meta))
+
+
+def write_parquet(df, target, provenance=None, metadata=None, compression='zstd'):
+    """Write ``df`` to Parquet (path or binary file object)."""
+    pq.write_table(to_arrow(df, provenance, metadata), target, compression=compression)
+
+
+def write_feather(df, target, provenance=None, metadata=None, compression='lz4'):
+    """Write ``df`` to Feather v2 / Arrow IPC (path or binary file object)."""
+    feather.write_feather(to_arrow(df, provenance, metadata), target, compression=compression)
+
+
+def read_provenance(path):
+    """Original question and section per column of a Parquet or Feather export."""
+    schema = pq.read_schema(path) if str(path).endswith('.parquet') else pa.ipc.open_file(path).schema
+    return pd.DataFrame(
+        [{'column': f.name, **{k.decode(): v.decode() for k, v in (f.metadata or {}).items()}} for f in schema]
+    ).set_index('column')
+
+
+# -----------------------------------------------------------
+# 📗 Excel
+# -----------------------------------------------------------
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_COLS = 16_384
+
+
+def _excel_rows(df, chunk_rows):
+    """Rows of ``df`` as lists of Python values, missing values as None."""
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        values = chunk.astype(object).to_numpy()
+        values[chunk.isna().to_numpy()] = None
+        yield from values.tolist()
+
+
+def write_excel(sheets, target, chunk_rows=1_000):
+    """Write ``{sheet name: DataFrame}`` to one workbook in constant memory.
+
+    Timestamps lose their timezone (Excel has none); the header row is bold
+    and frozen. Sheets must fit Excel's 1,048,576 × 16,384 grid.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(target, {
+        'constant_memory': True,
+        'remove_timezone': True,
+        'strings_to_numbers': False,
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+        'nan_inf_to_errors': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    })
+    try:
+        header = workbook.add_format({'bold': True})
+        for name, df in sheets.items():
+            if len(df) + 1 > EXCEL_MAX_ROWS or df.shape[1] > EXCEL_MAX_COLS:
+                raise ValueError(f"Sheet '{name}' ({df.shape[0]} × {df.shape[1]}) does not fit in Excel")
+            ws = workbook.add_worksheet(str(name)[:31])
+            ws.freeze_panes(1, 0)
+            ws.write_row(0, 0, [str(c) for c in df.columns], header)
+            for i, row in enumerate(_excel_rows(df, chunk_rows), start=1):
+                ws.write_row(i, 0, row)
+    finally:
+        workbook.close()
+
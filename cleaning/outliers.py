@@ -0,0 +1,178 @@
+"""Vectorized outlier detection.
+
+All fences come from a single ``DataFrame.quantile`` call over every numeric
+column; counts and masks are array comparisons against the fence vectors, and
+the same fences are reused for capping (winsorization).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class IQRFences:
+    """Tukey fences (``Q1 - k·IQR``, ``Q3 + k·IQR``) for a set of columns.
+
+    ``bounds`` has one row per column with ``q1``, ``q3``, ``iqr``, ``lower``,
+    ``upper`` and ``outliers`` (count); ``mask`` is a boolean frame marking
+    the outlying cells.
+    """
+
+    def __init__(self, df, columns=None, k=1.5):
+        if columns is None:
+            columns = df.select_dtypes(include='number').columns
+        self.columns = pd.Index(columns)
+        self.k = k
+
+        values = df[self.columns]
+        quartiles = values.quantile([0.25, 0.5, 0.75])
+        q1, q3 = quartiles.iloc[0], quartiles.iloc[2]
+        iqr = q3 - q1
+
+        self.bounds = pd.DataFrame({
+            'q1': q1,
+            'median': quartiles.iloc[1],
+            'q3': q3,
+            'iqr': iqr,
+            'lower': q1 - k * iqr,
+            'upper': q3 + k * iqr,
+        })
+
+        arr = values.to_numpy(dtype=float, na_value=np.nan)
+        with np.errstate(invalid='ignore'):
+            mask = (arr < self.bounds['lower'].to_numpy()) | (arr > self.bounds['upper'].to_numpy())
+        self.mask = pd.DataFrame(mask, index=df.index, columns=self.columns)
+        self.bounds['outliers'] = mask.sum(axis=0)
+
+        # Whiskers: the most extreme values still inside the fences
+        inside = ~mask & ~np.isnan(arr)
+        whislo = np.where(inside, arr, np.inf).min(axis=0, initial=np.inf)
+        whishi = np.where(inside, arr, -np.inf).max(axis=0, initial=-np.inf)
+        self.bounds['whislo'] = np.where(np.isfinite(whislo), whislo, np.nan)
+        self.bounds['whishi'] = np.where(np.isfinite(whishi), whishi, np.nan)
+
+    @property
+    def counts(self):
+        return self.bounds['outliers']
+
+    def top(self, n=10):
+        """The ``n`` columns with the most outliers (ties keep column order)."""
+        return self.counts.sort_values(ascending=False, kind='stable').index[:n].tolist()
+
+    def clip(self, df):
+        """Copy of ``df[columns]`` capped at the fences."""
+        return df[self.columns].clip(lower=self.bounds['lower'], upper=self.bounds['upper'], axis=1)
+
+    def box_stats(self, df, columns=None, max_fliers=50):
+        """Boxplot statistics in ``Axes.bxp`` format, one dict per column.
+
+        Quartiles and whiskers come from the fences already computed; only
+        the ``max_fliers`` most extreme outliers per column are kept (half
+        from each tail), so the payload does not grow with the row count.
+        """
+        columns = self.columns if columns is None else columns
+        stats = []
+        for col in columns:
+            row = self.bounds.loc[col]
+            fliers = df[col].to_numpy(dtype=float, na_value=np.nan)[self.mask[col].to_numpy()]
+            if len(fliers) > max_fliers:
+                fliers = np.sort(fliers)
+                fliers = np.concatenate([fliers[:max_fliers // 2], fliers[-(max_fliers - max_fliers // 2):]])
+            stats.append({
+                'label': col,
+                'q1': row['q1'],
+                'med': row['median'],
+                'q3': row['q3'],
+                'whislo': row['whislo'] if pd.notna(row['whislo']) else row['q1'],
+                'whishi': row['whishi'] if pd.notna(row['whishi']) else row['q3'],
+                'fliers': fliers,
+                'n_outliers': int(row['outliers']),
+            })
+        return stats
+
+
+class GroupedIQRFences:
+    """Tukey fences computed separately inside each group (e.g. per crop type).
+
+    One grouped ``quantile`` call produces the quartiles of every
+    (group, column) pair; rows are then compared with their own group's
+    fences by indexing the fence matrix with the group codes, so no Python
+    loop runs over groups. Groups with fewer than ``min_group_size`` values
+    in a column, and rows with a missing group key, fall back to the global
+    fences.
+    """
+
+    def __init__(self, df, by, columns=None, k=1.5, min_group_size=5):
+        if columns is None:
+            columns = df.select_dtypes(include='number').columns
+        self.columns = pd.Index(columns)
+        self.by = by
+        self.k = k
+        self.global_fences = IQRFences(df, self.columns, k=k)
+
+        keys = [by] if isinstance(by, str) else list(by)
+        grouped = df[self.columns].groupby([df[c] for c in keys], sort=True, dropna=True, observed=True)
+        codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.intp)
+        group_index = grouped.size().index
+
+        quartiles = grouped.quantile([0.25, 0.75])
+        q1 = quartiles.xs(0.25, level=-1).reindex(group_index).to_numpy(dtype=float)
+        q3 = quartiles.xs(0.75, level=-1).reindex(group_index).to_numpy(dtype=float)
+        sizes = grouped.count().reindex(group_index).to_numpy()
+
+        # Too-small groups inherit the global fences
+        small = sizes < min_group_size
+        global_q1 = self.global_fences.bounds['q1'].to_numpy()
+        global_q3 = self.global_fences.bounds['q3'].to_numpy()
+        q1 = np.where(small, global_q1, q1)
+        q3 = np.where(small, global_q3, q3)
+        iqr = q3 - q1
+        lower, upper = q1 - k * iqr, q3 + k * iqr
+
+        # Row-level fences: group rows index the fence matrix, ungrouped rows use global
+        grouped_rows = codes >= 0
+        row_lower = np.broadcast_to(self.global_fences.bounds['lower'].to_numpy(), (len(df), len(self.columns))).copy()
+        row_upper = np.broadcast_to(self.global_fences.bounds['upper'].to_numpy(), (len(df), len(self.columns))).copy()
+        row_lower[grouped_rows] = lower[codes[grouped_rows]]
+        row_upper[grouped_rows] = upper[codes[grouped_rows]]
+
+        arr = df[self.columns].to_numpy(dtype=float, na_value=np.nan)
+        with np.errstate(invalid='ignore'):
+            mask = (arr < row_lower) | (arr > row_upper)
+        self.mask = pd.DataFrame(mask, index=df.index, columns=self.columns)
+
+        group_outliers = (
+            pd.DataFrame(mask[grouped_rows])
+            .groupby(codes[grouped_rows]).sum()
+            .reindex(range(len(group_index)), fill_value=0)
+            .to_numpy()
+        )
+
+        # Long table: one row per (group, column)
+        shape = (len(group_index), len(self.columns))
+        self.bounds = pd.DataFrame({
+            'n': sizes.ravel(),
+            'q1': q1.ravel(),
+            'q3': q3.ravel(),
+            'lower': lower.ravel(),
+            'upper': upper.ravel(),
+            'global_fallback': np.broadcast_to(small, shape).ravel(),
+            'outliers': group_outliers.ravel(),
+        }, index=pd.MultiIndex.from_arrays(
+            [group_index.to_flat_index().repeat(shape[1]), np.tile(self.columns, shape[0])],
+            names=['group', 'column'],
+        ))
+
+    @property
+    def counts(self):
+        return pd.Series(self.mask.to_numpy().sum(axis=0), index=self.columns, name='outliers')
+
+    def compare(self):
+        """Global vs within-group outlier counts per column."""
+        return pd.DataFrame({
+            'global_outliers': self.global_fences.counts,
+            'grouped_outliers': self.counts,
+        })
+
+    def for_column(self, col):
+        """Per-group fences and counts for one column."""
+        return self.bounds.xs(col, level='column')
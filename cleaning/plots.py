@@ -0,0 +1,70 @@
+"""Figure rendering with an explicit lifecycle.
+
+Figures are created as bare ``matplotlib.figure.Figure`` objects (never
+registered with pyplot, so nothing accumulates across Streamlit reruns),
+rendered to PNG bytes and cleared immediately.
+
+Boxplots are drawn from precomputed statistics (``IQRFences.box_stats``)
+with ``Axes.bxp`` rather than from raw values, so the plotting cost and
+the cached payload do not depend on the number of rows. The dashboard
+caches the PNG bytes keyed by a hash of those statistics.
+"""
+
+from contextlib import contextmanager
+from io import BytesIO
+
+from matplotlib.figure import Figure
+
+BXP_KEYS = ('label', 'q1', 'med', 'q3', 'whislo', 'whishi', 'fliers')
+
+
+@contextmanager
+def figure(**kwargs):
+    """A standalone Figure that is cleared when the block exits."""
+    fig = Figure(**kwargs)
+    try:
+        yield fig
+    finally:
+        fig.clear()
+
+
+def to_png(fig, dpi=100):
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight')
+    return buf.getvalue()
+
+
+def _bxp(ax, stats, orientation):
+    stats = [{k: s[k] for k in BXP_KEYS} for s in stats]
+    style = dict(patch_artist=True, boxprops={'facecolor': '#9ecae1'},
+                 flierprops={'marker': 'o', 'markersize': 4})
+    try:
+        ax.bxp(stats, orientation=orientation, **style)
+    except TypeError:  # matplotlib < 3.10
+        ax.bxp(stats, vert=orientation == 'vertical', **style)
+
+
+def boxplot_png(stats, title, xlabel="Value", ylabel="Variables", figsize=(12, 8)):
+    """Horizontal boxplots, one per entry of ``stats``, as PNG bytes."""
+    with figure(figsize=figsize) as fig:
+        ax = fig.subplots()
+        _bxp(ax, stats, 'horizontal')
+        ax.invert_yaxis()
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        return to_png(fig)
+
+
+def boxplot_grid_png(stats, nrows=2, ncols=5, figsize=(18, 8)):
+    """One vertical boxplot per entry of ``stats`` in an ``nrows × ncols``
+    grid, titled with its outlier count."""
+    with figure(figsize=figsize) as fig:
+        axes = fig.subplots(nrows, ncols).flatten()
+        for ax, s in zip(axes, stats):
+            _bxp(ax, [{**s, 'label': ''}], 'vertical')
+            ax.set_title(f"{s['label']}\nOutliers: {s['n_outliers']}")
+        for ax in axes[len(stats):]:
+            ax.set_visible(False)
+        fig.tight_layout()
+        return to_png(fig)
@@ -0,0 +1,66 @@
+"""Cheap previews of wide frames.
+
+Previews slice rows first and project columns second, so only the rows
+shown are copied and serialized. Top-k views select with ``nlargest`` /
+``nsmallest`` on the key column alone instead of sorting the whole frame,
+and paging walks a positional index sorted once on a single column.
+"""
+
+import numpy as np
+
+
+def head_preview(df, n=5, max_cols=30, columns=None):
+    """First ``n`` rows, limited to ``columns`` (or the first ``max_cols``)."""
+    if columns is None:
+        columns = df.columns[:max_cols]
+    return df.iloc[:n][list(columns)]
+
+
+def top_rows(df, by, n=10, largest=True, columns=None):
+    """The ``n`` rows with the largest (or smallest) ``by`` values.
+
+    Only the ``by`` column is scanned; the result is projected to
+    ``columns`` (default: all) after the rows are picked.
+    """
+    key = df[by].reset_index(drop=True)
+    picked = key.nlargest(n) if largest else key.nsmallest(n)
+    if columns is None:
+        columns = df.columns
+    return df.iloc[picked.index.to_numpy()][list(columns)]
+
+
+class PagedView:
+    """Paginate ``df`` without copying it.
+
+    With ``order_by`` the row order is an argsort of that single column
+    (computed once, NaN last); otherwise the frame's own order is used.
+    Object columns mixing types (numbers and text) are ordered by their
+    string form.
+    """
+
+    def __init__(self, df, page_size=50, order_by=None, ascending=True, columns=None):
+        self.df = df
+        self.page_size = page_size
+        self.columns = list(df.columns if columns is None else columns)
+        if order_by is None:
+            self.order = None
+        else:
+            key = df[order_by].reset_index(drop=True)
+            try:
+                ordered = key.sort_values(ascending=ascending, na_position='last', kind='stable')
+            except TypeError:
+                ordered = key.map(str, na_action='ignore').sort_values(
+                    ascending=ascending, na_position='last', kind='stable')
+            self.order = ordered.index.to_numpy()
+
+    @property
+    def n_pages(self):
+        return max(int(np.ceil(len(self.df) / self.page_size)), 1)
+
+    def page(self, number):
+        """Rows of page ``number`` (1-based), projected to ``columns``."""
+        number = min(max(int(number), 1), self.n_pages)
+        start = (number - 1) * self.page_size
+        stop = start + self.page_size
+        positions = np.arange(start, min(stop, len(self.df))) if self.order is None else self.order[start:stop]
+        return self.df.iloc[positions][self.columns]
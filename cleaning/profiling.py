@@ -0,0 +1,220 @@
+"""Single-pass column profiling used by every diagnostic section.
+
+Each column is reduced once to its value counts; the dtype, null count,
+distinct count, min/max, mean/std, top-k values and quantiles are all derived
+from that (much smaller) table instead of calling ``nunique``, ``unique`` and
+``describe`` over the raw column again and again. Frames longer than
+``approx_rows`` switch to HyperLogLog distinct counts and a sampled top-k.
+"""
+
+import numpy as np
+import pandas as pd
+
+PROFILE_QUANTILES = (0.25, 0.5, 0.75)
+
+
+# -----------------------------------------------------------
+# 🔢 HyperLogLog distinct counter
+# -----------------------------------------------------------
+def _bit_length32(x):
+    # ``x`` holds integers below 2**32 as float64, so log2 is exact enough
+    with np.errstate(divide='ignore'):
+        return np.where(x > 0, np.floor(np.log2(x)) + 1, 0)
+
+
+def _bit_length(x):
+    hi = (x >> np.uint64(32)).astype(np.float64)
+    lo = (x & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(hi > 0, 32 + _bit_length32(hi), _bit_length32(lo)).astype(np.int64)
+
+
+class HyperLogLog:
+    """Mergeable approximate distinct counter.
+
+    With ``2**p`` registers the relative standard error is ``1.04 / sqrt(2**p)``
+    (about 0.8% for the default ``p=14``).
+    """
+
+    def __init__(self, p=14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, values):
+        values = pd.Series(values).dropna()
+        if values.empty:
+            return self
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        bits = 64 - self.p
+        idx = (hashes >> np.uint64(bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << bits) - 1)
+        rank = (bits - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+        return self
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+# -----------------------------------------------------------
+# 📘 Column profile
+# -----------------------------------------------------------
+def _is_measure(series):
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _weighted_quantiles(values, weights, quantiles):
+    """Linear-interpolated quantiles (pandas' default) of a value-count table."""
+    cum = np.cumsum(weights)
+    pos = (cum[-1] - 1) * np.asarray(quantiles, dtype=float)
+    lo = np.floor(pos)
+    lo_val = values[np.searchsorted(cum, lo, side='right')]
+    hi_val = values[np.searchsorted(cum, np.ceil(pos), side='right')]
+    return lo_val + (hi_val - lo_val) * (pos - lo)
+
+
+class ColumnProfile:
+    """Per-column statistics for a DataFrame, computed once on construction.
+
+    ``table`` holds one row per column; ``top`` maps each column to its
+    ``top_k`` most frequent values with their counts.
+    """
+
+    def __init__(self, df, top_k=5, quantiles=PROFILE_QUANTILES,
+                 approx_rows=1_000_000, sample_rows=100_000, random_state=0):
+        self.n_rows = len(df)
+        self.quantiles = tuple(quantiles)
+        self.approximate = self.n_rows > approx_rows
+        self.top = {}
+
+        self._q_labels = [f"{q:.0%}" for q in self.quantiles]
+        rows = {}
+        sample_idx = None
+        if self.approximate:
+            rng = np.random.default_rng(random_state)
+            sample_idx = np.sort(rng.choice(self.n_rows, size=sample_rows, replace=False))
+
+        for col in df.columns:
+            series = df[col]
+            if isinstance(series, pd.DataFrame):  # duplicated column label
+                series = series.iloc[:, 0]
+            if self.approximate:
+                rows[col] = self._profile_large(col, series, top_k, sample_idx)
+            else:
+                rows[col] = self._profile_exact(col, series, top_k)
+
+        columns = ['dtype', 'non_null', 'nulls', 'distinct', 'min', 'max',
+                   'mean', 'std', *self._q_labels]
+        self.table = pd.DataFrame.from_dict(rows, orient='index', columns=columns)
+        self.table.index.name = 'column'
+
+    def _profile_exact(self, col, series, top_k):
+        counts = series.value_counts(dropna=True)
+        non_null = int(counts.sum())
+        self.top[col] = counts.head(top_k)
+        row = {
+            'dtype': str(series.dtype),
+            'non_null': non_null,
+            'nulls': self.n_rows - non_null,
+            'distinct': len(counts),
+        }
+        if _is_measure(series) and non_null:
+            values = counts.index.to_numpy(dtype=float)
+            weights = counts.to_numpy(dtype=float)
+            order = np.argsort(values, kind='stable')
+            values, weights = values[order], weights[order]
+            mean = (values * weights).sum() / non_null
+            var = (weights * (values - mean) ** 2).sum() / (non_null - 1) if non_null > 1 else np.nan
+            row.update(min=values[0], max=values[-1], mean=mean, std=np.sqrt(var))
+            row.update(zip(self._q_labels, _weighted_quantiles(values, weights, self.quantiles)))
+        return row
+
+    def _profile_large(self, col, series, top_k, sample_idx):
+        present = series.dropna()
+        self.top[col] = series.iloc[sample_idx].value_counts(dropna=True).head(top_k)
+        row = {
+            'dtype': str(series.dtype),
+            'non_null': len(present),
+            'nulls': self.n_rows - len(present),
+            'distinct': HyperLogLog().update(present).count(),
+        }
+        if _is_measure(series) and len(present):
+            values = present.to_numpy(dtype=float)
+            row.update(min=values.min(), max=values.max(), mean=values.mean(),
+                       std=values.std(ddof=1) if len(values) > 1 else np.nan)
+            row.update(zip(self._q_labels, np.quantile(values, self.quantiles)))
+        return row
+
+    # -------------------------------------------------------
+    # Views used by the dashboard sections
+    # -------------------------------------------------------
+    def distinct(self, col):
+        return int(self.table.at[col, 'distinct'])
+
+    def empty_columns(self):
+        """Columns without a single value."""
+        return self.table.index[self.table['non_null'] == 0].tolist()
+
+    def missing(self):
+        """Missing values per column, as ``df.isna().sum()``."""
+        return self.table['nulls']
+
+    def coverage(self):
+        """Percentage of non-missing values per column, as ``df.notna().mean() * 100``."""
+        return self.table['non_null'] / self.n_rows * 100
+
+    def few_unique(self, df, max_distinct=2):
+        """Columns of ``df`` with at most ``max_distinct`` values and those values (NaN included).
+
+        The profile only narrows down the candidates (HyperLogLog counts can
+        be off by one); each candidate is confirmed with an exact
+        ``nunique`` and its values are read from ``df``, not from the
+        truncated top-k.
+        """
+        limit = max_distinct + 1 if self.approximate else max_distinct
+        out = {}
+        for col in self.table.index[self.table['distinct'] <= limit]:
+            series = df[col]
+            if series.nunique(dropna=True) > max_distinct:
+                continue
+            values = series.dropna().unique().tolist()
+            if self.table.at[col, 'nulls']:
+                values.append(np.nan)
+            out[col] = values
+        return out
+
+    def summary(self):
+        """The dashboard's ``Data Summary Table`` layout."""
+        return pd.DataFrame({
+            'Column': self.table.index,
+            'Data Type': self.table['dtype'],
+            'Non-Null Count': self.table['non_null'],
+            'Null Count': self.table['nulls'],
+            'Unique Values': self.table['distinct'],
+        })
+
+    def describe(self, columns=None):
+        """Equivalent of ``df[columns].describe()`` for numeric columns."""
+        table = self.table if columns is None else self.table.loc[list(columns)]
+        table = table[table['mean'].notna() | (table['non_null'] == 0)]
+        out = table[['non_null', 'mean', 'std', 'min', *self._q_labels, 'max']]
+        return out.rename(columns={'non_null': 'count'}).astype(float).T
+
+    def values(self, columns):
+        """Distinct count, range and most frequent values for a few columns."""
+        table = self.table.loc[list(columns), ['dtype', 'nulls', 'distinct', 'min', 'max']].copy()
+        table['top_values'] = [
+            ", ".join(str(v) for v in self.top[col].index) for col in table.index
+        ]
+        return table
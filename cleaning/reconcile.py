@@ -0,0 +1,79 @@
+"""Reconcile declared counts on the main sheet with repeat-group rows.
+
+The main sheet declares how many crops a household grows
+(``crop_wetland_grown_sum``) and which ones (``crop_wetland_grown_list``, a
+space-separated list of Kobo choice codes); the crop sheet should hold one
+row per listed crop. Actual rows per household come from one ``bincount`` of
+the ``ParentLink`` codes, and the lists are compared as (household, crop)
+pairs in one merge, so the check costs a single pass over each sheet.
+"""
+
+import numpy as np
+import pandas as pd
+
+from cleaning.repeats import slug
+
+# Crop labels on the crop sheet whose slug differs from the choice code
+# used in the main sheet's list
+CROP_CODE_ALIASES = {
+    'rice_paddy': 'rice',
+    'irish_potatoes': 'potatoes_irish',
+    'sweet_potatoes': 'potatoes_sweet',
+}
+
+
+def _pairs(codes, values):
+    return pd.DataFrame({'household': codes, 'item': values}).dropna().drop_duplicates()
+
+
+class CountReconciliation:
+    """Declared vs actual repeat rows per household.
+
+    ``table`` has one row per household that declared a count or has child
+    rows, with ``status`` one of ``match``, ``missing rows``, ``extra rows``
+    or ``not declared``. With ``declared_list`` and ``by`` the listed and
+    entered items are compared too (``listed_not_entered`` /
+    ``entered_not_listed``).
+    """
+
+    def __init__(self, parent, link, declared_count, child=None, declared_list=None,
+                 by=None, aliases=None):
+        aliases = aliases or {}
+        declared = pd.to_numeric(parent[declared_count], errors='coerce').to_numpy(dtype=float)
+        actual = link.counts().to_numpy()
+
+        table = pd.DataFrame({'declared': declared, 'actual': actual}, index=parent.index)
+        table['difference'] = table['actual'] - table['declared']
+        table['status'] = np.select(
+            [table['declared'].isna(), table['difference'] < 0, table['difference'] > 0],
+            ['not declared', 'missing rows', 'extra rows'],
+            default='match',
+        )
+        keep = table['declared'].gt(0) | (table['actual'] > 0)
+
+        if declared_list is not None and child is not None and by is not None:
+            listed = parent[declared_list].astype('string').str.split().reset_index(drop=True).explode().dropna()
+            listed = _pairs(listed.index.to_numpy(), listed.to_numpy())
+
+            # Slug each distinct label once, then expand by category code
+            category = pd.Categorical(child[by].astype('string').str.strip().str.casefold())
+            names = np.array([aliases.get(slug(c), slug(c)) for c in category.categories] + [None], dtype=object)
+            labels = names[category.codes]
+            entered = _pairs(link.codes[link.linked], labels[link.linked])
+
+            both = listed.merge(entered, on=['household', 'item'], how='outer', indicator=True)
+            for side, name in (('left_only', 'listed_not_entered'), ('right_only', 'entered_not_listed')):
+                only = both[both['_merge'] == side]
+                joined = only.groupby('household')['item'].agg(' '.join)
+                table[name] = pd.Series(joined.to_numpy(), index=parent.index[joined.index.to_numpy()])
+            lists_differ = table['listed_not_entered'].notna() | table['entered_not_listed'].notna()
+            table.loc[lists_differ & (table['status'] == 'match'), 'status'] = 'different crops'
+
+        self.table = table[keep]
+
+    @property
+    def mismatches(self):
+        return self.table[self.table['status'] != 'match']
+
+    def summary(self):
+        return self.table['status'].value_counts().rename('households')
@@ -0,0 +1,159 @@
+"""Linking Kobo repeat-group sheets to their parent submissions.
+
+Repeat rows carry their parent's ``_index`` (as ``_parent_index``) and
+``_uuid`` (as ``_submission__uuid``). Each child row is resolved once to the
+integer *position* of its parent row with a hash lookup on the integer key,
+falling back to the uuid only where the index is missing. Household
+summaries are indexed by that position, so attaching them to the main table
+is a positional reindex instead of a merge on string keys.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _positions(keys, lookup):
+    """Position of each ``lookup`` value in ``keys`` (-1 when absent).
+
+    Keys that are missing or occur more than once cannot identify a single
+    parent and are left out of the lookup table.
+    """
+    keys = pd.Series(keys).reset_index(drop=True)
+    usable = keys.notna() & ~keys.duplicated(keep=False)
+    found = pd.Index(keys[usable]).get_indexer(pd.Series(lookup).to_numpy())
+    return np.where(found >= 0, np.flatnonzero(usable)[found], -1)
+
+
+class ParentLink:
+    """Parent row position for every row of a repeat-group sheet.
+
+    ``codes[i]`` is the position in ``parent`` of child row ``i``'s household,
+    or -1 for orphans. The parent key must be unique; rows whose index and
+    uuid point at different parents are counted as conflicts and resolved
+    by the index.
+    """
+
+    def __init__(self, parent, child, parent_key='_index', child_key='_parent_index',
+                 parent_uuid='_uuid', child_uuid='_submission__uuid'):
+        if not parent[parent_key].is_unique:
+            raise ValueError(f"Parent key '{parent_key}' is not unique")
+        self.parent_index = parent.index
+        self.child_index = child.index
+        self.n_parents = len(parent)
+
+        by_key = _positions(parent[parent_key], pd.to_numeric(child[child_key], errors='coerce'))
+        if parent_uuid in parent.columns and child_uuid in child.columns:
+            by_uuid = _positions(parent[parent_uuid], child[child_uuid])
+        else:
+            by_uuid = np.full(len(child), -1, dtype=np.intp)
+
+        self.codes = np.where(by_key >= 0, by_key, by_uuid).astype(np.intp)
+        self.n_via_uuid = int(((by_key < 0) & (by_uuid >= 0)).sum())
+        self.n_conflicts = int(((by_key >= 0) & (by_uuid >= 0) & (by_key != by_uuid)).sum())
+
+    @property
+    def linked(self):
+        return self.codes >= 0
+
+    @property
+    def orphans(self):
+        """Index labels of child rows with no parent."""
+        return self.child_index[~self.linked]
+
+    def counts(self):
+        """Number of child rows per parent row (0 for parents without any)."""
+        counts = np.bincount(self.codes[self.linked], minlength=self.n_parents)
+        return pd.Series(counts, index=self.parent_index)
+
+    def summary(self):
+        counts = self.counts()
+        return pd.Series({
+            'child_rows': len(self.codes),
+            'linked': int(self.linked.sum()),
+            'linked_via_uuid': self.n_via_uuid,
+            'orphans': int((~self.linked).sum()),
+            'key_uuid_conflicts': self.n_conflicts,
+            'parents_with_children': int((counts > 0).sum()),
+            'max_children_per_parent': int(counts.max()) if len(counts) else 0,
+        })
+
+    def attach(self, parent, summary):
+        """Join a per-household ``summary`` (indexed by parent position) onto ``parent``.
+
+        Parents without children get NaN. Raises if ``summary`` has positions
+        outside the parent table or columns that already exist in it.
+        """
+        if len(parent) != self.n_parents:
+            raise ValueError("Parent table differs from the one the link was built on")
+        if not summary.index.is_unique:
+            raise ValueError("Summary must have one row per parent")
+        if len(summary) and (summary.index.min() < 0 or summary.index.max() >= self.n_parents):
+            raise ValueError("Summary index contains positions outside the parent table")
+        overlap = parent.columns.intersection(summary.columns)
+        if len(overlap):
+            raise ValueError(f"Columns already in the parent table: {list(overlap)}")
+        aligned = summary.reindex(np.arange(self.n_parents))
+        aligned.index = parent.index
+        return pd.concat([parent, aligned], axis=1)
+
+
+def slug(value):
+    """Lower-case, underscore-separated form of a category for column names."""
+    return '_'.join(''.join(ch if ch.isalnum() else ' ' for ch in str(value).casefold()).split())
+
+
+class RepeatPivot:
+    """Reshape a repeat group into one block of columns per category.
+
+    Every linked child row with a category (e.g. ``crop_type``) is keyed by
+    its parent position and the category's code, and all ``values`` columns
+    are reshaped in a single ``unstack`` on the categorical level. Columns of
+    ``wide`` are named ``<category>_<column>`` (``maize_crop_yield_kg_ha_year``)
+    and its index is the parent position, ready for ``ParentLink.attach``.
+
+    A household can list the same category twice; only its first row is
+    pivoted and the others are listed in ``duplicates``. ``sources`` maps
+    each wide column back to its ``(category, column)``.
+
+    Labels that differ but slug alike ("Sweet potato", "sweet-potato") get
+    numbered prefixes (``sweet_potato``, ``sweet_potato_2``); the groups are
+    listed in ``slug_collisions``.
+    """
+
+    def __init__(self, child, codes, by='crop_type', values=None):
+        if values is None:
+            values = [c for c in child.columns if c != by]
+        self.by = by
+        self.values = list(values)
+
+        labels = child[by].astype('string').str.strip().str.casefold()
+        category = pd.Categorical(labels)
+        self.categories = category.categories
+
+        keep = (np.asarray(codes) >= 0) & (category.codes >= 0)
+        self.unlabelled = child.index[(np.asarray(codes) >= 0) & (category.codes < 0)]
+
+        self.long = child.loc[keep, self.values].assign(
+            household=np.asarray(codes)[keep],
+            **{by: category[keep]},
+        ).set_index(['household', by])
+
+        duplicated = self.long.index.duplicated(keep='first')
+        self.duplicates = child.index[keep][duplicated]
+
+        self.prefixes, groups = {}, {}
+        for cat in self.categories:
+            base = slug(cat)
+            groups.setdefault(base, []).append(cat)
+            n = len(groups[base])
+            self.prefixes[cat] = base if n == 1 else f'{base}_{n}'
+        self.slug_collisions = [labels for labels in groups.values() if len(labels) > 1]
+
+        wide = self.long[~duplicated].unstack(level=by).sort_index(axis=1, level=by, sort_remaining=False)
+        self.sources = {f'{self.prefixes[cat]}_{col}': (cat, col) for col, cat in wide.columns}
+        if len(self.sources) != wide.shape[1]:
+            names = pd.Series([f'{self.prefixes[cat]}_{col}' for col, cat in wide.columns])
+            raise ValueError(f"Pivoted column names collide: {sorted(set(names[names.duplicated()]))}")
+        wide.columns = list(self.sources)
+        self.wide = wide.dropna(axis=1, how='all')
+        self.wide.index.name = None
@@ -0,0 +1,85 @@
+"""Registry of the repeat-group sheets in a Kobo export workbook.
+
+Kobo writes the main questionnaire to the first sheet and every repeat
+group (crops, livestock, fish, ...) to a sheet of its own whose rows carry
+``_parent_index``/``_submission__uuid``. The registry finds those sheets
+from their header rows only; a sheet's data is read the first time a
+section asks for it and kept for later sections.
+"""
+
+from io import BytesIO
+
+import pandas as pd
+
+from cleaning.repeats import ParentLink
+
+PARENT_KEYS = ('_parent_index', '_submission__uuid')
+TIMESTAMP_COLUMN = '_submission__submission_time'
+TIMEZONE = 'Africa/Kigali'
+
+
+class RepeatSheets:
+    """Lazy access to the repeat-group sheets of one workbook.
+
+    ``source`` is a path or the workbook's bytes. ``renames`` maps sheet
+    names to column rename dicts used by ``clean``.
+    """
+
+    def __init__(self, source, renames=None):
+        if isinstance(source, (bytes, bytearray)):
+            source = BytesIO(source)
+        self.book = pd.ExcelFile(source)
+        self.renames = dict(renames or {})
+        self.main_sheet = self.book.sheet_names[0]
+        self.headers = {
+            name: self.book.parse(name, nrows=0).columns
+            for name in self.book.sheet_names[1:]
+        }
+        self.names = [
+            name for name, header in self.headers.items()
+            if any(key in header for key in PARENT_KEYS)
+        ]
+        self._raw = {}
+        self._clean = {}
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def overview(self):
+        """Sheet names and column counts, without reading any rows."""
+        return pd.DataFrame({
+            'columns': [len(self.headers[name]) for name in self.names],
+            'loaded': [name in self._raw for name in self.names],
+        }, index=pd.Index(self.names, name='sheet'))
+
+    def load(self, name):
+        """Raw sheet, read on first use."""
+        if name not in self.names:
+            raise KeyError(f"No repeat-group sheet named '{name}'")
+        if name not in self._raw:
+            self._raw[name] = self.book.parse(name)
+        return self._raw[name]
+
+    def clean(self, name):
+        """Sheet after the steps shared by every repeat group.
+
+        Columns are renamed with ``renames[name]`` (if given), columns
+        without any data are dropped, and the submission timestamp is
+        converted to Rwanda time and split into ``submission_date`` and
+        ``submission_time``.
+        """
+        if name not in self._clean:
+            frame = self.load(name).rename(columns=self.renames.get(name, {}))
+            frame = frame.dropna(axis=1, how='all')
+            if TIMESTAMP_COLUMN in frame.columns:
+                stamp = pd.to_datetime(frame[TIMESTAMP_COLUMN], errors='coerce', utc=True).dt.tz_convert(TIMEZONE)
+                frame = frame.drop(columns=[TIMESTAMP_COLUMN]).assign(
+                    submission_date=stamp.dt.date,
+                    submission_time=stamp.dt.strftime('%H:%M:%S'),
+                )
+            self._clean[name] = frame
+        return self._clean[name]
+
+    def link(self, name, parent):
+        """``ParentLink`` from the cleaned sheet to the main table."""
+        return ParentLink(parent, self.clean(name))
@@ -0,0 +1,293 @@
+"""Streaming quantile sketches for exports that do not fit in memory.
+
+A KLL sketch (Karnin, Lang & Liberty, 2016) keeps a hierarchy of small
+sorted buffers ("compactors"); when one fills up, every other item is
+promoted to the next level with double weight. Sketches are updated chunk by
+chunk and merged across workers, and the IQR fences / winsorization bounds
+are read from them instead of from an exact ``Series.quantile``.
+
+Error bound
+-----------
+Quantiles are approximate in *rank*: ``quantile(q)`` returns a value whose
+true rank lies within ``q ± ε`` (as a fraction of the items seen).
+
+* ``max_rank_error()`` is a deterministic worst case: each compaction at
+  level ``h`` can move any rank by at most ``2**h``, and the sketch tracks
+  the sum of those over all compactions.
+* ``rank_error()`` is the usual 99%-confidence estimate for KLL,
+  ``2.296 / k**0.9723`` (≈1.3% for the default ``k=200``, ≈0.7% for
+  ``k=400``), from the Apache DataSketches characterisation.
+
+Both are 0 while the column still fits in the first compactor; quantiles
+then equal ``Series.quantile`` (both interpolate linearly between ranks).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class KLLSketch:
+    """Mergeable quantile sketch for one numeric column."""
+
+    def __init__(self, k=200, c=2 / 3, seed=0):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self.compactors = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+        self._max_error = 0.0
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(int(np.ceil(self.k * self.c ** depth)), 2)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.n += len(values)
+            self.compactors[0] = np.concatenate([self.compactors[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0))
+        for level, buf in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], buf])
+        self.n += other.n
+        self._max_error += other._max_error
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.compactors):
+            buf = self.compactors[level]
+            if len(buf) < self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.compactors):
+                self.compactors.append(np.empty(0))
+
+            buf = np.sort(buf)
+            keep = buf[-1:] if len(buf) % 2 else buf[:0]
+            paired = buf[:len(buf) - len(keep)]
+            promoted = paired[self._rng.integers(2)::2]
+
+            self.compactors[level] = keep
+            self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], promoted])
+            self._max_error += 2.0 ** level
+            # Capacities shrink as the hierarchy grows, so recheck from the bottom
+            level = 0
+
+    def _weighted(self):
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate([
+            np.full(len(buf), 2.0 ** level) for level, buf in enumerate(self.compactors)
+        ])
+        order = np.argsort(values, kind='stable')
+        return values[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        """Approximate quantile(s); ``q`` may be a scalar or a sequence.
+
+        Interpolates linearly between the items at the neighbouring ranks,
+        like ``Series.quantile`` (``interpolation='linear'``), so the result
+        equals pandas' while nothing has been compacted.
+        """
+        if self.n == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        values, cum = self._weighted()
+        # 0-based rank h in a sorted list of cum[-1] items; an item of weight
+        # w fills the w ranks below its cumulative weight
+        h = np.asarray(q, dtype=float) * (cum[-1] - 1)
+        lo, hi = np.floor(h), np.ceil(h)
+        last = len(values) - 1
+        v_lo = values[np.minimum(np.searchsorted(cum, lo, side='right'), last)]
+        v_hi = values[np.minimum(np.searchsorted(cum, hi, side='right'), last)]
+        return v_lo + (h - lo) * (v_hi - v_lo)
+
+    def max_rank_error(self):
+        """Guaranteed bound on the normalized rank error of any quantile."""
+        return self._max_error / self.n if self.n else 0.0
+
+    def rank_error(self):
+        """99%-confidence normalized rank error (0 while still exact)."""
+        if len(self.compactors) == 1:
+            return 0.0
+        return min(2.296 / self.k ** 0.9723, self.max_rank_error())
+
+
+class ColumnSketches:
+    """One ``KLLSketch`` per numeric column, fed with DataFrame chunks."""
+
+    def __init__(self, columns=None, k=200, seed=0):
+        self.columns = None if columns is None else pd.Index(columns)
+        self.k = k
+        self.seed = seed
+        self.sketches = {}
+
+    def update(self, chunk):
+        if self.columns is None:
+            self.columns = chunk.select_dtypes(include='number').columns
+        for i, col in enumerate(self.columns):
+            if col not in chunk.columns:
+                continue
+            if col not in self.sketches:
+                self.sketches[col] = KLLSketch(k=self.k, seed=self.seed + i)
+            values = pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+            self.sketches[col].update(values)
+        return self
+
+    def merge(self, other):
+        if self.columns is None:
+            self.columns = other.columns
+        for col, sketch in other.sketches.items():
+            if col in self.sketches:
+                self.sketches[col].merge(sketch)
+            else:
+                self.sketches[col] = sketch
+        return self
+
+    def quantiles(self, qs):
+        """Columns × quantiles table (rows indexed like ``DataFrame.quantile``)."""
+        return pd.DataFrame(
+            {col: self.sketches[col].quantile(list(qs)) for col in self.columns if col in self.sketches},
+            index=list(qs),
+        )
+
+    def errors(self):
+        """Items seen and rank-error bounds per column."""
+        return pd.DataFrame({
+            'n': {col: s.n for col, s in self.sketches.items()},
+            'rank_error_99': {col: s.rank_error() for col, s in self.sketches.items()},
+            'max_rank_error': {col: s.max_rank_error() for col, s in self.sketches.items()},
+        })
+
+
+class SketchIQRFences:
+    """IQR fences read from column sketches, applied chunk by chunk.
+
+    ``bounds`` has the same ``q1``/``median``/``q3``/``iqr``/``lower``/
+    ``upper``/``outliers`` layout as ``IQRFences.bounds`` (plus the rank
+    error bounds); ``update_counts`` accumulates outlier counts and ``clip``
+    winsorizes one chunk at a time. No cell mask is kept.
+    """
+
+    def __init__(self, sketches, k=1.5):
+        self.k = k
+        quartiles = sketches.quantiles([0.0, 0.25, 0.5, 0.75, 1.0])
+        self.columns = quartiles.columns
+        low, q1, median, q3, high = (quartiles.iloc[i] for i in range(5))
+        iqr = q3 - q1
+        self.bounds = pd.DataFrame({
+            'q1': q1, 'median': median, 'q3': q3, 'iqr': iqr,
+            'lower': q1 - k * iqr, 'upper': q3 + k * iqr,
+            'outliers': 0,
+        }).join(sketches.errors()[['rank_error_99', 'max_rank_error']])
+        # Whiskers: the fences, pulled in to the (sketched) data range
+        self.bounds['whislo'] = np.maximum(self.bounds['lower'], low)
+        self.bounds['whishi'] = np.minimum(self.bounds['upper'], high)
+
+    @property
+    def counts(self):
+        return self.bounds['outliers']
+
+    def top(self, n=10):
+        """The ``n`` columns with the most outliers (ties keep column order)."""
+        return self.counts.sort_values(ascending=False, kind='stable').index[:n].tolist()
+
+    def detect(self, chunk):
+        values = chunk[self.columns].to_numpy(dtype=float, na_value=np.nan)
+        with np.errstate(invalid='ignore'):
+            mask = (values < self.bounds['lower'].to_numpy()) | (values > self.bounds['upper'].to_numpy())
+        return pd.DataFrame(mask, index=chunk.index, columns=self.columns)
+
+    def update_counts(self, chunk):
+        self.bounds['outliers'] += self.detect(chunk).sum().to_numpy()
+        return self
+
+    def clip(self, chunk):
+        return chunk[self.columns].clip(lower=self.bounds['lower'], upper=self.bounds['upper'], axis=1)
+
+    def box_stats(self, columns=None):
+        """Boxplot statistics in ``Axes.bxp`` format, without fliers."""
+        columns = self.columns if columns is None else columns
+        return [{
+            'label': col,
+            'q1': row['q1'], 'med': row['median'], 'q3': row['q3'],
+            'whislo': row['whislo'], 'whishi': row['whishi'],
+            'fliers': np.array([]),
+            'n_outliers': int(row['outliers']),
+        } for col, row in self.bounds.loc[list(columns)].iterrows()]
+
+
+# -----------------------------------------------------------
+# 📂 Chunked readers
+# -----------------------------------------------------------
+def iter_file_chunks(path, chunk_rows=50_000, sheet_name=0):
+    """Yield DataFrame chunks from a CSV or Excel export without loading it whole.
+
+    Excel files are streamed with openpyxl's read-only mode.
+    """
+    path = str(path)
+    if path.lower().endswith(('.csv', '.csv.gz')):
+        yield from pd.read_csv(path, chunksize=chunk_rows, low_memory=False)
+        return
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows)
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunk_rows:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        wb.close()
+
+
+def iter_frame_chunks(df, chunk_rows=50_000):
+    """Yield row slices of an in-memory frame (views, not copies)."""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def sketch_chunks(chunks, columns=None, k=200):
+    """Build ``ColumnSketches`` from an iterable of DataFrame chunks."""
+    sketches = ColumnSketches(columns=columns, k=k)
+    for chunk in chunks:
+        sketches.update(chunk)
+    return sketches
+
+
+def stream_fences(make_chunks, columns=None, k=1.5, sketch_k=200):
+    """IQR fences and outlier counts in two streamed passes.
+
+    ``make_chunks`` returns a fresh iterable of chunks on each call: the
+    first pass feeds the sketches, the second counts cells outside the
+    fences. Memory is one chunk plus the sketches.
+    """
+    fences = SketchIQRFences(sketch_chunks(make_chunks(), columns=columns, k=sketch_k), k=k)
+    for chunk in make_chunks():
+        fences.update_counts(chunk)
+    return fences
+
+
+def iter_clipped(chunks, fences):
+    """Yield ``chunks`` with the fenced columns winsorized at the fences."""
+    for chunk in chunks:
+        yield chunk.assign(**fences.clip(chunk))
+
+
+def fences_from_file(path, columns=None, k=1.5, chunk_rows=50_000, sheet_name=0):
+    """``stream_fences`` over a CSV or Excel export too large to load."""
+    return stream_fences(lambda: iter_file_chunks(path, chunk_rows, sheet_name), columns=columns, k=k)
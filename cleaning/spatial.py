@@ -0,0 +1,155 @@
+"""Spatial index over respondent GPS points.
+
+Points are projected onto a sphere in 3-D Cartesian metres and stored in a
+KD-tree, so radius and nearest-neighbour queries take O(log n) each and a
+whole-survey duplicate scan is O(n log n) instead of comparing every pair.
+Straight-line (chord) distances equal great-circle distances to well under
+a millimetre at the scales used here.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS_M = 6_371_008.8
+
+# Generous bounding box around Rwanda (lat_min, lat_max, lon_min, lon_max)
+RWANDA_BBOX = (-2.90, -1.00, 28.80, 30.95)
+
+
+def to_xyz(lat, lon):
+    """Latitude/longitude in degrees → Cartesian metres on the Earth sphere."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    cos_lat = np.cos(lat)
+    return EARTH_RADIUS_M * np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_arc(chord_m):
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.clip(chord_m / (2 * EARTH_RADIUS_M), 0, 1))
+
+
+def arc_to_chord(arc_m):
+    return 2 * EARTH_RADIUS_M * np.sin(np.asarray(arc_m, dtype=float) / (2 * EARTH_RADIUS_M))
+
+
+class PointIndex:
+    """KD-tree over the valid GPS points of ``df``.
+
+    Rows with missing coordinates or coordinates outside ``bbox`` are not
+    indexed; they are listed by ``invalid_points``. Query results refer to
+    rows of ``df`` by their index label.
+    """
+
+    def __init__(self, df, lat='gps_latitude', lon='gps_longitude', bbox=RWANDA_BBOX):
+        self.df = df
+        self.lat, self.lon = lat, lon
+        lats = pd.to_numeric(df[lat], errors='coerce').to_numpy(dtype=float)
+        lons = pd.to_numeric(df[lon], errors='coerce').to_numpy(dtype=float)
+
+        lat_min, lat_max, lon_min, lon_max = bbox
+        self.valid = (
+            np.isfinite(lats) & np.isfinite(lons)
+            & (lats >= lat_min) & (lats <= lat_max)
+            & (lons >= lon_min) & (lons <= lon_max)
+        )
+        self.positions = np.flatnonzero(self.valid)
+        self.labels = df.index[self.positions]
+        self.xyz = to_xyz(lats[self.valid], lons[self.valid])
+        self.tree = cKDTree(self.xyz)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def invalid_points(self, columns=None):
+        """Rows whose coordinates are missing or fall outside the bounding box."""
+        out = self.df.loc[~self.valid]
+        return out if columns is None else out[list(columns)]
+
+    def query_radius(self, lat, lon, radius_m):
+        """Index labels of the points within ``radius_m`` of each query point."""
+        hits = self.tree.query_ball_point(to_xyz(np.atleast_1d(lat), np.atleast_1d(lon)),
+                                          r=arc_to_chord(radius_m))
+        return [self.labels[np.asarray(h, dtype=np.intp)] for h in hits]
+
+    def nearest(self, k=1):
+        """Distance (m) and label of the ``k`` nearest other points, for every point."""
+        dist, idx = self.tree.query(self.xyz, k=k + 1)
+        dist, idx = dist[:, 1:], idx[:, 1:]
+        missing = idx >= len(self)
+        idx = np.where(missing, 0, idx)
+        out = {}
+        for j in range(k):
+            out[f'nn{j + 1}_distance_m'] = np.where(missing[:, j], np.nan, chord_to_arc(dist[:, j]))
+            out[f'nn{j + 1}'] = np.where(missing[:, j], None, self.labels[idx[:, j]].to_numpy(dtype=object))
+        return pd.DataFrame(out, index=self.labels)
+
+    def duplicate_pairs(self, radius_m=1.0, distinct_by=None):
+        """Pairs of points closer than ``radius_m``.
+
+        With ``distinct_by`` (e.g. ``'_uuid'``) only pairs whose values in that
+        column differ are kept — the same spot recorded for different
+        respondents.
+        """
+        pairs = self.tree.query_pairs(r=arc_to_chord(radius_m), output_type='ndarray')
+        if distinct_by is not None and len(pairs):
+            keys = self.df[distinct_by].to_numpy()[self.positions]
+            pairs = pairs[keys[pairs[:, 0]] != keys[pairs[:, 1]]]
+        dist = chord_to_arc(np.linalg.norm(self.xyz[pairs[:, 0]] - self.xyz[pairs[:, 1]], axis=1))
+        return pd.DataFrame({
+            'row_a': self.labels[pairs[:, 0]],
+            'row_b': self.labels[pairs[:, 1]],
+            'distance_m': dist,
+        }).sort_values('distance_m', ignore_index=True)
+
+    def duplicate_clusters(self, radius_m=1.0, distinct_by=None):
+        """Cluster id per point for groups of near-identical locations (single linkage)."""
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        pairs = self.duplicate_pairs(radius_m, distinct_by)
+        pos = pd.Index(self.labels)
+        a, b = pos.get_indexer(pairs['row_a']), pos.get_indexer(pairs['row_b'])
+        graph = coo_matrix((np.ones(len(a)), (a, b)), shape=(len(self), len(self)))
+        _, labels = connected_components(graph, directed=False)
+        sizes = np.bincount(labels)
+        cluster = pd.Series(labels, index=self.labels, name='location_cluster')
+        return cluster[sizes[labels] > 1]
+
+    def group_outliers(self, group_col, k=10, max_distance_m=5_000):
+        """Points that sit away from the other points of their declared group.
+
+        For every point the ``k`` nearest neighbours are looked up in one
+        batched query. A point is flagged when none of them share its
+        ``group_col`` value (e.g. ``addr_sector``) *and* it is more than
+        ``max_distance_m`` from its group's median location. With fewer
+        than two points there are no neighbours and nothing is flagged.
+        """
+        if len(self) < 2:
+            return pd.DataFrame(columns=[group_col, 'neighbours_same_group', 'distance_to_group_centre_m'],
+                                index=self.labels[:0])
+
+        groups = self.df[group_col].to_numpy()[self.positions]
+        codes, uniques = pd.factorize(groups)
+        k = min(k, len(self) - 1)
+
+        _, idx = self.tree.query(self.xyz, k=k + 1)
+        neighbours = idx[:, 1:]
+        same = (codes[neighbours] == codes[:, None]) & (codes[:, None] >= 0)
+        share_same = same.mean(axis=1)
+
+        lat = self.df[self.lat].to_numpy(dtype=float)[self.positions]
+        lon = self.df[self.lon].to_numpy(dtype=float)[self.positions]
+        centre = pd.DataFrame({'lat': lat, 'lon': lon, 'code': codes}).groupby('code').median()
+        has_group = codes >= 0
+        centre_xyz = np.full_like(self.xyz, np.nan)
+        centre_xyz[has_group] = to_xyz(centre.loc[codes[has_group], 'lat'], centre.loc[codes[has_group], 'lon'])
+        to_centre = chord_to_arc(np.linalg.norm(self.xyz - centre_xyz, axis=1))
+
+        out = pd.DataFrame({
+            group_col: groups,
+            'neighbours_same_group': share_same,
+            'distance_to_group_centre_m': to_centre,
+        }, index=self.labels)
+        flagged = has_group & (share_same == 0) & (to_centre > max_distance_m)
+        return out[flagged].sort_values('distance_to_group_centre_m', ascending=False)
@@ -0,0 +1,200 @@
+"""Declarative validation rules for the cleaned survey tables.
+
+Each rule is a small dict keyed by its name:
+
+* ``{'column': c, 'min': a, 'max': b}`` — numeric range (``gt``/``lt`` for
+  strict bounds); non-numeric entries also fail
+* ``{'column': c, 'allowed': [...]}`` — category set, compared after
+  stripping and case-folding
+* ``{'column': c, 'required_if': (other, value)}`` — ``c`` must be answered
+  when ``other`` equals ``value`` (the form's skip logic); the condition can
+  also be an expression such as ``'crop_yield_quantity > 0'``
+* ``{'expr': '...'}`` — cross-column ``DataFrame.eval`` expression that must
+  hold; rows where a referenced column is missing are not checked
+
+Every rule becomes one boolean column of a rows × rules matrix, computed
+with array operations over the whole frame; counts and the violation table
+are read off that matrix.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from cleaning.spatial import RWANDA_BBOX
+
+_MIN_LAT, _MAX_LAT, _MIN_LON, _MAX_LON = RWANDA_BBOX
+
+MAIN_RULES = {
+    'resp_age 10–120': {'column': 'resp_age', 'min': 10, 'max': 120},
+    'gps_precision > 0': {'column': 'gps_precision', 'gt': 0},
+    'gps_altitude > 0': {'column': 'gps_altitude', 'gt': 0},
+    'gps_latitude in Rwanda': {'column': 'gps_latitude', 'min': _MIN_LAT, 'max': _MAX_LAT},
+    'gps_longitude in Rwanda': {'column': 'gps_longitude', 'min': _MIN_LON, 'max': _MAX_LON},
+    'eco_type known': {'column': 'eco_type', 'allowed': ['forest', 'wetland']},
+    'resp_gender known': {'column': 'resp_gender', 'allowed': ['male', 'female']},
+    'resp_education known': {
+        'column': 'resp_education',
+        'allowed': ['no formal education', 'primary school', 'secondary school', 'university'],
+    },
+    'addr_province known': {
+        'column': 'addr_province',
+        'allowed': ['kigali city', 'northern province', 'southern province',
+                    'eastern province', 'western province'],
+    },
+    'wetland named': {'column': 'eco_wetland_name', 'required_if': ('eco_type', 'wetland')},
+    'forest named': {'column': 'eco_forest_name', 'required_if': ('eco_type', 'forest')},
+    'wetland years ≤ age': {'expr': 'resp_years_area_wetland <= resp_age'},
+    'forest years ≤ age': {'expr': 'resp_years_area_forest <= resp_age'},
+    'end not before start': {'expr': 'end_date >= start_date'},
+}
+
+CROP_RULES = {
+    'crop_area_size > 0': {'column': 'crop_area_size', 'gt': 0},
+    'crop_unit_to_kg > 0': {'column': 'crop_unit_to_kg', 'gt': 0},
+    'crop_harvest_frequency 1–12': {'column': 'crop_harvest_frequency', 'min': 1, 'max': 12},
+    'crop_market_price > 0': {'column': 'crop_market_price', 'gt': 0},
+    'crop_labor_count 0–100': {'column': 'crop_labor_count', 'min': 0, 'max': 100},
+    'crop_expenses_total ≥ 0': {'column': 'crop_expenses_total', 'min': 0},
+    'crop_area_unit known': {
+        'column': 'crop_area_unit',
+        'allowed': ['square meter', 'square foot', 'acre', 'hectare'],
+    },
+    'crop_yield_unit known': {
+        'column': 'crop_yield_unit',
+        'allowed': ['kilogram', 'ton', 'sac', 'basket'],
+    },
+    'fertilizer cost given': {'column': 'crop_cost_fertilizer', 'required_if': ('crop_fertilizer_use', 'yes')},
+    'yield unit given': {'column': 'crop_yield_unit', 'required_if': 'crop_yield_quantity > 0'},
+}
+
+
+_KEYWORDS = {'and', 'or', 'not', 'True', 'False', 'None'}
+
+
+def _folded(series):
+    return series.astype('string').str.strip().str.casefold()
+
+
+def _names_in(expr):
+    return [n for n in dict.fromkeys(re.findall(r'[A-Za-z_]\w*', expr)) if n not in _KEYWORDS]
+
+
+def rule_columns(rule):
+    """Columns a rule reads, the checked column first."""
+    columns = [rule['column']] if 'column' in rule else _names_in(rule['expr'])
+    condition = rule.get('required_if')
+    if isinstance(condition, str):
+        columns += _names_in(condition)
+    elif condition is not None:
+        columns.append(condition[0])
+    return list(dict.fromkeys(columns))
+
+
+def _holds(df, expr):
+    """Boolean result of ``expr``, False where it is missing."""
+    return pd.Series(df.eval(expr), index=df.index).astype('boolean').fillna(False).to_numpy(dtype=bool)
+
+
+def rule_mask(df, rule):
+    """Boolean violation array of one rule over all rows of ``df``."""
+    if 'expr' in rule:
+        checked = df[rule_columns(rule)].notna().all(axis=1).to_numpy()
+        return checked & ~_holds(df, rule['expr'])
+
+    values = df[rule['column']]
+    present = values.notna().to_numpy()
+    if 'required_if' in rule:
+        condition = rule['required_if']
+        if isinstance(condition, str):
+            applies = _holds(df, condition)
+        else:
+            other, value = condition
+            applies = (_folded(df[other]) == str(value).casefold()).fillna(False).to_numpy(dtype=bool)
+        return applies & ~present
+    if 'allowed' in rule:
+        allowed = [str(v).casefold() for v in rule['allowed']]
+        return present & ~_folded(values).isin(allowed).fillna(False).to_numpy(dtype=bool)
+
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    bad = present & np.isnan(numbers)
+    with np.errstate(invalid='ignore'):
+        if 'min' in rule:
+            bad |= numbers < rule['min']
+        if 'max' in rule:
+            bad |= numbers > rule['max']
+        if 'gt' in rule:
+            bad |= numbers <= rule['gt']
+        if 'lt' in rule:
+            bad |= numbers >= rule['lt']
+    return bad
+
+
+def describe_rule(rule):
+    """Human-readable condition of a rule."""
+    if 'expr' in rule:
+        return rule['expr']
+    if 'required_if' in rule:
+        condition = rule['required_if']
+        if not isinstance(condition, str):
+            condition = f"{condition[0]} = {condition[1]}"
+        return f"required when {condition}"
+    if 'allowed' in rule:
+        return 'one of: ' + ', '.join(map(str, rule['allowed']))
+    ops = (('min', '≥'), ('gt', '>'), ('max', '≤'), ('lt', '<'))
+    return ' and '.join(f"{op} {rule[key]}" for key, op in ops if key in rule)
+
+
+class Validator:
+    """Evaluates a rule set over ``df``.
+
+    ``mask`` is the rows × rules violation matrix. Rules reading a column
+    that ``df`` does not have are listed in ``skipped``.
+    """
+
+    def __init__(self, df, rules=MAIN_RULES):
+        self.rules, self.skipped = {}, []
+        for name, rule in rules.items():
+            if all(c in df.columns for c in rule_columns(rule)):
+                self.rules[name] = rule
+            else:
+                self.skipped.append(name)
+
+        matrix = np.zeros((len(df), len(self.rules)), dtype=bool)
+        for j, rule in enumerate(self.rules.values()):
+            matrix[:, j] = rule_mask(df, rule)
+        self.mask = pd.DataFrame(matrix, index=df.index, columns=list(self.rules))
+
+    @property
+    def failing_rows(self):
+        return self.mask.any(axis=1)
+
+    def summary(self):
+        """Checked column, condition and number of violating rows per rule."""
+        return pd.DataFrame({
+            'column': [rule_columns(r)[0] for r in self.rules.values()],
+            'rule': [describe_rule(r) for r in self.rules.values()],
+            'violations': self.mask.sum().to_numpy(),
+        }, index=pd.Index(list(self.rules), name='check'))
+
+    def violations(self, df, id_cols=('_index',)):
+        """One row per violated (row, rule) with the offending value.
+
+        For cross-column rules the value is that of the first column in
+        the expression. Values are shown as text, since one table mixes
+        numbers, labels and dates.
+        """
+        rows, cols = np.nonzero(self.mask.to_numpy())
+        checked = np.array([rule_columns(r)[0] for r in self.rules.values()], dtype=object)
+        out = pd.DataFrame({'row': df.index[rows], 'check': self.mask.columns[cols]})
+        for col in id_cols:
+            if col in df.columns:
+                out[col] = df[col].to_numpy()[rows]
+        out['column'] = checked[cols]
+        values = np.empty(len(rows), dtype=object)
+        for j, column in enumerate(checked):
+            hit = cols == j
+            values[hit] = df[column].to_numpy()[rows[hit]]
+        out['value'] = pd.Series(values, dtype=object).astype('string')
+        return out
@@ -0,0 +1,101 @@
+"""Copy-free winsorization.
+
+Instead of copying the whole frame into ``df_before`` / ``df_after`` and
+clipping every column, ``CappedOverlay`` keeps a reference to the original
+frame plus the (usually few) cells that fall outside the fences, with their
+capped values. Capped columns, the capped numeric block or export chunks
+are materialized only when asked for.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class CappedOverlay:
+    """Winsorized view of ``df`` capped at ``fences``.
+
+    ``fences`` is any object with ``columns``, a boolean ``mask`` frame and a
+    ``bounds`` table with per-column ``lower``/``upper`` (e.g.
+    ``IQRFences``). The overlay assumes ``df`` is not modified afterwards.
+    """
+
+    def __init__(self, df, fences):
+        self.base = df
+        self.columns = pd.Index(fences.columns)
+        self.bounds = fences.bounds.loc[self.columns, ['lower', 'upper']]
+
+        mask = fences.mask.to_numpy()
+        self._cells = {}
+        records = []
+        for j in np.flatnonzero(mask.any(axis=0)):
+            col = self.columns[j]
+            rows = np.flatnonzero(mask[:, j])
+            original = df[col].to_numpy(dtype=float)[rows]
+            capped = np.clip(original, self.bounds.at[col, 'lower'], self.bounds.at[col, 'upper'])
+            self._cells[col] = (rows, capped)
+            records.append(pd.DataFrame({
+                'row': df.index[rows], 'column': col, 'original': original, 'capped': capped,
+            }))
+
+        self.cells = (pd.concat(records, ignore_index=True) if records
+                      else pd.DataFrame(columns=['row', 'column', 'original', 'capped']))
+
+    @property
+    def shape(self):
+        return self.base.shape
+
+    @property
+    def n_capped(self):
+        return len(self.cells)
+
+    def column(self, col):
+        """Capped copy of a single column."""
+        series = self.base[col]
+        if col not in self._cells:
+            return series.copy()
+        rows, capped = self._cells[col]
+        values = series.to_numpy(dtype=float, copy=True)
+        values[rows] = capped
+        return pd.Series(values, index=series.index, name=col)
+
+    def capped_block(self, columns=None):
+        """Only the numeric columns, capped (the non-numeric part is never copied)."""
+        columns = self.columns if columns is None else pd.Index(columns)
+        return pd.DataFrame({col: self.column(col) for col in columns}, index=self.base.index)
+
+    def _apply(self, chunk, start):
+        stop = start + len(chunk)
+        for col, (rows, capped) in self._cells.items():
+            lo, hi = np.searchsorted(rows, [start, stop])
+            if hi > lo:
+                if chunk[col].dtype.kind != 'f':
+                    chunk[col] = chunk[col].astype(float)
+                chunk.iloc[rows[lo:hi] - start, chunk.columns.get_loc(col)] = capped[lo:hi]
+        return chunk
+
+    def iter_chunks(self, chunk_rows=50_000):
+        """Yield the full winsorized frame in row chunks (for exports)."""
+        for start in range(0, len(self.base), chunk_rows):
+            yield self._apply(self.base.iloc[start:start + chunk_rows].copy(), start)
+
+    def frame(self):
+        """The full winsorized frame as one DataFrame (copies ``base``)."""
+        return self._apply(self.base.copy(), 0)
+
+    def changes(self, id_col=None):
+        """Before/after table of every capped cell."""
+        out = self.cells
+        if id_col is not None and id_col in self.base.columns:
+            out = out.assign(**{id_col: self.base.loc[out['row'], id_col].to_numpy()})
+        return out
+
+    def summary(self):
+        """Per-column fences, number of capped cells and the range before/after."""
+        base = self.base[self.columns]
+        out = self.bounds.copy()
+        out['n_capped'] = self.cells.groupby('column').size().reindex(self.columns, fill_value=0)
+        out['min_before'] = base.min()
+        out['max_before'] = base.max()
+        out['min_after'] = np.fmax(out['min_before'], out['lower'])
+        out['max_after'] = np.fmin(out['max_before'], out['upper'])
+        return out